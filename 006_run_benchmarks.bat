@@ -0,0 +1,2 @@
+@echo off
+python mains\run_benchmarks.py %*
@@ -0,0 +1,2 @@
+@echo off
+python mains\generate_datasets.py %*
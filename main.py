@@ -1,12 +1,202 @@
-
+import argparse
+import logging
 import os
+import sys
+
 from dotenv import load_dotenv
 
 load_dotenv()
 # openai_api_key = os.getenv("OPENAI_API_KEY")
 
-def main():
-    print("Hello, World!")
+# Heavy modules (pandas, numpy, pyarrow, the comparers) are imported inside the
+# command functions, so `list` and `--help` start without loading them.
+
+DEFAULT_CONFIG = os.path.join('src', 'inputs', 'database_config.ini')
+DEFAULT_OUTPUT_DIR = os.path.join('src', 'outputs')
+DEFAULT_CHECKPOINT_DIR = os.path.join('src', 'checkpoints')
+
+
+def build_parser():
+    """Builds the command line parser with its subcommands."""
+    parser = argparse.ArgumentParser(description="Compare Excel, CSV and Parquet datasets described in a config file.")
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help="Path of the scenario config file.")
+    parser.add_argument('--log-file', default=os.path.join('logs', 'db_compare.log'), help="Path of the log file.")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help="List the scenarios of the config file.")
+
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                             help="Base directory for reports; each scenario writes to its own subdirectory.")
+    run_options.add_argument('--profile', choices=['cprofile', 'sample'], default=None,
+                             help="Profile every stage and write the profiles next to the report.")
+    run_options.add_argument('--profile-columns', action='store_true',
+                             help="Collect column profiles (null, distinct and coerced counts, min/max, sums); "
+                                  "PROFILE_COLUMNS in a scenario section takes precedence.")
+    run_options.add_argument('--workers', type=int, default=None, help="Maximum worker processes for fan-out scenarios.")
+    run_options.add_argument('--backend', choices=['pandas', 'arrow', 'polars'], default='pandas',
+                             help="Comparison backend; BACKEND in a scenario section takes precedence.")
+    run_options.add_argument('--memory-limit-mb', type=float, default=None,
+                             help="Stop a scenario cleanly when the process uses more memory than this. "
+                                  "Memory is sampled every 50 ms and the run stops at the next stage, chunk "
+                                  "or column boundary, so one large read or join can overshoot it. "
+                                  "MEMORY_LIMIT_MB in a scenario section takes precedence.")
+    run_options.add_argument('--no-progress', action='store_true',
+                             help="Do not show the live progress of each stage on the console.")
+    run_options.add_argument('--metrics-file', default=None,
+                             help="Append live progress records (rows, rows/s, ETA, RSS) to this JSON Lines file.")
+    run_options.add_argument('--progress-interval', type=float, default=1.0,
+                             help="Seconds between two progress updates.")
+
+    checkpoint_options = argparse.ArgumentParser(add_help=False)
+    checkpoint_options.add_argument('--checkpoint-dir', default=None,
+                                    help="Write finished scenarios, finished fan-out pairs and the loaded and "
+                                         "standardized inputs of every scenario to this directory "
+                                         f"(default with --resume: {DEFAULT_CHECKPOINT_DIR}).")
+    checkpoint_options.add_argument('--resume', action='store_true',
+                                    help="Skip the work that the checkpoints show as finished with unchanged inputs.")
+
+    run_parser = subparsers.add_parser('run', parents=[run_options, checkpoint_options], help="Run one scenario.")
+    run_parser.add_argument('scenario', help="Scenario section in the config file.")
+    subparsers.add_parser('run-all', parents=[run_options, checkpoint_options],
+                          help="Run every scenario listed in DATA_SCENARIOS_TO_EXECUTE.")
+
+    serve_parser = subparsers.add_parser('serve', parents=[run_options],
+                                         help="Run a local comparison service that keeps datasets cached.")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on.")
+    serve_parser.add_argument('--allow-remote', action='store_true',
+                              help="Allow a --host that other machines can reach.")
+    serve_parser.add_argument('--token', default=os.getenv('COMPARISON_SERVICE_TOKEN'),
+                              help="Shared token clients send in the X-Comparison-Token header "
+                                   "(default: $COMPARISON_SERVICE_TOKEN, or a random token).")
+    serve_parser.add_argument('--allowed-root', action='append', default=[], dest='allowed_roots',
+                              help="Directory the source and target of jobs may point into; repeatable.")
+    serve_parser.add_argument('--port', type=int, default=8765, help="Port to listen on.")
+    serve_parser.add_argument('--cache-mb', type=float, default=1024,
+                              help="Memory budget in MB for cached datasets.")
+
+    bench_parser = subparsers.add_parser('bench', help="Run the benchmark suite; see `bench -- --help`.")
+    bench_parser.add_argument('bench_args', nargs=argparse.REMAINDER, help="Arguments for the benchmark runner.")
+    return parser
+
+
+def _config(args):
+    from src.utils.database_config import DatabaseConfig
+
+    if not os.path.exists(args.config):
+        raise SystemExit(f"Config file not found: {args.config}")
+    return DatabaseConfig(args.config)
+
+
+def command_list(args):
+    """Prints the scenarios to execute and every other scenario section."""
+    config_reader = _config(args)
+    scheduled = config_reader.get_scenarios_list()
+    for scenario_name in config_reader.config.sections():
+        section = config_reader.config[scenario_name]
+        if 'COLUMN_MAPPING' not in section:
+            continue
+        marker = '*' if scenario_name in scheduled else ' '
+        kind = f"fan-out ({section['FAN_OUT']})" if section.get('FAN_OUT') else 'pair'
+        print(f"{marker} {scenario_name:<30} {kind:<22} {section.get('SOURCE_FILE_PATH', '')} -> "
+              f"{section.get('TARGET_FILE_PATH', '')}")
+    return 0
+
+
+def _print_results(results):
+    for result in results:
+        timings = ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in result["timings"].items()
+                            if seconds is not None)
+        status = result["status"] if not result["error"] else f"{result['status']}: {result['error']}"
+        if result.get("resumed"):
+            status += " (resumed from checkpoint)"
+        print(f"{result['scenario']}: {status}")
+        for report_path in result.get("reports") or ([result["report"]] if result["report"] else []):
+            print(f"  report:   {report_path}")
+        if timings:
+            print(f"  stages:   {timings}")
+        memory = ', '.join(f"{stage} {peak_mb:.0f} MB" for stage, peak_mb in result.get("memory", {}).items())
+        if memory:
+            print(f"  peak mem: {memory}")
+        for profile_file in result.get("profiles", []):
+            print(f"  profile:  {profile_file}")
+
+
+def _telemetry(args):
+    from src.utils.telemetry import Telemetry
+
+    if args.no_progress and not args.metrics_file:
+        return None
+    return Telemetry(args.metrics_file, console=not args.no_progress, interval=args.progress_interval)
+
+
+def command_run(args):
+    """Runs one scenario, or all scheduled scenarios for `run-all`."""
+    from src.utils.checkpoint_store import CheckpointStore
+    from src.utils.scenario_runner import ScenarioRunner
+
+    config_reader = _config(args)
+    checkpoint_dir = args.checkpoint_dir or (DEFAULT_CHECKPOINT_DIR if args.resume else None)
+    checkpoints = CheckpointStore(checkpoint_dir, resume=args.resume) if checkpoint_dir else None
+    runner = ScenarioRunner(config_reader, output_dir=args.output_dir, profile_mode=args.profile,
+                            max_workers=args.workers, memory_limit_mb=args.memory_limit_mb,
+                            backend=args.backend, checkpoints=checkpoints, telemetry=_telemetry(args),
+                            profile_columns=args.profile_columns)
+    if args.command == 'run':
+        if args.scenario not in config_reader.config:
+            raise SystemExit(f"Scenario '{args.scenario}' not found in {args.config}")
+        results = [runner.run(args.scenario)]
+    else:
+        results = runner.run_all()
+    _print_results(results)
+    return 0 if all(result["status"] == "ok" for result in results) else 1
+
+
+def command_serve(args):
+    """Serves comparison jobs over HTTP until interrupted."""
+    from src.utils.comparison_service import ComparisonService, is_loopback
+
+    if not is_loopback(args.host) and not args.allow_remote:
+        raise SystemExit(f"Refusing to serve on '{args.host}', which other machines can reach; "
+                         "pass --allow-remote to accept remote connections.")
+    service = ComparisonService(_config(args), output_dir=args.output_dir, cache_mb=args.cache_mb,
+                                max_workers=args.workers, backend=args.backend,
+                                memory_limit_mb=args.memory_limit_mb, profile_mode=args.profile,
+                                telemetry=_telemetry(args), token=args.token, allowed_roots=args.allowed_roots,
+                                profile_columns=args.profile_columns)
+    print(f"Serving comparisons on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    if not args.token:
+        print(f"Send this token in the X-Comparison-Token header: {service.token}")
+    service.serve(args.host, args.port, allow_remote=args.allow_remote)
+    return 0
+
+
+def command_bench(args):
+    """Forwards the remaining arguments to the benchmark runner."""
+    from mains import run_benchmarks
+
+    bench_args = args.bench_args[1:] if args.bench_args[:1] == ['--'] else args.bench_args
+    return run_benchmarks.main(bench_args)
+
+
+COMMANDS = {
+    'list': command_list,
+    'run': command_run,
+    'run-all': command_run,
+    'serve': command_serve,
+    'bench': command_bench,
+}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in ('run', 'run-all', 'serve'):
+        from src.utils.logger_setup import LoggerSetup
+
+        LoggerSetup.initialize_logger(args.log_file, getattr(logging, args.log_level))
+    return COMMANDS[args.command](args)
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -13,6 +13,7 @@ from src.utils.logger_setup import LoggerSetup
 from src.utils.performance_metrics import PerformanceMetrics
 from src.utils.excel_comparer import ExcelComparer
 from src.utils.html_report import HtmlReport
+from src.utils.dataset_writers import write_excel_streaming
 
 def setup_environment():
     """
@@ -86,7 +87,7 @@ def generate_large_excel(file_path, num_rows, seed=42):
     })
     
     logger.info(f"Writing DataFrame to Excel file at {file_path}.")
-    df.to_excel(file_path, index=False, sheet_name='Sheet1')
+    write_excel_streaming(df, file_path, sheet_name='Sheet1')
     logger.info(f"Excel file {file_path} generated successfully.")
 
 def create_variations(target_file, original_df):
@@ -111,7 +112,7 @@ def create_variations(target_file, original_df):
     df.loc[change_indices, 'Age'] = np.random.randint(20, 70, size=num_changes)
     
     logger.info(f"Writing varied DataFrame to Excel file at {target_file}.")
-    df.to_excel(target_file, index=False, sheet_name='Sheet1')
+    write_excel_streaming(df, target_file, sheet_name='Sheet1')
     logger.info(f"Varied Excel file {target_file} generated successfully.")
 
 
@@ -171,13 +172,14 @@ def run_comparison_and_report(source_path, target_path):
         comparer.source_df,
         comparer.target_df,
         source_file=source_path,
-        target_file=target_path
+        target_file=target_path,
+        key_column=comparer.key
     )
     PerformanceMetrics.stop("create_report")
     
     PerformanceMetrics.start("save_report")
     logger.info("Saving HTML report to file.")
-    html_report_file_name = generate_html_report_file_name(filename='c:/MyProjects/db_table_compare/src/outputs/exl_2_exl_comparison_report.html')
+    html_report_file_name = generate_html_report_file_name(filename=os.path.join('src', 'outputs', 'exl_2_exl_comparison_report.html'))
     report.generate_and_save_report(html_report_file_name)
     PerformanceMetrics.stop("save_report")
     
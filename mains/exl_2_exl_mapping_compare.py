@@ -94,27 +94,23 @@ def generate_excel_files_with_mapping():
     source_path = os.path.join(output_dir, 'src_mapping.xlsx')
     target_path = os.path.join(output_dir, 'tgt_mapping.xlsx')
     
-    source_df.to_excel(source_path, index=False)
-    target_df.to_excel(target_path, index=False)
+    write_excel_streaming(source_df, source_path)
+    write_excel_streaming(target_df, target_path)
     
     print(f"Generated {source_path} and {target_path} successfully.")
 
-from datetime import datetime
 import sys
 import os
 import logging
-import pandas as pd
-import numpy as np
 
 # Add the parent directory to sys.path
 # This allows for importing modules from the 'src' directory.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.utils.logger_setup import LoggerSetup
-from src.utils.performance_metrics import PerformanceMetrics
 from src.utils.database_config import DatabaseConfig
-from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
-from src.utils.html_report import HtmlReport
+from src.utils.dataset_writers import write_excel_streaming
+from src.utils.scenario_runner import ScenarioRunner
 
 def setup_environment():
     """Initializes the logging system and sets up file paths."""
@@ -133,24 +129,6 @@ def get_config():
         logger.error(f"Failed to load configuration: {e}")
         sys.exit(1)
 
-def generate_html_report_file_name(filename='comparison_report.html'):
-    """
-    Generates a timestamped filename for the HTML report.
-    """
-    logger.info("Saving report with timestamped filename.")
-    dir_name = os.path.dirname(filename)
-    base_name = os.path.basename(filename)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    name, ext = os.path.splitext(base_name)
-    new_filename = f"{name}_{timestamp}{ext}"
-    full_path = os.path.join(dir_name, new_filename)
-
-    if dir_name:
-        os.makedirs(dir_name, exist_ok=True)
-
-    logger.info(f"Report will be saved to {full_path}")
-    return full_path
-
 def run_comparison_and_report(scenario_name: str, config_reader: DatabaseConfig):
     """
     Executes the main comparison logic and generates an HTML report
@@ -159,48 +137,11 @@ def run_comparison_and_report(scenario_name: str, config_reader: DatabaseConfig)
     Args:
         scenario_name (str): The name of the scenario section in the config file.
         config_reader (DatabaseConfig): The configuration reader instance.
-    """
-    logger.info(f"Running comparison for scenario: {scenario_name}")
-    PerformanceMetrics.start(f"{scenario_name}_Comparison")
 
-    try:
-        # Get file paths and column mapping from the config
-        source_path = config_reader.get_source_file_path(scenario_name)
-        target_path = config_reader.get_target_file_path(scenario_name)
-        mapping_name = config_reader.config[scenario_name]['COLUMN_MAPPING']
-        column_mapping = config_reader.get_column_mapping(mapping_name)
-
-        if not source_path or not target_path or not column_mapping:
-            logger.error(f"Configuration for scenario '{scenario_name}' is incomplete. Skipping.")
-            return
-
-        # Initialize and run the configurable comparer
-        comparer = ConfigurableExcelComparer(
-            source_path=source_path,
-            target_path=target_path,
-            column_mapping=column_mapping
-        )
-        
-        comparison_df = comparer.compare()
-
-        # Generate and save the HTML report
-        report = HtmlReport(
-            comparison_df,
-            comparer.source_df,
-            comparer.target_df,
-            source_file=source_path,
-            target_file=target_path,
-            key_column=comparer.key_column  # Pass the key_column to the report
-        )
-
-        html_report_file_name = generate_html_report_file_name(filename='c:/MyProjects/db_table_compare/src/outputs/exl_2_exl_mapping_comparison_report.html')
-        report.generate_and_save_report(html_report_file_name)
-
-    except Exception as e:
-        logger.error(f"An error occurred during {scenario_name} comparison: {e}")
-    finally:
-        PerformanceMetrics.stop(f"{scenario_name}_Comparison")
-        logger.info(f"Comparison process for {scenario_name} completed.")
+    Returns:
+        dict: The run result, see `ScenarioRunner.run`.
+    """
+    return ScenarioRunner(config_reader).run(scenario_name)
 
 
 if __name__ == "__main__":
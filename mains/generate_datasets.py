@@ -0,0 +1,59 @@
+import argparse
+import sys
+import os
+import logging
+
+# Add the parent directory to sys.path
+# This allows for importing modules from the 'src' directory.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.logger_setup import LoggerSetup
+from src.utils.performance_metrics import PerformanceMetrics
+from src.utils.synthetic_data import SyntheticDatasetSpec, write_dataset
+from src.utils.dataset_writers import WRITERS
+
+
+def parse_args(argv=None):
+    """Parses the dataset generator command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic source/target datasets.")
+    parser.add_argument('--rows', type=int, default=1000000, help="Number of rows in the base dataset.")
+    parser.add_argument('--columns', type=int, default=4, help="Number of value columns.")
+    parser.add_argument('--key-type', default='int', choices=SyntheticDatasetSpec.KEY_TYPES,
+                        help="Type of the key column.")
+    parser.add_argument('--diff-rate', type=float, default=0.02,
+                        help="Fraction of common rows with a differing cell.")
+    parser.add_argument('--orphan-rate', type=float, default=0.05,
+                        help="Fraction of rows present on one side only.")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed.")
+    parser.add_argument('--formats', nargs='+', default=['xlsx'], choices=sorted(WRITERS),
+                        help="Output formats.")
+    parser.add_argument('--shards', type=int, default=1,
+                        help="Number of shard files per side and format, written in parallel processes.")
+    parser.add_argument('--workers', type=int, default=None, help="Maximum worker processes.")
+    parser.add_argument('--output-dir', default=os.path.join('DATA', 'SYNTHETIC'),
+                        help="Base output directory; files go into a sub-directory named after the spec.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Generates the requested dataset and prints the written file paths."""
+    args = parse_args(argv)
+    logger = LoggerSetup.initialize_logger('.//logs//generate_datasets.log', logging.INFO)
+
+    spec = SyntheticDatasetSpec(num_rows=args.rows, num_columns=args.columns, key_type=args.key_type,
+                                diff_rate=args.diff_rate, orphan_rate=args.orphan_rate, seed=args.seed)
+    output_dir = os.path.join(args.output_dir, spec.name)
+
+    PerformanceMetrics.start("generate_datasets")
+    paths = write_dataset(spec, output_dir, formats=args.formats, num_shards=args.shards,
+                          max_workers=args.workers)
+    PerformanceMetrics.stop("generate_datasets")
+
+    for path in paths:
+        print(path)
+    logger.info(f"Generated {len(paths)} files in {output_dir}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import argparse
+import itertools
+import sys
+import os
+import logging
+
+# Add the parent directory to sys.path
+# This allows for importing modules from the 'src' directory.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.logger_setup import LoggerSetup
+from src.utils.synthetic_data import SyntheticDatasetSpec
+from src.utils.benchmark_suite import BenchmarkSuite
+
+
+def parse_args(argv=None):
+    """Parses the benchmark command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the Excel comparison pipeline.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help="Row counts to benchmark.")
+    parser.add_argument('--columns', type=int, nargs='+', default=[4],
+                        help="Value column counts to benchmark.")
+    parser.add_argument('--key-types', nargs='+', default=['int'], choices=SyntheticDatasetSpec.KEY_TYPES,
+                        help="Key column types to benchmark.")
+    parser.add_argument('--diff-rate', type=float, default=0.02,
+                        help="Fraction of common rows with a differing cell.")
+    parser.add_argument('--orphan-rate', type=float, default=0.05,
+                        help="Fraction of rows present on one side only.")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for the datasets.")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed runs per case; the fastest is kept.")
+    parser.add_argument('--backend', default='pandas', choices=['pandas', 'arrow', 'polars'],
+                        help="Comparison backend to benchmark.")
+    parser.add_argument('--diff-workers', type=int, default=None,
+                        help="Worker processes of the diff stage. Defaults to the CPU count.")
+    parser.add_argument('--profile-columns', action='store_true',
+                        help="Profile the columns in the preprocess stage.")
+    parser.add_argument('--work-dir', default=os.path.join('DATA', 'BENCHMARKS'),
+                        help="Directory for generated datasets and reports.")
+    parser.add_argument('--baseline', default=os.path.join('benchmarks', 'baseline.json'),
+                        help="Path of the JSON baseline file.")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Relative slowdown flagged as a regression (0.2 = 20%%).")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store the results as the new baseline.")
+    return parser.parse_args(argv)
+
+
+def build_specs(args):
+    """Builds the benchmark cases from the cartesian product of the arguments."""
+    return [
+        SyntheticDatasetSpec(num_rows=rows, num_columns=columns, key_type=key_type,
+                             diff_rate=args.diff_rate, orphan_rate=args.orphan_rate, seed=args.seed)
+        for rows, columns, key_type in itertools.product(args.rows, args.columns, args.key_types)
+    ]
+
+
+def main(argv=None):
+    """
+    Runs the benchmark suite and compares the results against the baseline.
+
+    Returns:
+        int: 0 when no regressions were found, 1 otherwise.
+    """
+    args = parse_args(argv)
+    logger = LoggerSetup.initialize_logger('.//logs//benchmark.log', logging.INFO)
+
+    suite = BenchmarkSuite(args.work_dir, args.baseline, threshold=args.threshold, repeat=args.repeat,
+                           backend=args.backend, diff_workers=args.diff_workers,
+                           profile_columns=args.profile_columns)
+    results = suite.run(build_specs(args))
+    print(BenchmarkSuite.format_results(results))
+
+    baseline = suite.load_baseline()
+    if baseline is None or args.update_baseline:
+        suite.save_baseline(results)
+        return 0
+
+    regressions = suite.find_regressions(results, baseline)
+    if regressions:
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']} [{regression['stage']}]: "
+                  f"{regression['baseline']:.3f}s -> {regression['current']:.3f}s "
+                  f"(x{regression['ratio']:.2f})")
+        return 1
+
+    logger.info("No benchmark regressions found.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+import platform
+from datetime import datetime
+from typing import Dict, Any, List
+
+from src.utils.performance_metrics import PerformanceMetrics
+from src.utils.synthetic_data import SyntheticDatasetSpec, write_dataset_to_excel
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.html_report import HtmlReport
+from src.utils.memory_monitor import MemoryMonitor
+from src.utils.parallel_diff import ParallelDiff
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkSuite:
+    """
+    Times the comparison pipeline stage by stage on synthetic datasets.
+
+    Each benchmark case is a `SyntheticDatasetSpec`. The suite generates the
+    dataset once per spec, times the load, preprocess, compare, diff and
+    report stages separately, and compares the timings against a JSON
+    baseline. The peak memory of each stage is recorded alongside the
+    timings. Cases run with a backend other than pandas are stored as
+    `<case>_<backend>`, and cases with column profiling as `<case>_profiled`.
+
+    The diff stage always runs `ParallelDiff` in worker processes. Every
+    case also times the same diff in process, and records how much faster
+    the workers are as `diff_speedup`.
+    """
+    STAGES = ('load', 'preprocess', 'compare', 'diff', 'report')
+
+    def __init__(self, work_dir: str, baseline_path: str, threshold: float = 0.2,
+                 repeat: int = 1, min_seconds: float = 0.05, backend: str = 'pandas', diff_workers: int = None,
+                 profile_columns: bool = False):
+        """
+        Initializes the benchmark suite.
+
+        Args:
+            work_dir (str): Directory where generated datasets and reports are kept.
+            baseline_path (str): Path of the JSON baseline file.
+            threshold (float): Relative slowdown (0.2 = 20%) flagged as a regression.
+            repeat (int): Number of timed runs per case; the fastest run is kept.
+            min_seconds (float): Absolute slowdown below which differences are
+                                 treated as noise.
+            backend (str): The comparison backend to benchmark.
+            diff_workers (int, optional): Worker processes of the diff stage. Defaults to the CPU count.
+            profile_columns (bool): Profile the columns while preprocessing, see `ConfigurableExcelComparer`.
+        """
+        self.work_dir = work_dir
+        self.baseline_path = baseline_path
+        self.threshold = threshold
+        self.repeat = max(1, repeat)
+        self.min_seconds = min_seconds
+        self.backend = backend
+        self.diff_workers = diff_workers
+        self.profile_columns = profile_columns
+        os.makedirs(self.work_dir, exist_ok=True)
+
+    def _dataset_paths(self, spec: SyntheticDatasetSpec):
+        case_dir = os.path.join(self.work_dir, spec.name)
+        os.makedirs(case_dir, exist_ok=True)
+        source_path = os.path.join(case_dir, 'src.xlsx')
+        target_path = os.path.join(case_dir, 'tgt.xlsx')
+        if not (os.path.exists(source_path) and os.path.exists(target_path)):
+            write_dataset_to_excel(spec, source_path, target_path)
+        return case_dir, source_path, target_path
+
+    def _run_once(self, spec: SyntheticDatasetSpec, case_dir: str, source_path: str,
+                  target_path: str, monitor: MemoryMonitor) -> Dict[str, float]:
+        timings = {}
+        comparer = ConfigurableExcelComparer(
+            source_path=source_path,
+            target_path=target_path,
+            column_mapping=spec.column_mapping(),
+            backend=self.backend,
+            profile_columns=self.profile_columns
+        )
+
+        PerformanceMetrics.start(f"{spec.name}_load")
+        with monitor.stage('load'):
+            comparer._load_dataframes()
+        timings['load'] = PerformanceMetrics.stop(f"{spec.name}_load")
+
+        PerformanceMetrics.start(f"{spec.name}_preprocess")
+        with monitor.stage('preprocess'):
+            comparer._standardize_dataframes()
+        timings['preprocess'] = PerformanceMetrics.stop(f"{spec.name}_preprocess")
+
+        PerformanceMetrics.start(f"{spec.name}_compare")
+        with monitor.stage('compare'):
+            comparison_df = comparer.compare()
+        timings['compare'] = PerformanceMetrics.stop(f"{spec.name}_compare")
+
+        PerformanceMetrics.start(f"{spec.name}_diff")
+        with monitor.stage('diff'):
+            column_masks = ParallelDiff(max_workers=self.diff_workers, min_cells=0).column_masks(comparison_df)
+        timings['diff'] = PerformanceMetrics.stop(f"{spec.name}_diff")
+
+        # The same diff in process, as the reference for the speedup of the workers
+        PerformanceMetrics.start(f"{spec.name}_diff_in_process")
+        ParallelDiff(max_workers=1).column_masks(comparison_df)
+        timings['diff_in_process'] = PerformanceMetrics.stop(f"{spec.name}_diff_in_process")
+
+        PerformanceMetrics.start(f"{spec.name}_report")
+        with monitor.stage('report'):
+            report = HtmlReport(
+                comparison_df,
+                comparer.source_df,
+                comparer.target_df,
+                source_file=source_path,
+                target_file=target_path,
+                key_column=comparer.key_column,
+                column_masks=column_masks,
+                column_profiles=comparer.column_profiles
+            )
+            comparer.release_inputs()
+            report.generate_and_save_report(os.path.join(case_dir, 'report.html'))
+        timings['report'] = PerformanceMetrics.stop(f"{spec.name}_report")
+        return timings
+
+    def run_case(self, spec: SyntheticDatasetSpec) -> Dict[str, Any]:
+        """
+        Runs one benchmark case.
+
+        Args:
+            spec (SyntheticDatasetSpec): The dataset to benchmark.
+
+        Returns:
+            Dict[str, Any]: The spec, the best time per stage, the total, the
+                            highest peak memory per stage in MB and the diff speedup.
+        """
+        logger.info(f"Running benchmark case: {spec.name}")
+        case_dir, source_path, target_path = self._dataset_paths(spec)
+
+        best = {}
+        peak_memory = {}
+        in_process = None
+        for _ in range(self.repeat):
+            with MemoryMonitor() as monitor:
+                timings = self._run_once(spec, case_dir, source_path, target_path, monitor)
+            elapsed = timings.pop('diff_in_process')
+            in_process = min(elapsed, in_process if in_process is not None else elapsed)
+            for stage, elapsed in timings.items():
+                best[stage] = min(elapsed, best.get(stage, elapsed))
+            for stage, peak_mb in monitor.stage_peaks.items():
+                peak_memory[stage] = max(peak_mb, peak_memory.get(stage, peak_mb))
+
+        return {
+            "spec": spec.to_dict(),
+            "stages": best,
+            "total": sum(best.values()),
+            "peak_memory_mb": peak_memory,
+            "diff_speedup": in_process / best['diff'] if best['diff'] else None,
+        }
+
+    def case_name(self, spec: SyntheticDatasetSpec) -> str:
+        """Returns the key of a case in the results and the baseline."""
+        name = spec.name if self.backend == 'pandas' else f"{spec.name}_{self.backend}"
+        return f"{name}_profiled" if self.profile_columns else name
+
+    def run(self, specs: List[SyntheticDatasetSpec]) -> Dict[str, Any]:
+        """
+        Runs all benchmark cases.
+
+        Args:
+            specs (List[SyntheticDatasetSpec]): The datasets to benchmark.
+
+        Returns:
+            Dict[str, Any]: Benchmark results in the baseline file format.
+        """
+        return {
+            "created": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "backend": self.backend,
+            "cases": {self.case_name(spec): self.run_case(spec) for spec in specs},
+        }
+
+    def load_baseline(self) -> Dict[str, Any]:
+        """Returns the stored baseline, or None when no baseline exists yet."""
+        if not os.path.exists(self.baseline_path):
+            return None
+        with open(self.baseline_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_baseline(self, results: Dict[str, Any]):
+        """Stores benchmark results as the new baseline."""
+        baseline_dir = os.path.dirname(self.baseline_path)
+        if baseline_dir:
+            os.makedirs(baseline_dir, exist_ok=True)
+        with open(self.baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Benchmark baseline saved to {self.baseline_path}")
+
+    def find_regressions(self, results: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Compares benchmark results against a baseline.
+
+        A stage regresses when it is slower than the baseline by more than
+        `threshold` (relative) and `min_seconds` (absolute). Cases that are
+        missing from the baseline are ignored.
+
+        Args:
+            results (Dict[str, Any]): Results returned by `run`.
+            baseline (Dict[str, Any]): A previously stored baseline.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per regressed case stage.
+        """
+        regressions = []
+        for case_name, case in results["cases"].items():
+            baseline_case = baseline.get("cases", {}).get(case_name)
+            if baseline_case is None:
+                logger.info(f"No baseline for case '{case_name}'.")
+                continue
+            for stage, elapsed in case["stages"].items():
+                baseline_elapsed = baseline_case["stages"].get(stage)
+                if baseline_elapsed is None:
+                    continue
+                slowdown = elapsed - baseline_elapsed
+                if slowdown > self.min_seconds and elapsed > baseline_elapsed * (1 + self.threshold):
+                    regression = {
+                        "case": case_name,
+                        "stage": stage,
+                        "baseline": baseline_elapsed,
+                        "current": elapsed,
+                        "ratio": elapsed / baseline_elapsed if baseline_elapsed else float('inf'),
+                    }
+                    logger.warning(f"Regression in {case_name} [{stage}]: "
+                                   f"{baseline_elapsed:.3f}s -> {elapsed:.3f}s")
+                    regressions.append(regression)
+        return regressions
+
+    @staticmethod
+    def format_results(results: Dict[str, Any]) -> str:
+        """Formats benchmark results as a plain-text table."""
+        header = f"{'case':<60}" + ''.join(f"{stage:>12}" for stage in BenchmarkSuite.STAGES) + \
+            f"{'total':>12}{'diff x':>12}"
+        lines = [header, '-' * len(header)]
+        for case_name, case in results["cases"].items():
+            line = f"{case_name:<60}"
+            line += ''.join(f"{case['stages'].get(stage, 0.0):>12.3f}" for stage in BenchmarkSuite.STAGES)
+            line += f"{case['total']:>12.3f}"
+            speedup = case.get('diff_speedup')
+            line += f"{speedup:>11.2f}x" if speedup else f"{'':>12}"
+            lines.append(line)
+        return "\n".join(lines)
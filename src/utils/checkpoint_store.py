@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+from typing import Dict, Hashable, List, Tuple
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from src.utils.dataset_cache import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def path_fingerprint(path: str) -> List:
+    """
+    Identifies the current contents of a file or directory without reading it.
+
+    Files are fingerprinted by `file_fingerprint`, directories by the
+    fingerprints of the files directly inside them. Missing paths
+    fingerprint as None, so they never match a checkpoint of an existing path.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    if os.path.isdir(path):
+        return [file_fingerprint(os.path.join(path, name)) for name in sorted(os.listdir(path))
+                if os.path.isfile(os.path.join(path, name))]
+    return list(file_fingerprint(path))
+
+
+class CheckpointStore:
+    """
+    Persists finished pipeline work in a directory so a failed run can resume.
+
+    Checkpoints are the small results of finished scenarios and fan-out
+    pairs, pickled under a hash of their key. Datasets, i.e. loaded and
+    standardized inputs, are written with `put_tables` as Arrow IPC files
+    next to a small pickle recording them. Keys contain the input
+    fingerprints and the column mapping, so a checkpoint is only reused
+    while its inputs are unchanged. Every checkpoint is written atomically,
+    and its pickle last, so a run that is killed midway never leaves a
+    partial one. Without `resume`, checkpoints are written but not read back.
+    """
+    def __init__(self, work_dir: str, resume: bool = False):
+        """
+        Initializes the CheckpointStore.
+
+        Args:
+            work_dir (str): Directory holding the checkpoints.
+            resume (bool): Whether existing checkpoints are reused.
+        """
+        self.work_dir = work_dir
+        self.resume = resume
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_hash(key: Hashable) -> str:
+        """Returns a stable file name stem for a checkpoint key."""
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, key: Tuple, extension: str = 'pkl') -> str:
+        return os.path.join(self.work_dir, str(key[0]), f"{self.key_hash(key)}.{extension}")
+
+    def get(self, key: Tuple):
+        """
+        Returns the checkpoint for `key`, or None when there is none or resuming is off.
+
+        The first element of `key` names the kind of checkpoint and becomes its subdirectory.
+        """
+        path = self._path(key)
+        if not self.resume or not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.info(f"Resuming from checkpoint {path}")
+        return value
+
+    def put(self, key: Tuple, value):
+        """
+        Writes the checkpoint for `key`, replacing an older one.
+
+        Args:
+            key (Tuple): The checkpoint key, see `get`.
+            value: The picklable value to store.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        logger.info(f"Checkpoint written: {path}")
+
+    def get_tables(self, key: Tuple):
+        """
+        Returns the value and tables checkpointed by `put_tables`, or None like `get`.
+
+        Returns:
+            Tuple: The value and a dict of the Arrow tables by name.
+        """
+        checkpoint = self.get(key)
+        if checkpoint is None:
+            return None
+        try:
+            tables = {}
+            for name in checkpoint["tables"]:
+                with pa.OSFile(self._path(key, f"{name}.arrow"), 'rb') as source:
+                    tables[name] = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning("Ignoring unreadable checkpoint tables of %s: %s", self._path(key), e)
+            self.hits -= 1
+            self.misses += 1
+            return None
+        return checkpoint["value"], tables
+
+    def put_tables(self, key: Tuple, value, tables: Dict):
+        """
+        Writes Arrow tables as Arrow IPC files, then `value` as the checkpoint recording them.
+
+        Args:
+            key (Tuple): The checkpoint key, see `get`.
+            value: A small picklable value stored with the tables.
+            tables (Dict): The `pyarrow.Table`s to store by name.
+        """
+        for name, table in tables.items():
+            path = self._path(key, f"{name}.arrow")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with pa.OSFile(temp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(temp_path, path)
+        self.put(key, {"value": value, "tables": list(tables)})
+
+    def stats(self) -> Dict:
+        """Returns the checkpoint directory and the hit/miss counters."""
+        return {"work_dir": self.work_dir, "resume": self.resume, "hits": self.hits, "misses": self.misses}
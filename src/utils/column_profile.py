@@ -0,0 +1,157 @@
+import logging
+import math
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+
+logger = logging.getLogger(__name__)
+
+# The aggregates of a column profile, in report order
+PROFILE_FIELDS = ('rows', 'nulls', 'coerced', 'distinct', 'min', 'max', 'sum')
+
+
+def _scalar(value):
+    """Turns an aggregate into a JSON-friendly Python value."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _profile(rows, nulls, invalid_count, distinct, minimum=None, maximum=None, total=None):
+    return {
+        "rows": int(rows),
+        "nulls": int(nulls),
+        # Nulls are counted before conversion; the rest of the invalid values were coerced away
+        "coerced": int(invalid_count - nulls) if invalid_count is not None else 0,
+        "distinct": int(distinct),
+        "min": _scalar(minimum),
+        "max": _scalar(maximum),
+        "sum": _scalar(total),
+    }
+
+
+def profile_series(values: pd.Series, nulls: int, invalid: np.ndarray = None) -> Dict:
+    """
+    Profiles a standardized pandas column.
+
+    Args:
+        values (pd.Series): The standardized column.
+        nulls (int): Null values of the column before it was converted.
+        invalid (np.ndarray, optional): True where the conversion replaced a value, e.g. by
+                                        -1 or NaT, because it was null or could not be parsed.
+                                        These values are left out of the aggregates.
+
+    Returns:
+        Dict: The aggregates of PROFILE_FIELDS. min and max are given for numeric and
+              datetime columns, sum for numeric columns only.
+    """
+    valid = values[~invalid] if invalid is not None else values
+    kind = values.dtype.kind
+    # `agg` makes one pass per aggregate. A single Arrow aggregation (as in `profile_arrow`)
+    # measured 10-25% slower on 2M rows: the distinct count dominates, and pandas hashes
+    # numbers faster than `count_distinct`. `run_benchmarks.py --profile-columns` shows the cost.
+    functions = ['nunique'] + (['min', 'max'] if kind in 'iufM' else []) + (['sum'] if kind in 'iuf' else [])
+    aggregates = valid.agg(functions)
+    return _profile(len(values), nulls, int(invalid.sum()) if invalid is not None else None,
+                    aggregates['nunique'], aggregates.get('min'), aggregates.get('max'), aggregates.get('sum'))
+
+
+def _arrow_scalar(scalar, value_type):
+    if not scalar.is_valid:
+        return None
+    if pa.types.is_timestamp(value_type):
+        # as_py() drops nanoseconds; go through pandas like the pandas profile does
+        return pd.Timestamp(scalar.cast(pa.int64()).as_py(), unit=value_type.unit, tz=value_type.tz)
+    return scalar.as_py()
+
+
+def arrow_nulls(values) -> int:
+    """Null values of an Arrow column, counting float NaN as null like pandas does."""
+    nulls = values.null_count
+    if pa.types.is_floating(values.type):
+        nulls += pc.sum(pc.is_nan(values), min_count=0).as_py()
+    return int(nulls)
+
+
+def profile_arrow(values, nulls: int, invalid=None) -> Dict:
+    """
+    Profiles a standardized Arrow column with Arrow compute kernels; the
+    result is identical to `profile_series` on the same values.
+
+    Args:
+        values (pa.Array or pa.ChunkedArray): The standardized column.
+        nulls (int): Null values of the column before it was converted, see `arrow_nulls`.
+        invalid (optional): Boolean Arrow or NumPy array, see `profile_series`.
+    """
+    valid = values
+    invalid_count = None
+    if invalid is not None:
+        invalid = pa.array(invalid) if isinstance(invalid, np.ndarray) else invalid
+        invalid_count = pc.sum(invalid, min_count=0).as_py()
+        valid = valid.filter(pc.invert(invalid))
+    if pa.types.is_floating(valid.type):
+        valid = valid.filter(pc.invert(pc.is_nan(valid)))
+    value_type = values.type
+    numeric = pa.types.is_integer(value_type) or pa.types.is_floating(value_type)
+    # All aggregates of the column in one Arrow aggregation
+    aggregations = [('values', 'count_distinct', pc.CountOptions(mode='only_valid'))]
+    if numeric or pa.types.is_timestamp(value_type):
+        aggregations.append(('values', 'min_max'))
+    if numeric:
+        aggregations.append(('values', 'sum', pc.ScalarAggregateOptions(min_count=0)))
+    aggregates = pa.table({'values': valid}).group_by([]).aggregate(aggregations)
+    minimum = maximum = total = None
+    if 'values_min_max' in aggregates.column_names:
+        min_max = aggregates['values_min_max'][0]
+        minimum = _arrow_scalar(min_max['min'], value_type)
+        maximum = _arrow_scalar(min_max['max'], value_type)
+    if 'values_sum' in aggregates.column_names:
+        total = aggregates['values_sum'][0].as_py()
+    return _profile(len(values), nulls, invalid_count, aggregates['values_count_distinct'][0].as_py(),
+                    minimum, maximum, total)
+
+
+def _same(source_value, target_value):
+    values = (source_value, target_value)
+    if any(isinstance(value, float) for value in values) and \
+            all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return math.isclose(source_value, target_value, rel_tol=1e-9, abs_tol=1e-9)
+    return source_value == target_value
+
+
+def profile_differences(column_profiles: Dict) -> Dict[str, list]:
+    """
+    Compares the source and target profile of every column present on both sides.
+
+    Row counts are not compared; they are the same for every column and
+    part of the summary. Float sums are compared with a relative tolerance,
+    since summing the same values in another row order rounds differently.
+
+    Args:
+        column_profiles (Dict): {'source': {column: profile}, 'target': {column: profile}}.
+
+    Returns:
+        Dict[str, list]: Per column with differing aggregates, the names of those aggregates.
+    """
+    differences = {}
+    for col, source_profile in column_profiles.get("source", {}).items():
+        target_profile = column_profiles.get("target", {}).get(col)
+        if target_profile is None:
+            continue
+        fields = [field for field in PROFILE_FIELDS[1:]
+                  if not _same(source_profile.get(field), target_profile.get(field))]
+        if fields:
+            differences[col] = fields
+    return differences
@@ -0,0 +1,565 @@
+import inspect
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+
+try:
+    import polars as pl
+except ImportError:  # pragma: no cover - optional dependency
+    pl = None
+
+from src.utils.data_sources import DataSource
+from src.utils.column_profile import arrow_nulls, profile_arrow, profile_series
+from src.utils.diff_output import MERGE_COLUMN, SOURCE_SUFFIX, TARGET_SUFFIX
+from src.utils.memory_monitor import check_memory
+from src.utils.telemetry import expect_rows, report_progress
+
+logger = logging.getLogger(__name__)
+
+MERGE_CATEGORIES = ['left_only', 'right_only', 'both']
+_SOURCE_ROW = '__source_row'
+_TARGET_ROW = '__target_row'
+# Polars renamed `join_nulls` to `nulls_equal`
+_POLARS_NULLS_EQUAL = 'nulls_equal' if pl is not None and \
+    'nulls_equal' in inspect.signature(pl.DataFrame.join).parameters else 'join_nulls'
+
+
+def to_int(values: pd.Series) -> pd.Series:
+    """The reference 'int' conversion: non-numeric values and blanks become -1."""
+    return to_int_masked(values)[0]
+
+
+def to_int_masked(values: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """`to_int`, also returning a mask of the values that became -1 because they were blank or not numeric."""
+    numeric = pd.to_numeric(values, errors='coerce')
+    invalid = numeric.isna().to_numpy()
+    return numeric.fillna(-1).astype(int), invalid
+
+
+def to_datetime(values: pd.Series, date_format: str = None) -> pd.Series:
+    """The reference 'datetime' conversion: unparseable values become NaT."""
+    # Use 'errors=coerce' for robustness
+    return pd.to_datetime(values, errors='coerce', format=date_format)
+
+
+class ColumnStep:
+    """One mapped column: where it comes from on each side and how it is converted."""
+    def __init__(self, name: str, source: str, target: str = None, data_type: str = None, date_format: str = None):
+        """
+        Initializes the step.
+
+        Args:
+            name (str): The standardized column name (the lowercase source name).
+            source (str): The column in the loaded source frame.
+            target (str, optional): The column in the loaded target frame, None for source-only columns.
+            data_type (str, optional): 'int' or 'datetime' to convert both sides, None to keep the values.
+            date_format (str, optional): The strptime format for 'datetime' columns.
+        """
+        self.name = name
+        self.source = source
+        self.target = target
+        self.data_type = data_type
+        self.date_format = date_format
+
+    def __repr__(self):
+        return f"<ColumnStep {self.source} -> {self.target} as {self.name} ({self.data_type})>"
+
+
+class MappingPlan:
+    """
+    A column mapping resolved against the columns that were actually loaded.
+
+    The plan is compiled once and then executed by any backend, so every
+    backend standardizes exactly the same columns in the same order.
+    """
+    def __init__(self, column_mapping: dict, source_columns: List[str], target_columns: List[str]):
+        """
+        Compiles the plan.
+
+        Args:
+            column_mapping (dict): The column mapping from the config file.
+            source_columns (List[str]): Lowercase column names of the loaded source frame.
+            target_columns (List[str]): Lowercase column names of the loaded target frame.
+        """
+        self.key_column = None
+        self.steps = []
+        source_columns, target_columns = set(source_columns), set(target_columns)
+        for src_col_key, attributes in column_mapping.items():
+            src_col_norm = src_col_key.lower()
+            target_col_key = attributes.get("target")
+            target_col_norm = target_col_key.lower() if target_col_key else None
+
+            if attributes.get("is_key"):
+                self.key_column = src_col_norm
+
+            if target_col_norm:
+                if src_col_norm in source_columns and target_col_norm in target_columns:
+                    self.steps.append(ColumnStep(src_col_norm, src_col_norm, target_col_norm,
+                                                 attributes.get("type"), attributes.get("format")))
+                else:
+                    logger.warning("Mapped column '%s' (src) or '%s' (tgt) not found in respective files. Skipping.",
+                                   src_col_key, target_col_key)
+            else:
+                if src_col_norm in source_columns:
+                    self.steps.append(ColumnStep(src_col_norm, src_col_norm))
+                else:
+                    logger.warning("Source-only column '%s' not found in the source file. Skipping.", src_col_key)
+
+    def target_uses(self) -> Dict[str, int]:
+        """Counts how many steps read each target column."""
+        uses = {}
+        for step in self.steps:
+            if step.target:
+                uses[step.target] = uses.get(step.target, 0) + 1
+        return uses
+
+
+class ComparisonBackend:
+    """
+    The dataframe engine that loads, standardizes and joins the two sides of a comparison.
+
+    Frames between `load` and `join` are in the backend's native format;
+    `join` always returns a pandas DataFrame shaped exactly like
+    `pd.merge(..., how='outer', suffixes=('_src', '_tgt'), indicator=True)`,
+    so the reports and diff output do not depend on the backend. The diff
+    itself is computed on that pandas result by the shared, vectorized
+    `mismatch_mask`.
+    """
+    name = None
+
+    def load(self, reader: DataSource, columns: List[str] = None):
+        """Reads the given columns of a data source into a native frame."""
+        raise NotImplementedError
+
+    def column_names(self, frame) -> List[str]:
+        """Returns the column names of a native frame."""
+        raise NotImplementedError
+
+    def rename_columns(self, frame, names: List[str]):
+        """Returns the frame with its columns renamed positionally to `names`."""
+        raise NotImplementedError
+
+    def standardize(self, source, target, plan: MappingPlan, profiles: Dict = None) -> Tuple[object, object]:
+        """
+        Executes a mapping plan and returns the standardized source and target frames.
+
+        With a `profiles` dict, the profile of every standardized column (see
+        `column_profile`) is computed while the column is converted and stored
+        as `profiles['source'][name]` and `profiles['target'][name]`.
+        """
+        raise NotImplementedError
+
+    def join(self, source, target, key_column: str) -> pd.DataFrame:
+        """Full outer join on the key column, returned as a pandas comparison frame."""
+        raise NotImplementedError
+
+    def to_pandas(self, frame) -> pd.DataFrame:
+        """Converts a native frame to pandas."""
+        raise NotImplementedError
+
+    def num_rows(self, frame) -> int:
+        """Returns the number of rows of a native frame."""
+        raise NotImplementedError
+
+    def nbytes(self, frame) -> int:
+        """Estimates the memory held by a native frame."""
+        raise NotImplementedError
+
+    def to_arrow(self, frame):
+        """
+        Converts a native frame to an Arrow table that `from_arrow` restores, e.g. for a checkpoint.
+
+        Raises:
+            TypeError, ValueError: If a column has no Arrow type, e.g. an object column mixing numbers and text.
+        """
+        raise NotImplementedError
+
+    def from_arrow(self, table):
+        """Converts an Arrow table written by `to_arrow` back to a native frame."""
+        raise NotImplementedError
+
+    def share(self, frame):
+        """Returns a frame that can be standardized or joined without changing `frame`, e.g. a cached one."""
+        return frame
+
+    @staticmethod
+    def _tracked_steps(plan: MappingPlan, rows: int):
+        """
+        Yields the steps of a plan and reports the progress of standardizing
+        `rows` rows (both sides together) after each of them.
+        """
+        expect_rows(rows)
+        for step in plan.steps:
+            yield step
+            report_progress(rows / len(plan.steps))
+            check_memory(f"standardizing '{step.name}'")
+
+    @staticmethod
+    def _suffixed_names(source_names, target_names, key_column):
+        common = (set(source_names) & set(target_names)) - {key_column}
+        source_names = [f"{col}{SOURCE_SUFFIX}" if col in common else col for col in source_names]
+        target_names = [f"{col}{TARGET_SUFFIX}" if col in common else col for col in target_names]
+        return source_names, target_names
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+
+class PandasBackend(ComparisonBackend):
+    """The default backend: single-threaded pandas, the reference for all other backends."""
+    name = 'pandas'
+
+    def load(self, reader, columns=None):
+        return reader.read(columns=columns)
+
+    def column_names(self, frame):
+        return list(frame.columns)
+
+    def rename_columns(self, frame, names):
+        frame.columns = names
+        return frame
+
+    @staticmethod
+    def _convert(values, data_type, date_format):
+        """Returns the converted column and the mask of values the conversion replaced, or None."""
+        if data_type == 'int':
+            return to_int_masked(values)
+        if data_type == 'datetime':
+            converted = to_datetime(values, date_format)
+            return converted, converted.isna().to_numpy()
+        return values, None
+
+    @classmethod
+    def _standardize_column(cls, values, data_type, date_format, side_profiles, name):
+        """Converts one column and, with `side_profiles`, stores its profile under `name`."""
+        converted, invalid = cls._convert(values, data_type, date_format)
+        if side_profiles is not None:
+            side_profiles[name] = profile_series(converted, int(values.isna().sum()), invalid)
+        return converted
+
+    def standardize(self, source, target, plan, profiles=None):
+        standardized_source = pd.DataFrame()
+        standardized_target = pd.DataFrame()
+        source_profiles = profiles.setdefault('source', {}) if profiles is not None else None
+        target_profiles = profiles.setdefault('target', {}) if profiles is not None else None
+        # Raw columns are taken out of the loaded frames once their last use is
+        # standardized, so raw and converted copies of a column do not pile up.
+        target_uses = plan.target_uses()
+        for step in self._tracked_steps(plan, self.num_rows(source) + self.num_rows(target)):
+            if step.target is None:
+                # Source-only columns are kept as loaded
+                standardized_source[step.name] = self._standardize_column(
+                    source.pop(step.source), None, None, source_profiles, step.name)
+                continue
+            target_uses[step.target] -= 1
+            raw_target = target.pop(step.target) if target_uses[step.target] == 0 else target[step.target]
+            standardized_source[step.name] = self._standardize_column(
+                source.pop(step.source), step.data_type, step.date_format, source_profiles, step.name)
+            standardized_target[step.name] = self._standardize_column(
+                raw_target, step.data_type, step.date_format, target_profiles, step.name)
+        return standardized_source, standardized_target
+
+    def join(self, source, target, key_column):
+        return pd.merge(
+            source,
+            target,
+            on=key_column,
+            how='outer',
+            suffixes=(SOURCE_SUFFIX, TARGET_SUFFIX),
+            indicator=True
+        )
+
+    def to_pandas(self, frame):
+        return frame
+
+    def num_rows(self, frame):
+        return len(frame)
+
+    def nbytes(self, frame):
+        return int(frame.memory_usage(index=True, deep=True).sum())
+
+    def to_arrow(self, frame):
+        if pa is None:
+            raise ImportError("Converting pandas frames to Arrow requires the 'pyarrow' package.")
+        return pa.Table.from_pandas(frame)
+
+    def from_arrow(self, table):
+        frame = table.to_pandas()
+        # Object columns come back typed (e.g. Python ints as float64); they are restored as
+        # Python objects, with NaN for missing values like the pandas readers produce
+        for column in table.schema.pandas_metadata['columns']:
+            if column['numpy_type'] == 'object' and column['name'] in frame.columns:
+                values = np.array(table.column(column['name']).to_pylist(), dtype=object)
+                values[pd.isna(values)] = np.nan
+                frame[column['name']] = values
+        return frame
+
+    def share(self, frame):
+        # `standardize` pops columns; a shallow copy keeps the original intact without copying data
+        return frame.copy(deep=False)
+
+
+def _arrow_to_comparison_df(joined, key_column: str, source_columns: List[str],
+                            target_columns: List[str]) -> pd.DataFrame:
+    """
+    Turns the result of a full outer join with row-number columns on both
+    sides into the pandas frame `pd.merge` would produce: rows sorted by key
+    and then by source and target row, columns in merge order, and an
+    `_merge` indicator.
+    """
+    target_columns = [col for col in target_columns if col != key_column]
+    order = pc.sort_indices(joined, sort_keys=[(key_column, 'ascending'), (_SOURCE_ROW, 'ascending'),
+                                               (_TARGET_ROW, 'ascending')])
+    joined = joined.take(order)
+    in_source = joined.column(_SOURCE_ROW).is_valid().to_numpy(zero_copy_only=False)
+    in_target = joined.column(_TARGET_ROW).is_valid().to_numpy(zero_copy_only=False)
+    comparison_df = joined.select(source_columns + target_columns).replace_schema_metadata(None).to_pandas()
+    # pandas fills object columns with NaN (Arrow with None) on rows that the side does not have
+    for columns, present in ((source_columns, in_source), (target_columns, in_target)):
+        for col in columns:
+            if col != key_column and comparison_df[col].dtype == object and not present.all():
+                comparison_df.loc[~present, col] = np.nan
+    codes = np.where(in_source & in_target, 2, np.where(in_source, 0, 1)).astype(np.int8)
+    comparison_df[MERGE_COLUMN] = pd.Categorical.from_codes(codes, categories=MERGE_CATEGORIES)
+    return comparison_df
+
+
+def _null_key_rows(left, right, schema):
+    """
+    Returns the rows `pd.merge` produces for the null keys of a full outer
+    join: every pair of a left and a right row with a null key, or the rows
+    of one side alone when the other side has no null keys. `left` and
+    `right` hold only those rows; `schema` is the schema of the join result.
+    """
+    rows = left.num_rows * right.num_rows or left.num_rows + right.num_rows
+    if left.num_rows and right.num_rows:
+        left, right = (left.take(np.repeat(np.arange(left.num_rows), right.num_rows)),
+                       right.take(np.tile(np.arange(right.num_rows), left.num_rows)))
+    columns = []
+    for field in schema:
+        side = next((side for side in (left, right) if field.name in side.column_names and side.num_rows == rows),
+                    None)
+        columns.append(side.column(field.name).cast(field.type) if side is not None else pa.nulls(rows, field.type))
+    return pa.table(columns, schema=schema)
+
+
+class ArrowBackend(ComparisonBackend):
+    """
+    Runs the comparison on Arrow tables with pyarrow compute.
+
+    CSV and Parquet inputs are read straight into Arrow, and the join uses
+    Arrow's multithreaded hash join (`pyarrow.set_cpu_count` controls the
+    threads). Numeric and timestamp conversions run as Arrow kernels; other
+    conversions (e.g. parsing strings) use the pandas reference conversion
+    for that column so results stay identical.
+    """
+    name = 'arrow'
+
+    def __init__(self):
+        if pa is None:
+            raise ImportError("The 'arrow' backend requires the 'pyarrow' package.")
+
+    def load(self, reader, columns=None):
+        return reader.read_arrow(columns=columns)
+
+    def column_names(self, frame):
+        return list(frame.column_names)
+
+    def rename_columns(self, frame, names):
+        return frame.rename_columns(names)
+
+    def _convert(self, values, step):
+        """Returns the converted column and the mask of values the conversion replaced, or None."""
+        value_type = values.type
+        if step.data_type == 'int':
+            if pa.types.is_integer(value_type):
+                return pc.fill_null(values.cast(pa.int64()), -1), values.is_null()
+            if pa.types.is_floating(value_type):
+                values = pc.if_else(pc.is_nan(values), None, values)
+                return pc.fill_null(values, -1.0).cast(pa.int64(), safe=False), values.is_null()
+            converted, invalid = to_int_masked(values.to_pandas())
+            return pa.chunked_array([pa.array(converted)]), invalid
+        if step.data_type == 'datetime':
+            if pa.types.is_timestamp(value_type):
+                return values, values.is_null()
+            converted = to_datetime(values.to_pandas(), step.date_format)
+            return pa.chunked_array([pa.array(converted, from_pandas=True)]), converted.isna().to_numpy()
+        return values, None
+
+    def _standardize_column(self, values, step, side_profiles):
+        converted, invalid = self._convert(values, step)
+        if side_profiles is not None:
+            side_profiles[step.name] = profile_arrow(converted, arrow_nulls(values), invalid)
+        return converted
+
+    def standardize(self, source, target, plan, profiles=None):
+        standardized_source = {}
+        standardized_target = {}
+        source_profiles = profiles.setdefault('source', {}) if profiles is not None else None
+        target_profiles = profiles.setdefault('target', {}) if profiles is not None else None
+        for step in self._tracked_steps(plan, self.num_rows(source) + self.num_rows(target)):
+            standardized_source[step.name] = self._standardize_column(
+                source.column(step.source), step, source_profiles)
+            if step.target is not None:
+                standardized_target[step.name] = self._standardize_column(
+                    target.column(step.target), step, target_profiles)
+        return pa.table(standardized_source), pa.table(standardized_target)
+
+    def join(self, source, target, key_column):
+        source_names, target_names = self._suffixed_names(source.column_names, target.column_names, key_column)
+        left = source.rename_columns(source_names).append_column(
+            _SOURCE_ROW, pa.array(np.arange(source.num_rows, dtype=np.int64)))
+        right = target.rename_columns(target_names).append_column(
+            _TARGET_ROW, pa.array(np.arange(target.num_rows, dtype=np.int64)))
+        left_nulls = pc.is_null(left.column(key_column))
+        right_nulls = pc.is_null(right.column(key_column))
+        has_null_keys = left.column(key_column).null_count or right.column(key_column).null_count
+        if has_null_keys:
+            # Arrow's hash join never matches null keys, while pd.merge matches them with each other
+            left, left_null_rows = left.filter(pc.invert(left_nulls)), left.filter(left_nulls)
+            right, right_null_rows = right.filter(pc.invert(right_nulls)), right.filter(right_nulls)
+        joined = left.join(right, keys=key_column, join_type='full outer', coalesce_keys=True, use_threads=True)
+        if has_null_keys:
+            joined = pa.concat_tables([joined, _null_key_rows(left_null_rows, right_null_rows, joined.schema)])
+        return _arrow_to_comparison_df(joined, key_column, source_names, target_names)
+
+    def to_pandas(self, frame):
+        return frame if isinstance(frame, pd.DataFrame) else frame.to_pandas()
+
+    def num_rows(self, frame):
+        return len(frame) if isinstance(frame, pd.DataFrame) else frame.num_rows
+
+    def nbytes(self, frame):
+        return frame.nbytes
+
+    def to_arrow(self, frame):
+        return frame
+
+    def from_arrow(self, table):
+        return table
+
+
+class PolarsBackend(ComparisonBackend):
+    """
+    Runs the comparison on Polars DataFrames.
+
+    Inputs are read through Arrow, conversions and the join run on Polars'
+    multithreaded engine (POLARS_MAX_THREADS controls the threads), and the
+    joined result is converted through Arrow like the 'arrow' backend.
+    """
+    name = 'polars'
+
+    def __init__(self):
+        if pl is None or pa is None:
+            raise ImportError("The 'polars' backend requires the 'polars' and 'pyarrow' packages.")
+
+    def load(self, reader, columns=None):
+        return pl.from_arrow(reader.read_arrow(columns=columns))
+
+    def column_names(self, frame):
+        return list(frame.columns)
+
+    def rename_columns(self, frame, names):
+        return frame.rename(dict(zip(frame.columns, names)))
+
+    def _convert(self, values, step):
+        """Returns the converted column and the mask of values the conversion replaced, or None."""
+        dtype = values.dtype
+        if step.data_type == 'int':
+            if dtype.is_integer():
+                return values.cast(pl.Int64).fill_null(-1), values.is_null().to_numpy()
+            if dtype.is_float():
+                values = values.fill_nan(None)
+                return values.fill_null(-1.0).cast(pl.Int64), values.is_null().to_numpy()
+            converted, invalid = to_int_masked(values.to_pandas())
+            return pl.from_pandas(converted).rename(values.name), invalid
+        if step.data_type == 'datetime':
+            if isinstance(dtype, pl.Datetime):
+                return values, values.is_null().to_numpy()
+            converted = to_datetime(values.to_pandas(), step.date_format)
+            return pl.from_pandas(converted).rename(values.name), converted.isna().to_numpy()
+        return values, None
+
+    def _standardize_column(self, values, step, side_profiles):
+        converted, invalid = self._convert(values, step)
+        if side_profiles is not None:
+            # Profiled through Arrow, which Polars shares its memory with
+            side_profiles[step.name] = profile_arrow(converted.to_arrow(), arrow_nulls(values.to_arrow()), invalid)
+        return converted.rename(step.name)
+
+    def standardize(self, source, target, plan, profiles=None):
+        standardized_source = []
+        standardized_target = []
+        source_profiles = profiles.setdefault('source', {}) if profiles is not None else None
+        target_profiles = profiles.setdefault('target', {}) if profiles is not None else None
+        for step in self._tracked_steps(plan, self.num_rows(source) + self.num_rows(target)):
+            standardized_source.append(self._standardize_column(source.get_column(step.source), step, source_profiles))
+            if step.target is not None:
+                standardized_target.append(
+                    self._standardize_column(target.get_column(step.target), step, target_profiles))
+        return pl.DataFrame(standardized_source), pl.DataFrame(standardized_target)
+
+    def join(self, source, target, key_column):
+        source_names, target_names = self._suffixed_names(source.columns, target.columns, key_column)
+        left = self.rename_columns(source, source_names).with_row_index(_SOURCE_ROW)
+        right = self.rename_columns(target, target_names).with_row_index(_TARGET_ROW)
+        # Null keys match each other, like in pd.merge
+        joined = left.join(right, on=key_column, how='full', coalesce=True, **{_POLARS_NULLS_EQUAL: True})
+        return _arrow_to_comparison_df(joined.to_arrow(), key_column, source_names, target_names)
+
+    def to_pandas(self, frame):
+        return frame if isinstance(frame, pd.DataFrame) else frame.to_arrow().to_pandas()
+
+    def num_rows(self, frame):
+        return len(frame) if isinstance(frame, pd.DataFrame) else frame.height
+
+    def nbytes(self, frame):
+        return int(frame.estimated_size())
+
+    def to_arrow(self, frame):
+        return frame.to_arrow()
+
+    def from_arrow(self, table):
+        return pl.from_arrow(table)
+
+
+BACKENDS = {backend.name: backend for backend in (PandasBackend, ArrowBackend, PolarsBackend)}
+
+
+def get_backend(backend='pandas') -> ComparisonBackend:
+    """
+    Returns a comparison backend.
+
+    Args:
+        backend (str or ComparisonBackend): 'pandas', 'arrow', 'polars', or a backend instance.
+
+    Returns:
+        ComparisonBackend: The backend.
+    """
+    if isinstance(backend, ComparisonBackend):
+        return backend
+    name = (backend or 'pandas').lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown comparison backend '{backend}'. Supported: {sorted(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+def available_backends() -> List[str]:
+    """Returns the names of the backends whose dependencies are installed."""
+    available = []
+    for name, backend_class in BACKENDS.items():
+        try:
+            backend_class()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
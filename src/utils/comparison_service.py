@@ -0,0 +1,259 @@
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import secrets
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from src.utils.database_config import DatabaseConfig
+from src.utils.dataset_cache import DatasetCache
+from src.utils.scenario_runner import ScenarioRunner
+from src.utils.telemetry import Telemetry
+
+logger = logging.getLogger(__name__)
+
+# Job fields that override the scenario options of the same run
+JOB_OPTIONS = {
+    "source": "SOURCE_FILE_PATH",
+    "target": "TARGET_FILE_PATH",
+    "mapping": "COLUMN_MAPPING",
+    "backend": "BACKEND",
+    "diff_output_formats": "DIFF_OUTPUT_FORMATS",
+    "report_formats": "REPORT_FORMATS",
+    "profile_columns": "PROFILE_COLUMNS",
+}
+
+# Job fields naming input files, which must lie inside the allowed roots
+PATH_FIELDS = ("source", "target")
+
+# Request header carrying the shared token of the service
+TOKEN_HEADER = 'X-Comparison-Token'
+
+
+class JobError(ValueError):
+    """Raised for a comparison job that cannot be run as submitted."""
+
+
+def is_loopback(host: str) -> bool:
+    """Returns whether `host` only accepts connections from the local machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ComparisonService:
+    """
+    Runs comparison jobs in a long-lived process that keeps its datasets warm.
+
+    Loaded and standardized inputs stay in a memory-bounded LRU
+    `DatasetCache` between jobs, so comparing the same reference file
+    against a new target, or with an edited mapping, skips reading and
+    converting everything that did not change. Jobs run one at a time;
+    they are memory-heavy and share the cache.
+
+    A job is a dict with a `scenario` name from the config file and any of
+    the optional fields of `JOB_OPTIONS` (`source`, `target`, `mapping` as
+    a section name or an inline mapping dict, `backend`,
+    `diff_output_formats`, `report_formats`, `profile_columns`), which override that
+    scenario's settings. `source` and `target` must lie inside one of the
+    `allowed_roots`.
+
+    Every HTTP request must carry the service's token in the `TOKEN_HEADER`
+    header, and POST bodies must be `application/json`.
+    """
+    def __init__(self, config_reader: DatabaseConfig, output_dir: str = os.path.join('src', 'outputs'),
+                 cache_mb: float = 1024, max_workers: int = None, backend: str = 'pandas',
+                 memory_limit_mb: float = None, profile_mode: str = None, telemetry: Telemetry = None,
+                 token: str = None, allowed_roots: List[str] = None, profile_columns: bool = False):
+        """
+        Initializes the ComparisonService.
+
+        Args:
+            config_reader (DatabaseConfig): The configuration reader instance.
+            output_dir (str): Base directory for reports and diff output.
+            cache_mb (float): Memory budget in MB for cached datasets.
+            max_workers (int, optional): Maximum worker processes, see `ScenarioRunner`.
+            backend (str): Default comparison backend.
+            memory_limit_mb (float, optional): Default memory ceiling per job in MB.
+            profile_mode (str, optional): 'cprofile', 'sample' or None, see `StageProfiler`.
+            telemetry (Telemetry, optional): Live progress of the running job, also shown by `status`.
+            token (str, optional): Shared token HTTP clients must send. A random token is
+                                   generated when omitted.
+            allowed_roots (List[str], optional): Directories that `source` and `target` job
+                                                 fields may point into. Without any, jobs can
+                                                 only use the paths of the config file.
+            profile_columns (bool): Default for jobs and scenarios without PROFILE_COLUMNS,
+                                    see `ScenarioRunner`.
+        """
+        self.config_reader = config_reader
+        self.token = token or secrets.token_urlsafe(24)
+        self.allowed_roots = [os.path.realpath(root) for root in allowed_roots or []]
+        self.cache = DatasetCache(cache_mb)
+        self.telemetry = telemetry
+        self.runner = ScenarioRunner(config_reader, output_dir=output_dir, max_workers=max_workers,
+                                     memory_limit_mb=memory_limit_mb, backend=backend, cache=self.cache,
+                                     profile_mode=profile_mode, telemetry=telemetry,
+                                     profile_columns=profile_columns)
+        self.jobs_run = 0
+        self._job_lock = threading.Lock()
+
+    def submit(self, job: Dict) -> Dict:
+        """
+        Runs one comparison job and waits for it.
+
+        Args:
+            job (Dict): The scenario name and optional overrides, see the class docstring.
+
+        Returns:
+            Dict: The `ScenarioRunner.run` result plus the cache statistics after the job.
+
+        Raises:
+            JobError: If the job has no known scenario or has unknown fields.
+        """
+        if not isinstance(job, dict):
+            raise JobError("A job must be a JSON object.")
+        scenario_name = job.get("scenario")
+        if not scenario_name or scenario_name not in self.config_reader.config:
+            raise JobError(f"Unknown scenario '{scenario_name}'.")
+        unknown = set(job) - set(JOB_OPTIONS) - {"scenario"}
+        if unknown:
+            raise JobError(f"Unknown job fields: {sorted(unknown)}. Supported: {sorted(JOB_OPTIONS)}.")
+        for field in PATH_FIELDS:
+            if field in job:
+                self._check_path(field, job[field])
+        options = {JOB_OPTIONS[field]: value for field, value in job.items() if field in JOB_OPTIONS}
+
+        with self._job_lock:
+            result = self.runner.run(scenario_name, options=options)
+            self.jobs_run += 1
+        result["cache"] = self.cache.stats()
+        return result
+
+    def _check_path(self, field: str, path):
+        if not isinstance(path, str) or not path:
+            raise JobError(f"Job field '{field}' must be a file path.")
+        if not self.allowed_roots:
+            raise JobError(f"Job field '{field}' is not accepted: the service has no allowed roots.")
+        resolved = os.path.realpath(path)
+        for root in self.allowed_roots:
+            if os.path.commonpath([root, resolved]) == root:
+                return
+        raise JobError(f"Job field '{field}' points outside the allowed roots: {path}")
+
+    def status(self) -> Dict:
+        """Returns the number of jobs run so far, the cache statistics and the progress of the running job."""
+        status = {"jobs_run": self.jobs_run, "busy": self._job_lock.locked(), "cache": self.cache.stats()}
+        if self.telemetry is not None:
+            status["progress"] = self.telemetry.snapshot()
+        return status
+
+    def make_server(self, host: str = '127.0.0.1', port: int = 8765,
+                    allow_remote: bool = False) -> ThreadingHTTPServer:
+        """
+        Creates the HTTP server for this service without starting it.
+
+        Endpoints:
+            GET  /status       the `status` dict
+            GET  /scenarios    the scenarios of the config file
+            POST /compare      runs the JSON job in the body and returns its result
+            POST /cache/clear  drops every cached dataset
+
+        Requests without the token get 401, POST bodies of another content
+        type than JSON get 415.
+
+        Args:
+            host (str): Interface to bind; keep the default to accept local connections only.
+            port (int): Port to listen on, 0 for any free port.
+            allow_remote (bool): Whether `host` may be an interface other machines can reach.
+
+        Returns:
+            ThreadingHTTPServer: The server; call `serve_forever()` to handle requests.
+
+        Raises:
+            ValueError: If `host` is not a loopback interface and `allow_remote` is not set.
+        """
+        if not is_loopback(host):
+            if not allow_remote:
+                raise ValueError(f"Refusing to serve on '{host}', which other machines can reach; "
+                                 "bind to 127.0.0.1 or explicitly allow remote connections.")
+            logger.warning(f"The comparison service listens on '{host}' and accepts connections from other "
+                           "machines. Anyone with the token can run comparisons on this machine.")
+        handler = type('ServiceRequestHandler', (_ServiceRequestHandler,), {'service': self})
+        return ThreadingHTTPServer((host, port), handler)
+
+    def serve(self, host: str = '127.0.0.1', port: int = 8765, allow_remote: bool = False):
+        """Serves requests until interrupted, see `make_server`."""
+        server = self.make_server(host, port, allow_remote)
+        logger.info(f"Comparison service listening on http://{server.server_address[0]}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Comparison service stopped.")
+        finally:
+            server.server_close()
+
+
+class _ServiceRequestHandler(BaseHTTPRequestHandler):
+    service: ComparisonService = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, indent=2, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        supplied = self.headers.get(TOKEN_HEADER, '')
+        if hmac.compare_digest(supplied.encode('utf-8'), self.service.token.encode('utf-8')):
+            return True
+        self._send_json(HTTPStatus.UNAUTHORIZED, {"error": f"Missing or wrong {TOKEN_HEADER} header."})
+        return False
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == '/status':
+            self._send_json(HTTPStatus.OK, self.service.status())
+        elif self.path == '/scenarios':
+            self._send_json(HTTPStatus.OK, {"scenarios": self.service.config_reader.get_scenarios_list()})
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_json(HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                            {"error": "Request bodies must be sent as 'Content-Type: application/json'."})
+            return
+        if self.path == '/cache/clear':
+            self.service.cache.clear()
+            self._send_json(HTTPStatus.OK, self.service.status())
+            return
+        if self.path != '/compare':
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        length = self.headers.get('Content-Length', '0').strip()
+        if not length.isdigit():
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"Invalid Content-Length header '{length}'."})
+            return
+        try:
+            job = json.loads(self.rfile.read(int(length)) or b'{}')
+            result = self.service.submit(job)
+        except (json.JSONDecodeError, JobError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        self._send_json(HTTPStatus.OK, result)
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
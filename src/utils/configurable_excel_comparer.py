@@ -1,6 +1,13 @@
-import pandas as pd
+import json
 import logging
 
+from src.utils.checkpoint_store import CheckpointStore
+from src.utils.comparison_backends import ComparisonBackend, MappingPlan, get_backend
+from src.utils.data_sources import DataSource, create_data_source
+from src.utils.dataset_cache import DatasetCache, file_fingerprint
+from src.utils.keyless_comparison import ROW_HASH_COLUMN, compare_keyless
+from src.utils.telemetry import expect_rows, report_progress
+
 logger = logging.getLogger(__name__)
 
 class ConfigurableExcelComparer:
@@ -8,124 +15,297 @@ class ConfigurableExcelComparer:
     Compares two Excel files based on a provided column mapping.
     
     This class handles differences in column names, order, and data types
-    by standardizing the data before performing a merge comparison.
+    by standardizing the data before performing a merge comparison. Despite
+    its name, the inputs may also be CSV or Parquet files; the reader is
+    chosen from each file's extension.
+
+    Loading, standardizing and joining run on a pluggable backend (pandas by
+    default, or 'arrow'/'polars' for multithreaded columnar engines). Between
+    loading and `compare`, `source_df` and `target_df` are in the backend's
+    native format; afterwards they are pandas DataFrames whatever the backend.
+
+    With a `DatasetCache`, loaded sides are cached by file fingerprint,
+    sheet and selected columns, and standardized pairs additionally by the
+    column mapping. A repeated comparison of unchanged files skips reading
+    and standardizing. With a `CheckpointStore`, the same loaded sides and
+    standardized pairs are also written to its directory as Arrow IPC
+    files, so a resumed run skips them too, and a changed input only
+    reloads its own side. Inputs given as `source_reader`/`target_reader`
+    are never cached or checkpointed, since they cannot be fingerprinted.
+
+    With `profile_columns`, every column of both sides is profiled while
+    standardizing (null, distinct and coerced counts, min/max and sums); the
+    profiles are in `column_profiles`, see `column_profile`. Profiling is
+    off by default, since the distinct counts cost as much as a full pass
+    over the data.
+
+    Without an `is_key` column in the mapping, the sides are compared as
+    multisets of rows (see `compare_keyless`); `key_column` is then
+    ROW_HASH_COLUMN and `keyless` is True after `compare`.
     """
     def __init__(self, source_path: str, target_path: str, column_mapping: dict,
-                 sheet_name_source: str = 'Sheet1', sheet_name_target: str = 'Sheet1'):
+                 sheet_name_source: str = 'Sheet1', sheet_name_target: str = 'Sheet1',
+                 source_reader: DataSource = None, target_reader: DataSource = None,
+                 backend='pandas', cache: DatasetCache = None, profile_columns: bool = False,
+                 checkpoints: CheckpointStore = None):
         """
         Initializes the ConfigurableExcelComparer with file paths and a column mapping.
 
         Args:
-            source_path (str): Path to the source Excel file.
-            target_path (str): Path to the target Excel file.
+            source_path (str): Path to the source file (.xlsx, .csv or .parquet).
+            target_path (str): Path to the target file (.xlsx, .csv or .parquet).
             column_mapping (dict): A dictionary mapping source columns to target
                                    columns and their attributes (type, key, etc.).
-            sheet_name_source (str): The name of the sheet in the source file.
-            sheet_name_target (str): The name of the sheet in the target file.
+            sheet_name_source (str): The name of the sheet in the source file (Excel only).
+            sheet_name_target (str): The name of the sheet in the target file (Excel only).
+            source_reader (DataSource, optional): Reader to use instead of one created from `source_path`.
+            target_reader (DataSource, optional): Reader to use instead of one created from `target_path`.
+            backend (str or ComparisonBackend): 'pandas', 'arrow' or 'polars', see `comparison_backends`.
+            cache (DatasetCache, optional): Cache for loaded and standardized data, shared across comparers.
+            profile_columns (bool): Profile every standardized column into `column_profiles`.
+            checkpoints (CheckpointStore, optional): Store for loaded and standardized data, see above.
         """
         self.source_path = source_path
         self.target_path = target_path
         self.column_mapping = column_mapping
         self.sheet_name_source = sheet_name_source
         self.sheet_name_target = sheet_name_target
+        self.cache = cache
+        self.checkpoints = checkpoints
+        self._fingerprinted = (cache is not None or checkpoints is not None) and \
+            source_reader is None and target_reader is None
+        self.source_reader = source_reader or create_data_source(source_path, sheet_name=sheet_name_source)
+        self.target_reader = target_reader or create_data_source(target_path, sheet_name=sheet_name_target)
+        self.backend: ComparisonBackend = get_backend(backend)
+        self.profile_columns = profile_columns
+        self._source_key = None
+        self._target_key = None
+        self._standardized = None
+        self.source_file_columns = None
+        self.target_file_columns = None
         self.source_df = None
         self.target_df = None
         self.comparison_df = None
         self.key_column = None
+        self.keyless = False
+        self.column_profiles = None
         
         logger.info("ConfigurableExcelComparer initialized with configuration.")
 
+    @staticmethod
+    def mapped_columns(column_mapping: dict):
+        """
+        Returns the lowercase source and target column names referenced by a mapping,
+        so that readers only load the columns the comparison uses.
+        """
+        source_columns = [src_col.lower() for src_col in column_mapping]
+        target_columns = [attributes["target"].lower() for attributes in column_mapping.values()
+                          if attributes.get("target")]
+        return source_columns, target_columns
+
+    def _side_key(self, path, sheet_name, columns):
+        """The cache and checkpoint key of one loaded side, or None when it is not fingerprinted."""
+        if not self._fingerprinted:
+            return None
+        return 'loaded', self.backend.name, file_fingerprint(path), sheet_name, tuple(columns)
+
+    def _standardized_key(self):
+        return ('standardized', self._source_key, self._target_key,
+                json.dumps(self.column_mapping, sort_keys=True, default=str), self.profile_columns)
+
+    def _restore_checkpoint(self, key, names):
+        """
+        Returns the value and the native frames checkpointed under `key`, or None.
+
+        Args:
+            key (Tuple): The checkpoint key, or None when the inputs are not fingerprinted.
+            names (Tuple[str]): The names of the checkpointed frames, in the order they are returned.
+        """
+        if self.checkpoints is None or key is None:
+            return None
+        checkpoint = self.checkpoints.get_tables(key)
+        if checkpoint is None:
+            return None
+        value, tables = checkpoint
+        return value, [self.backend.from_arrow(tables[name]) for name in names]
+
+    def _write_checkpoint(self, key, value, frames):
+        """Checkpoints native frames by name together with a small value, unless they have no Arrow form."""
+        if self.checkpoints is None or key is None:
+            return
+        try:
+            tables = {name: self.backend.to_arrow(frame) for name, frame in frames.items()}
+        except (ImportError, TypeError, ValueError) as e:
+            logger.warning("Not checkpointing the %s data: %s", key[0], e)
+            return
+        self.checkpoints.put_tables(key, value, tables)
+
+    def _load_side(self, reader, columns, key):
+        """
+        Loads the given columns of one input with lowercase column names.
+
+        Returns:
+            Tuple: The lowercase column names of the file and the loaded frame.
+        """
+        if key is not None and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info(f"Using cached {reader}.")
+                file_columns, frame = cached
+                return file_columns, self.backend.share(frame)
+
+        checkpoint = self._restore_checkpoint(key, ('frame',))
+        if checkpoint is not None:
+            logger.info(f"Using checkpointed {reader}.")
+            file_columns, (frame,) = checkpoint
+        else:
+            frame = self.backend.load(reader, columns=columns)
+            # Asked after loading, so readers that learn the header while reading do not open the file twice
+            file_columns = [str(col).lower() for col in reader.column_names()]
+            frame = self.backend.rename_columns(
+                frame, [str(col).lower() for col in self.backend.column_names(frame)])
+            # Written before standardizing, which may consume the loaded frame
+            self._write_checkpoint(key, file_columns, {'frame': frame})
+        if key is not None and self.cache is not None:
+            self.cache.put(key, (file_columns, frame), self.backend.nbytes(frame))
+            frame = self.backend.share(frame)
+        return file_columns, frame
+
+    def _load_dataframes(self):
+        """
+        Loads the mapped columns of the source and target inputs and normalizes
+        their column names to lowercase for robust lookup.
+        """
+        source_columns, target_columns = self.mapped_columns(self.column_mapping)
+
+        self._source_key = self._side_key(self.source_path, self.sheet_name_source, source_columns)
+        self._target_key = self._side_key(self.target_path, self.sheet_name_target, target_columns)
+        if self._fingerprinted:
+            standardized_key = self._standardized_key()
+            self._standardized = self.cache.get(standardized_key) if self.cache is not None else None
+            if self._standardized is None:
+                checkpoint = self._restore_checkpoint(standardized_key, ('source', 'target'))
+                if checkpoint is not None:
+                    self._standardized = tuple(checkpoint[0]) + tuple(checkpoint[1])
+                    if self.cache is not None:
+                        self.cache.put(standardized_key, self._standardized,
+                                       sum(self.backend.nbytes(frame) for frame in checkpoint[1]))
+            if self._standardized is not None:
+                # Standardizing will reuse the cached pair, so the raw sides are not needed
+                logger.info(f"Using cached standardized data for {self.source_reader} and {self.target_reader}.")
+                return
+
+        self.source_file_columns, self.source_df = self._load_side(
+            self.source_reader, source_columns, self._source_key)
+        self.target_file_columns, self.target_df = self._load_side(
+            self.target_reader, target_columns, self._target_key)
+
+        logger.info(f"DataFrames loaded from {self.source_reader} and {self.target_reader}; "
+                    "column names normalized.")
+
+    def _standardize_dataframes(self):
+        """
+        Standardizes the loaded DataFrames based on the column mapping.
+        This includes renaming columns, applying data type conversions, and identifying the key column.
+        """
+        if self._standardized is not None:
+            (self.key_column, self.source_unmapped_cols, self.target_unmapped_cols, self.column_profiles,
+             standardized_source, standardized_target) = self._standardized
+            self.source_df = self.backend.share(standardized_source)
+            self.target_df = self.backend.share(standardized_target)
+            self._standardized = None
+            return
+
+        logger.info("Starting preprocessing...")
+
+        # --- Step 1: Resolve the column mapping against the loaded columns ---
+        loaded_source_columns = self.backend.column_names(self.source_df)
+        loaded_target_columns = self.backend.column_names(self.target_df)
+        plan = MappingPlan(self.column_mapping, loaded_source_columns, loaded_target_columns)
+        self.key_column = plan.key_column
+
+        # --- Step 2: Rename columns and apply data type conversions, profiling each column if asked ---
+        self.column_profiles = {"source": {}, "target": {}} if self.profile_columns else None
+        standardized_source, standardized_target = self.backend.standardize(
+            self.source_df, self.target_df, plan, profiles=self.column_profiles)
+
+        # --- Step 3: Identify unmapped columns ---
+        self.source_unmapped_cols = list(set(self.source_file_columns or loaded_source_columns) - set(self.backend.column_names(standardized_source)))
+        self.target_unmapped_cols = list(set(self.target_file_columns or loaded_target_columns) - set(self.backend.column_names(standardized_target)))
+
+        if self._fingerprinted:
+            metadata = (self.key_column, self.source_unmapped_cols, self.target_unmapped_cols, self.column_profiles)
+            self._write_checkpoint(self._standardized_key(), metadata,
+                                   {'source': standardized_source, 'target': standardized_target})
+        if self._fingerprinted and self.cache is not None:
+            self.cache.put(self._standardized_key(), metadata + (standardized_source, standardized_target),
+                           self.backend.nbytes(standardized_source) + self.backend.nbytes(standardized_target))
+            standardized_source = self.backend.share(standardized_source)
+            standardized_target = self.backend.share(standardized_target)
+
+        self.source_df = standardized_source
+        self.target_df = standardized_target
+
+        logger.info("Preprocessing complete.")
+
     def _preprocess_dataframes(self):
         """
         Loads and standardizes source and target DataFrames based on the column mapping.
-        This includes renaming columns, applying data type conversions, and identifying the key column.
         """
         try:
-            # Load DataFrames and normalize column names to lowercase for robust lookup
-            self.source_df = pd.read_excel(self.source_path, sheet_name=self.sheet_name_source)
-            self.source_df.columns = [col.lower() for col in self.source_df.columns]
-            
-            self.target_df = pd.read_excel(self.target_path, sheet_name=self.sheet_name_target)
-            self.target_df.columns = [col.lower() for col in self.target_df.columns]
-            
-            logger.info("DataFrames loaded and column names normalized. Starting preprocessing...")
-            
-            # --- Step 1: Initialize standardized DataFrames ---
-            standardized_source = pd.DataFrame()
-            standardized_target = pd.DataFrame()
-            
-            # --- Step 2: Process the column mapping and build standardized DataFrames ---
-            for src_col_key, attributes in self.column_mapping.items():
-                src_col_norm = src_col_key.lower()
-                target_col_key = attributes.get("target")
-                target_col_norm = target_col_key.lower() if target_col_key else None
-
-                if attributes.get("is_key"):
-                    self.key_column = src_col_norm
-                
-                if target_col_norm:
-                    if src_col_norm in self.source_df.columns and target_col_norm in self.target_df.columns:
-                        standardized_source[src_col_norm] = self.source_df[src_col_norm]
-                        standardized_target[src_col_norm] = self.target_df[target_col_norm]
-                        
-                        data_type = attributes.get("type")
-                        if data_type == 'int':
-                            standardized_source[src_col_norm] = pd.to_numeric(standardized_source[src_col_norm], errors='coerce').fillna(-1).astype(int)
-                            standardized_target[src_col_norm] = pd.to_numeric(standardized_target[src_col_norm], errors='coerce').fillna(-1).astype(int)
-                        elif data_type == 'datetime':
-                            # Use 'errors=coerce' for robustness
-                            standardized_source[src_col_norm] = pd.to_datetime(standardized_source[src_col_norm], errors='coerce', format=attributes.get("format"))
-                            standardized_target[src_col_norm] = pd.to_datetime(standardized_target[src_col_norm], errors='coerce', format=attributes.get("format"))
-                    else:
-                        logger.warning(f"Mapped column '{src_col_key}' (src) or '{target_col_key}' (tgt) not found in respective files. Skipping.")
-                else:
-                    if src_col_norm in self.source_df.columns:
-                        standardized_source[src_col_norm] = self.source_df[src_col_norm]
-                    else:
-                        logger.warning(f"Source-only column '{src_col_key}' not found in the source file. Skipping.")
-
-            # --- Step 3: Identify unmapped columns ---
-            self.source_unmapped_cols = list(set(self.source_df.columns) - set(standardized_source.columns))
-            self.target_unmapped_cols = list(set(self.target_df.columns) - set(standardized_target.columns))
-
-            self.source_df = standardized_source
-            self.target_df = standardized_target
-            
-            logger.info("Preprocessing complete.")
-            
+            self._load_dataframes()
+            self._standardize_dataframes()
         except FileNotFoundError as e:
             logger.error(f"File not found: {e}")
             raise
         except KeyError as e:
             logger.error(f"Column missing in DataFrame: {e}")
             raise
-                            
+
     def compare(self):
         """
-        Performs the comparison by first preprocessing the data, then merging.
+        Performs the comparison by first preprocessing the data, then merging,
+        or comparing row multisets when the mapping has no key column.
         
         Returns:
             pd.DataFrame: A DataFrame with the comparison results, including an indicator column.
         """
         if self.source_df is None or self.target_df is None:
             self._preprocess_dataframes()
-            
-        if self.key_column is None:
-            raise ValueError("No key column was specified in the column mapping.")
-
-        logger.info(f"Comparing DataFrames on key column: '{self.key_column}'.")
-
-        self.comparison_df = pd.merge(
-            self.source_df,
-            self.target_df,
-            on=self.key_column,
-            how='outer',
-            suffixes=('_src', '_tgt'),
-            indicator=True
-        )
+
+        # Both sides are joined in one call, so progress jumps from 0 to all rows
+        rows = self.backend.num_rows(self.source_df) + self.backend.num_rows(self.target_df)
+        expect_rows(rows)
+        if self.key_column is None or self.keyless:
+            logger.info("No key column in the column mapping; comparing the rows as multisets.")
+            self.source_df = self.backend.to_pandas(self.source_df)
+            self.target_df = self.backend.to_pandas(self.target_df)
+            self.comparison_df = compare_keyless(self.source_df, self.target_df)
+            self.key_column = ROW_HASH_COLUMN
+            self.keyless = True
+            report_progress(rows)
+            logger.info("Comparison complete.")
+            return self.comparison_df
+
+        logger.info(f"Comparing DataFrames on key column: '{self.key_column}' with the {self.backend.name} backend.")
+
+        self.comparison_df = self.backend.join(self.source_df, self.target_df, self.key_column)
+        self.source_df = self.backend.to_pandas(self.source_df)
+        self.target_df = self.backend.to_pandas(self.target_df)
+        report_progress(rows)
         logger.info("Comparison complete.")
         return self.comparison_df
 
+    def release_inputs(self):
+        """
+        Drops the standardized source and target DataFrames once the comparison
+        and any reports built from them no longer need them, leaving
+        `comparison_df` as the only copy of the data.
+        """
+        self.source_df = None
+        self.target_df = None
+        logger.info("Released the source and target DataFrames.")
+
     def get_diff_summary(self):
         """
         Returns the comparison DataFrame. This is now a simplified method
@@ -0,0 +1,295 @@
+import csv
+import logging
+import os
+from typing import Iterable, Iterator, List
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pa_csv = None
+    pq = None
+
+from src.utils.memory_monitor import check_memory
+from src.utils.telemetry import expect_rows, report_progress
+
+logger = logging.getLogger(__name__)
+
+
+def arrow_table(df: pd.DataFrame, label: str = '<dataframe>'):
+    """
+    Converts a DataFrame to a pyarrow Table.
+
+    Object columns mixing value types (e.g. numbers and text in one Excel
+    column) have no Arrow type; instead of failing the whole table, each
+    such column is converted as strings, keeping its missing values null.
+
+    Args:
+        df (pd.DataFrame): The data to convert.
+        label (str): Where the data came from, used in the warning for mixed columns.
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    arrays = {}
+    for col in df.columns:
+        try:
+            arrays[str(col)] = pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            logger.warning("Column '%s' of %s mixes value types; converting it to strings for Arrow.", col, label)
+            arrays[str(col)] = pa.array(df[col].astype(str), from_pandas=True)
+    return pa.table(arrays)
+
+
+class DataSource:
+    """
+    Base class for tabular inputs of a comparison.
+
+    A data source knows how to list its column names cheaply and how to read
+    a projection of its columns into a pandas DataFrame. Column names passed
+    to `read` are matched case-insensitively, the same way the comparers
+    normalize column names.
+    """
+    extensions = ()
+
+    def __init__(self, path: str):
+        """
+        Initializes the data source.
+
+        Args:
+            path (str): Path to the input file.
+        """
+        self.path = path
+
+    def column_names(self) -> List[str]:
+        """Returns the column names of the input without reading its rows."""
+        raise NotImplementedError
+
+    def _resolve_columns(self, columns: Iterable[str] = None) -> List[str]:
+        """Maps requested column names (any case) to the names used in the file."""
+        if columns is None:
+            return None
+        wanted = {col.lower() for col in columns}
+        return [col for col in self.column_names() if str(col).lower() in wanted]
+
+    def read(self, columns: Iterable[str] = None) -> pd.DataFrame:
+        """
+        Reads the input into a DataFrame.
+
+        Args:
+            columns (Iterable[str], optional): Columns to read, matched case-insensitively.
+                                               All columns are read when omitted.
+
+        Returns:
+            pd.DataFrame: The loaded data.
+        """
+        raise NotImplementedError
+
+    def read_arrow(self, columns: Iterable[str] = None):
+        """
+        Reads the input into a pyarrow Table, for the columnar comparison backends.
+
+        Sources without a native Arrow reader convert the result of `read`, so
+        both methods always return the same data.
+        """
+        if pa is None:
+            raise ImportError("Reading into Arrow tables requires the 'pyarrow' package.")
+        return arrow_table(self.read(columns), self.path)
+
+    def iter_batches(self, columns: Iterable[str] = None, batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Yields the input as consecutive DataFrames of at most about `batch_rows` rows.
+
+        Sources without a native streaming reader yield the whole input at once.
+        """
+        yield self.read(columns)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} path={self.path}>"
+
+
+class ExcelDataSource(DataSource):
+    """
+    Reads a single sheet of an Excel workbook with `pd.read_excel`.
+
+    Opening a workbook is expensive, so `read` records the full header of
+    the sheet while it parses it, and `column_names` only opens the
+    workbook itself when nothing has been read yet.
+    """
+    extensions = ('.xlsx', '.xlsm', '.xls')
+
+    def __init__(self, path: str, sheet_name: str = 'Sheet1'):
+        super().__init__(path)
+        self.sheet_name = sheet_name
+        self._header = None
+
+    def column_names(self) -> List[str]:
+        if self._header is None:
+            self._header = list(pd.read_excel(self.path, sheet_name=self.sheet_name, nrows=0).columns)
+        return self._header
+
+    def read(self, columns: Iterable[str] = None) -> pd.DataFrame:
+        if columns is None:
+            df = pd.read_excel(self.path, sheet_name=self.sheet_name)
+            self._header = list(df.columns)
+        else:
+            wanted = {col.lower() for col in columns}
+            header = []
+
+            def selected(col):
+                # pandas asks about every column of the header, so this also collects the header
+                header.append(col)
+                return str(col).lower() in wanted
+
+            df = pd.read_excel(self.path, sheet_name=self.sheet_name, usecols=selected)
+            self._header = header
+        report_progress(len(df))
+        return df
+
+    def __repr__(self):
+        return f"<{type(self).__name__} path={self.path} sheet={self.sheet_name}>"
+
+
+class CsvDataSource(DataSource):
+    """
+    Reads CSV files with pyarrow's multithreaded CSV reader.
+
+    Falls back to `pd.read_csv` when pyarrow is not installed.
+    """
+    extensions = ('.csv',)
+
+    def column_names(self) -> List[str]:
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            return next(csv.reader(f), [])
+
+    def _convert_options(self, columns):
+        if columns is None:
+            return pa_csv.ConvertOptions()
+        return pa_csv.ConvertOptions(include_columns=columns)
+
+    def read(self, columns: Iterable[str] = None) -> pd.DataFrame:
+        if pa_csv is None:
+            df = pd.read_csv(self.path, usecols=self._resolve_columns(columns))
+            report_progress(len(df))
+            return df
+        return self.read_arrow(columns).to_pandas()
+
+    def read_arrow(self, columns: Iterable[str] = None):
+        if pa_csv is None:
+            return super().read_arrow(columns)
+        table = pa_csv.read_csv(
+            self.path,
+            read_options=pa_csv.ReadOptions(use_threads=True),
+            convert_options=self._convert_options(self._resolve_columns(columns))
+        )
+        report_progress(table.num_rows)
+        return table
+
+    def iter_batches(self, columns: Iterable[str] = None, batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        columns = self._resolve_columns(columns)
+        if pa_csv is None:
+            for chunk in pd.read_csv(self.path, usecols=columns, chunksize=batch_rows):
+                report_progress(len(chunk))
+                yield chunk
+            return
+        reader = pa_csv.open_csv(self.path, convert_options=self._convert_options(columns))
+        for batch in reader:
+            check_memory(f"reading {self.path}")
+            report_progress(batch.num_rows)
+            yield batch.to_pandas()
+
+
+class ParquetDataSource(DataSource):
+    """
+    Reads Parquet files row group by row group with pyarrow.
+
+    Only the requested columns are decoded, and no row filtering is pushed
+    down, so every row group is streamed exactly once.
+    """
+    extensions = ('.parquet', '.pq')
+
+    def __init__(self, path: str):
+        if pq is None:
+            raise ImportError("Reading Parquet files requires the 'pyarrow' package.")
+        super().__init__(path)
+
+    def column_names(self) -> List[str]:
+        return list(pq.ParquetFile(self.path).schema_arrow.names)
+
+    def _iter_record_batches(self, columns, batch_rows):
+        parquet_file = pq.ParquetFile(self.path)
+        # The row count is in the file footer, so progress has an ETA
+        expect_rows(parquet_file.metadata.num_rows)
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns, use_threads=True):
+            check_memory(f"reading {self.path}")
+            report_progress(batch.num_rows)
+            yield batch
+
+    def read(self, columns: Iterable[str] = None) -> pd.DataFrame:
+        return self.read_arrow(columns).to_pandas()
+
+    def read_arrow(self, columns: Iterable[str] = None):
+        columns = self._resolve_columns(columns)
+        parquet_file = pq.ParquetFile(self.path)
+        batches = list(self._iter_record_batches(columns, 100000))
+        schema = parquet_file.schema_arrow if columns is None else pa.schema(
+            [parquet_file.schema_arrow.field(col) for col in columns])
+        return pa.Table.from_batches(batches, schema=schema)
+
+    def iter_batches(self, columns: Iterable[str] = None, batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        for batch in self._iter_record_batches(self._resolve_columns(columns), batch_rows):
+            yield batch.to_pandas()
+
+
+class DataFrameSource(DataSource):
+    """
+    Wraps a DataFrame that has already been loaded, e.g. one sheet of a
+    workbook that was read together with its sibling sheets.
+    """
+    def __init__(self, df: pd.DataFrame, label: str = '<dataframe>'):
+        """
+        Initializes the data source.
+
+        Args:
+            df (pd.DataFrame): The loaded data.
+            label (str): A description of where the data came from, used as its path.
+        """
+        super().__init__(label)
+        self.df = df
+
+    def column_names(self) -> List[str]:
+        return list(self.df.columns)
+
+    def read(self, columns: Iterable[str] = None) -> pd.DataFrame:
+        columns = self._resolve_columns(columns)
+        report_progress(len(self.df))
+        return self.df.copy(deep=False) if columns is None else self.df[columns]
+
+
+DATA_SOURCES = (ExcelDataSource, CsvDataSource, ParquetDataSource)
+
+
+def create_data_source(path: str, sheet_name: str = 'Sheet1') -> DataSource:
+    """
+    Creates the data source matching the file extension of `path`.
+
+    Args:
+        path (str): Path to the input file.
+        sheet_name (str): The sheet to read when the input is an Excel workbook.
+
+    Returns:
+        DataSource: The data source for the file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for source_class in DATA_SOURCES:
+        if extension in source_class.extensions:
+            if source_class is ExcelDataSource:
+                return ExcelDataSource(path, sheet_name=sheet_name)
+            return source_class(path)
+    supported = sorted(ext for source_class in DATA_SOURCES for ext in source_class.extensions)
+    raise ValueError(f"Unsupported input file type '{extension}' for {path}. Supported: {supported}")
@@ -9,8 +9,9 @@ logger = logging.getLogger(__name__)
 from src.utils.ini_reader import IniReader
 
 class DatabaseConfig:
-    def __init__(self):
-        self.ini_reader = IniReader("src/inputs/database_config.ini")
+    def __init__(self, config_file: str = "src/inputs/database_config.ini"):
+        self.config_file = config_file
+        self.ini_reader = IniReader(config_file)
         self.config = self.ini_reader.config
         self.logger = logging.getLogger(__name__)  # Correctly initialize logger
         self.logger.info("DatabaseConfig initialized with configuration from ini file.")
@@ -29,21 +30,27 @@ class DatabaseConfig:
 
     def get_scenario_name(self, scenario_key: str) -> str:
         """Returns the name of the scenario for a given key (e.g., SCENARIO_1)."""
-        self.logger.info(f"Retrieving scenario name for key: {scenario_key}")
+        self.logger.debug(f"Retrieving scenario name for key: {scenario_key}")
         return self.config['DATA_SCENARIOS_TO_EXECUTE'].get(scenario_key, "")
 
     def get_source_file_path(self, scenario_name: str) -> str:
         """Returns the source file path for a given scenario name."""
         section = self.config[scenario_name]
-        self.logger.info(f"Retrieving source file path for scenario: {scenario_name}")
+        self.logger.debug(f"Retrieving source file path for scenario: {scenario_name}")
         return section.get('SOURCE_FILE_PATH', "")
 
     def get_target_file_path(self, scenario_name: str) -> str:
         """Returns the target file path for a given scenario name."""
         section = self.config[scenario_name]
-        self.logger.info(f"Retrieving target file path for scenario: {scenario_name}")
+        self.logger.debug(f"Retrieving target file path for scenario: {scenario_name}")
         return section.get('TARGET_FILE_PATH', "")
 
+    def get_scenario_option(self, scenario_name: str, option: str, default: str = "") -> str:
+        """Returns an optional setting of a scenario section, or `default` when it is not set."""
+        section = self.config[scenario_name]
+        self.logger.debug(f"Retrieving option '{option}' for scenario: {scenario_name}")
+        return section.get(option, default)
+
     def get_column_mapping(self, mapping_name: str) -> Dict[str, Dict[str, Any]]:
         """
         Parses a column mapping section and returns a dictionary of dictionaries.
@@ -0,0 +1,102 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+from src.utils.memory_monitor import MB
+
+logger = logging.getLogger(__name__)
+
+
+def file_fingerprint(path: str) -> Tuple[str, int, int]:
+    """
+    Identifies the current contents of a file by its absolute path,
+    modification time and size, without reading it.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+class DatasetCache:
+    """
+    A thread-safe least-recently-used cache bounded by memory.
+
+    Entries are stored with their size in bytes; when the total exceeds
+    `max_mb`, the least recently used entries are evicted. An entry larger
+    than the whole budget is not cached. Sizes are estimates supplied by the
+    caller, and entries that share buffers are counted once per entry.
+    """
+    def __init__(self, max_mb: float = 1024):
+        """
+        Initializes the DatasetCache.
+
+        Args:
+            max_mb (float): Memory budget in MB for all cached entries.
+        """
+        self.max_bytes = int(max_mb * MB)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable):
+        """Returns the cached value for `key` and marks it as recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value, nbytes: int):
+        """
+        Caches a value, evicting least recently used entries to stay within the budget.
+
+        Args:
+            key (Hashable): The cache key.
+            value: The value to cache.
+            nbytes (int): The estimated memory held by `value`.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.size_bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                logger.info(f"Not caching an entry of {nbytes / MB:.0f} MB; the cache holds at most "
+                            f"{self.max_bytes / MB:.0f} MB.")
+                return
+            while self._entries and self.size_bytes + nbytes > self.max_bytes:
+                evicted_key, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_bytes
+                self.evictions += 1
+                logger.info(f"Evicted {evicted_bytes / MB:.0f} MB from the dataset cache: {evicted_key[0]}")
+            self._entries[key] = (value, nbytes)
+            self.size_bytes += nbytes
+
+    def clear(self):
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Returns the entry count, memory use and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_mb": round(self.size_bytes / MB, 1),
+                "max_mb": round(self.max_bytes / MB, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
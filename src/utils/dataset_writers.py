@@ -0,0 +1,224 @@
+import csv
+import logging
+import os
+import sqlite3
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:  # pragma: no cover - optional dependency
+    xlsxwriter = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+from src.utils.memory_monitor import check_memory
+from src.utils.telemetry import expect_rows, report_progress
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetWriter:
+    """
+    Base class for writers that receive a DataFrame in chunks.
+
+    Writers keep only the current chunk in memory, so arbitrarily large
+    datasets can be written as long as the producer streams them. Writers are
+    context managers; `close` must be called to finalize the file.
+    """
+    extension = None
+
+    def __init__(self, path: str):
+        """
+        Initializes the writer.
+
+        Args:
+            path (str): Destination file path.
+        """
+        self.path = path
+        self.rows_written = 0
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+    def write(self, df: pd.DataFrame):
+        """Appends a chunk of rows to the output."""
+        self._write(df)
+        self.rows_written += len(df)
+
+    def _write(self, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def close(self):
+        """Finalizes the output file."""
+        logger.info(f"{type(self).__name__} wrote {self.rows_written} rows to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def python_columns(df: pd.DataFrame):
+    """Returns the chunk as per-column lists of plain Python values, with None for missing values."""
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if series.hasnans:
+            columns.append(series.astype(object).where(series.notna(), None).tolist())
+        else:
+            columns.append(series.tolist())
+    return columns
+
+
+class XlsxStreamWriter(DatasetWriter):
+    """
+    Writes xlsx files row by row in constant memory.
+
+    Uses xlsxwriter's `constant_memory` mode, which flushes each row to disk
+    once the next one starts, and falls back to openpyxl's write-only
+    workbook when xlsxwriter is not installed.
+    """
+    extension = 'xlsx'
+
+    def __init__(self, path: str, sheet_name: str = 'Sheet1'):
+        super().__init__(path)
+        self.sheet_name = sheet_name
+        self._row = 0
+        if xlsxwriter is not None:
+            self._workbook = xlsxwriter.Workbook(path, {
+                'constant_memory': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            })
+            self._sheet = self._workbook.add_worksheet(sheet_name)
+        else:
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet(sheet_name)
+
+    def _append(self, values):
+        if xlsxwriter is not None:
+            self._sheet.write_row(self._row, 0, values)
+        else:
+            self._sheet.append(values)
+        self._row += 1
+
+    def _write(self, df: pd.DataFrame):
+        if self._row == 0:
+            self._append([str(col) for col in df.columns])
+        for values in zip(*python_columns(df)):
+            self._append(values)
+
+    def close(self):
+        if xlsxwriter is not None:
+            self._workbook.close()
+        else:
+            self._workbook.save(self.path)
+        super().close()
+
+
+class CsvWriter(DatasetWriter):
+    """Writes CSV files chunk by chunk, with a header on the first chunk."""
+    extension = 'csv'
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._header_written = False
+
+    def _write(self, df: pd.DataFrame):
+        df.to_csv(self._file, index=False, header=not self._header_written,
+                  date_format='%Y-%m-%d %H:%M:%S', quoting=csv.QUOTE_MINIMAL)
+        self._header_written = True
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class ParquetWriter(DatasetWriter):
+    """Writes Parquet files with one row group per chunk. Requires pyarrow."""
+    extension = 'parquet'
+
+    def __init__(self, path: str):
+        if pq is None:
+            raise ImportError("Writing Parquet files requires the 'pyarrow' package.")
+        super().__init__(path)
+        self._writer = None
+
+    def _write(self, df: pd.DataFrame):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        super().close()
+
+
+class SqliteWriter(DatasetWriter):
+    """Writes rows into a SQLite table, committing once per chunk."""
+    extension = 'sqlite'
+
+    def __init__(self, path: str, table_name: str = 'data'):
+        super().__init__(path)
+        if os.path.exists(path):
+            os.remove(path)
+        self.table_name = table_name
+        self._connection = sqlite3.connect(path)
+
+    def _write(self, df: pd.DataFrame):
+        df.to_sql(self.table_name, self._connection, if_exists='append', index=False)
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+        super().close()
+
+
+WRITERS = {writer.extension: writer for writer in (XlsxStreamWriter, CsvWriter, ParquetWriter, SqliteWriter)}
+
+
+def create_writer(path: str, **kwargs) -> DatasetWriter:
+    """
+    Creates the writer matching the file extension of `path`.
+
+    Args:
+        path (str): Destination file path (.xlsx, .csv, .parquet or .sqlite).
+        **kwargs: Extra arguments for the writer, e.g. `sheet_name` for xlsx.
+
+    Returns:
+        DatasetWriter: An open writer.
+    """
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported output format '{extension}'. Supported: {sorted(WRITERS)}")
+    return WRITERS[extension](path, **kwargs)
+
+
+def write_excel_streaming(df: pd.DataFrame, path: str, sheet_name: str = 'Sheet1', chunk_rows: int = 100000):
+    """
+    Writes a DataFrame to xlsx in constant-memory mode; a drop-in for `df.to_excel(path, index=False)`.
+
+    Args:
+        df (pd.DataFrame): The data to write.
+        path (str): Destination xlsx path.
+        sheet_name (str): The sheet name.
+        chunk_rows (int): Number of rows converted to Python values at a time.
+    """
+    expect_rows(len(df))
+    with XlsxStreamWriter(path, sheet_name=sheet_name) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            check_memory(f"writing {path}")
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write(chunk)
+            report_progress(len(chunk))
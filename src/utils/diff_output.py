@@ -0,0 +1,274 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+from src.utils.column_profile import profile_differences
+from src.utils.memory_monitor import check_memory
+from src.utils.telemetry import report_progress
+
+logger = logging.getLogger(__name__)
+
+MERGE_COLUMN = '_merge'
+SOURCE_SUFFIX = '_src'
+TARGET_SUFFIX = '_tgt'
+# Key of `comparison_df.attrs` holding the number of rows present on both sides
+MATCHED_ROWS_ATTR = 'matched_rows'
+
+
+def matched_rows(comparison_df: pd.DataFrame) -> int:
+    """
+    Returns the number of rows present on both sides of a comparison.
+
+    Keyed comparisons contain those rows as 'both' rows; keyless comparisons
+    only contain the differing rows and record the matches in `attrs`.
+    """
+    if MATCHED_ROWS_ATTR in comparison_df.attrs:
+        return int(comparison_df.attrs[MATCHED_ROWS_ATTR])
+    return int((comparison_df[MERGE_COLUMN] == 'both').sum())
+
+
+def mismatch_mask(src: pd.Series, tgt: pd.Series) -> np.ndarray:
+    """
+    Compares two aligned columns value by value.
+
+    A pair of values differs when they are not equal, unless both are missing.
+
+    Args:
+        src (pd.Series): Source values.
+        tgt (pd.Series): Target values, aligned by position with `src`.
+
+    Returns:
+        np.ndarray: Boolean array, True where the values differ.
+    """
+    both_missing = src.isna().to_numpy() & tgt.isna().to_numpy()
+    try:
+        differs = src.reset_index(drop=True) != tgt.reset_index(drop=True)
+    except TypeError:
+        differs = pd.Series(src.to_numpy(dtype=object) != tgt.to_numpy(dtype=object))
+    differs = differs.fillna(True).to_numpy(dtype=bool)
+    return differs & ~both_missing
+
+
+def compared_columns(comparison_df: pd.DataFrame) -> List[str]:
+    """Returns the base names of the columns present on both sides of a merged comparison."""
+    return [col[:-len(SOURCE_SUFFIX)] for col in comparison_df.columns
+            if col.endswith(SOURCE_SUFFIX) and f"{col[:-len(SOURCE_SUFFIX)]}{TARGET_SUFFIX}" in comparison_df.columns]
+
+
+def side_columns(comparison_df: pd.DataFrame, key_column: str, side: str) -> Dict[str, str]:
+    """
+    Maps the comparison columns belonging to one side to their original names.
+
+    Args:
+        comparison_df (pd.DataFrame): The merged comparison with an indicator column.
+        key_column (str): The key column.
+        side (str): 'source' or 'target'.
+
+    Returns:
+        Dict[str, str]: Comparison column name to original column name, key first.
+    """
+    own, other = (SOURCE_SUFFIX, TARGET_SUFFIX) if side == 'source' else (TARGET_SUFFIX, SOURCE_SUFFIX)
+    columns = {key_column: key_column}
+    for col in comparison_df.columns:
+        if col in (key_column, MERGE_COLUMN) or col.endswith(other):
+            continue
+        if col.endswith(own):
+            columns[col] = col[:-len(own)]
+        elif side == 'source':
+            # Columns without a suffix exist only in the source (mapped with a null target).
+            columns[col] = col
+    return columns
+
+
+def _to_text(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        text = values.dt.strftime('%Y-%m-%d %H:%M:%S')
+    else:
+        text = values.astype(str)
+    return text.astype(object).where(values.notna(), None)
+
+
+class _JsonlSink:
+    extension = 'jsonl'
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, chunk: pd.DataFrame):
+        text = chunk.to_json(orient='records', lines=True, date_format='iso')
+        if text:
+            self._file.write(text if text.endswith('\n') else text + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    extension = 'parquet'
+
+    def __init__(self, path):
+        if pq is None:
+            raise ImportError("Writing Parquet diff output requires the 'pyarrow' package.")
+        self.path = path
+        self._writer = None
+
+    def write(self, chunk: pd.DataFrame):
+        if self._writer is None:
+            schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            # Columns that are entirely missing in the first chunk have no type yet.
+            schema = pa.schema([pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                                for field in schema])
+            self._writer = pq.ParquetWriter(self.path, schema)
+        self._writer.write_table(pa.Table.from_pandas(chunk, schema=self._writer.schema, preserve_index=False))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class DiffOutputWriter:
+    """
+    Streams the categories of a comparison to machine-readable files.
+
+    Source-only rows, target-only rows and cell differences are written in
+    chunks to Parquet and/or JSON Lines files as they are computed, followed
+    by a small `summary.json`. Nothing is rendered to HTML, so downstream
+    automation can consume the results without the report.
+    """
+    CATEGORIES = ('source_only', 'target_only', 'cell_diffs')
+    SINKS = {sink.extension: sink for sink in (_JsonlSink, _ParquetSink)}
+
+    def __init__(self, output_dir: str, formats=('parquet', 'jsonl'), chunk_rows: int = 100000):
+        """
+        Initializes the DiffOutputWriter.
+
+        Args:
+            output_dir (str): Directory the category files and summary are written to.
+            formats (tuple): Output formats, any of 'parquet' and 'jsonl'.
+            chunk_rows (int): Maximum number of rows written at a time.
+        """
+        unknown = set(formats) - set(self.SINKS)
+        if unknown:
+            raise ValueError(f"Unsupported diff output formats {sorted(unknown)}. Supported: {sorted(self.SINKS)}")
+        self.output_dir = output_dir
+        self.formats = list(formats)
+        self.chunk_rows = chunk_rows
+        self.summary = None
+
+    def _open_sinks(self, category):
+        return [self.SINKS[extension](os.path.join(self.output_dir, f"{category}.{extension}"))
+                for extension in self.formats]
+
+    def _stream(self, category: str, chunks: Iterator[pd.DataFrame]) -> Tuple[int, List[str]]:
+        sinks = self._open_sinks(category)
+        rows = 0
+        try:
+            for chunk in chunks:
+                for start in range(0, len(chunk), self.chunk_rows):
+                    check_memory(f"writing {category}")
+                    part = chunk.iloc[start:start + self.chunk_rows]
+                    for sink in sinks:
+                        sink.write(part)
+                    rows += len(part)
+                    report_progress(len(part))
+        finally:
+            for sink in sinks:
+                sink.close()
+        logger.info(f"Wrote {rows} '{category}' rows to {self.output_dir}.")
+        return rows, [sink.path for sink in sinks]
+
+    def _side_only_rows(self, comparison_df, key_column, indicator, side):
+        columns = side_columns(comparison_df, key_column, side)
+        column_positions = comparison_df.columns.get_indexer(list(columns))
+        positions = np.flatnonzero(comparison_df[MERGE_COLUMN].to_numpy() == indicator)
+        # Only one chunk of side-only rows exists at a time; without any, one empty chunk keeps the files' schema
+        for start in range(0, max(len(positions), 1), self.chunk_rows):
+            chunk = comparison_df.iloc[positions[start:start + self.chunk_rows], column_positions]
+            yield chunk.rename(columns=columns)
+
+    def _cell_diffs(self, comparison_df, key_column, stats, column_masks=None):
+        both = comparison_df[MERGE_COLUMN].to_numpy() == 'both'
+        keys = comparison_df[key_column][both]
+        stats["common_rows"] = int(both.sum())
+        stats["any_mismatch"] = np.zeros(stats["common_rows"], dtype=bool)
+        for col in compared_columns(comparison_df):
+            src = comparison_df[f"{col}{SOURCE_SUFFIX}"][both]
+            tgt = comparison_df[f"{col}{TARGET_SUFFIX}"][both]
+            mask = column_masks[col][both] if column_masks is not None else mismatch_mask(src, tgt)
+            stats["any_mismatch"] |= mask
+            stats["column_counts"][col] = int(mask.sum())
+            if stats["column_counts"][col]:
+                yield pd.DataFrame({
+                    key_column: keys[mask].to_numpy(),
+                    'column': col,
+                    'source_value': _to_text(src[mask]).to_numpy(),
+                    'target_value': _to_text(tgt[mask]).to_numpy(),
+                })
+
+    def write(self, comparison_df: pd.DataFrame, key_column: str, source_file: str = None,
+              target_file: str = None, column_masks: Dict[str, np.ndarray] = None,
+              column_profiles: Dict = None) -> Dict:
+        """
+        Writes all categories and the summary.
+
+        Args:
+            comparison_df (pd.DataFrame): The merged comparison with an indicator column.
+            key_column (str): The key column used for the comparison.
+            source_file (str, optional): The source file, recorded in the summary.
+            target_file (str, optional): The target file, recorded in the summary.
+            column_masks (Dict[str, np.ndarray], optional): Precomputed mismatch masks per column,
+                                                            as returned by `ParallelDiff.column_masks`.
+            column_profiles (Dict, optional): Per side and column aggregates, recorded in the summary
+                                              together with the columns whose aggregates differ.
+
+        Returns:
+            Dict: The summary that was written to `summary.json`.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        logger.info(f"Streaming diff output to {self.output_dir} as {self.formats}.")
+
+        stats = {"column_counts": {}}
+        source_only, source_files = self._stream(
+            'source_only', self._side_only_rows(comparison_df, key_column, 'left_only', 'source'))
+        target_only, target_files = self._stream(
+            'target_only', self._side_only_rows(comparison_df, key_column, 'right_only', 'target'))
+        cell_diffs, cell_files = self._stream(
+            'cell_diffs', self._cell_diffs(comparison_df, key_column, stats, column_masks))
+
+        self.summary = {
+            "generated": datetime.now().isoformat(timespec='seconds'),
+            "source_file": source_file,
+            "target_file": target_file,
+            "key_column": key_column,
+            "common_rows": matched_rows(comparison_df),
+            "source_only_rows": source_only,
+            "target_only_rows": target_only,
+            "mismatched_rows": int(stats["any_mismatch"].sum()),
+            "cell_diffs": cell_diffs,
+            "cell_diffs_by_column": stats["column_counts"],
+            "files": {
+                "source_only": source_files,
+                "target_only": target_files,
+                "cell_diffs": cell_files,
+            },
+        }
+        if column_profiles is not None:
+            self.summary["column_profiles"] = column_profiles
+            self.summary["profile_differences"] = profile_differences(column_profiles)
+        with open(os.path.join(self.output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.summary, f, indent=2, default=str)
+        logger.info(f"Diff summary saved to {os.path.join(self.output_dir, 'summary.json')}")
+        return self.summary
@@ -1,29 +1,27 @@
-import pandas as pd
-
 import logging
 
+from src.utils.comparison_backends import get_backend
+from src.utils.data_sources import create_data_source
+
 logger = logging.getLogger(__name__)
 
 class ExcelComparer:
-    def __init__(self, source_path, target_path, sheet_name_source='Sheet1', sheet_name_target='Sheet1', key='ID'):
-        logger.info("Loading source and target Excel files.")
-        self.source_df = pd.read_excel(source_path, sheet_name=sheet_name_source)
-        self.target_df = pd.read_excel(target_path, sheet_name=sheet_name_target)
+    def __init__(self, source_path, target_path, sheet_name_source='Sheet1', sheet_name_target='Sheet1', key='ID',
+                 backend='pandas'):
+        logger.info("Loading source and target files.")
+        self.backend = get_backend(backend)
+        self.source_df = self.backend.load(create_data_source(source_path, sheet_name=sheet_name_source))
+        self.target_df = self.backend.load(create_data_source(target_path, sheet_name=sheet_name_target))
         self.key = key
         self.comparison_df = None
-        logger.info("Excel files loaded successfully.")
+        logger.info("Source and target files loaded successfully.")
 
     def compare(self):
         """Compare source and target DataFrames and store the comparison results."""
         logger.info("Comparing DataFrames.")
-        self.comparison_df = pd.merge(
-            self.source_df,
-            self.target_df,
-            on=self.key,
-            how='outer',
-            suffixes=('_src', '_tgt'),
-            indicator=True
-        )
+        self.comparison_df = self.backend.join(self.source_df, self.target_df, self.key)
+        self.source_df = self.backend.to_pandas(self.source_df)
+        self.target_df = self.backend.to_pandas(self.target_df)
         logger.info("Comparison complete.")
         return self.comparison_df
 
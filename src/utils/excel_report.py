@@ -0,0 +1,190 @@
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xlsxwriter
+    from xlsxwriter.utility import xl_col_to_name
+except ImportError:  # pragma: no cover - optional dependency
+    xlsxwriter = None
+
+from src.utils.dataset_writers import python_columns
+from src.utils.diff_output import SOURCE_SUFFIX, TARGET_SUFFIX, compared_columns
+from src.utils.html_report import HtmlReport
+from src.utils.memory_monitor import check_memory
+from src.utils.report_data import side_only_positions, side_only_rows
+from src.utils.telemetry import expect_rows, report_progress
+
+logger = logging.getLogger(__name__)
+
+# Data rows per sheet; Excel allows 1,048,576 rows including the header
+MAX_SHEET_ROWS = 1048575
+
+
+class ExcelReport:
+    """
+    Writes the results of a comparison as an xlsx workbook.
+
+    The workbook has a Summary sheet and one sheet per category: Source
+    Only, Target Only and Mismatches. A category with more rows than a
+    sheet can hold continues on further sheets.
+
+    Rows are written in xlsxwriter's `constant_memory` mode, so each row
+    goes to disk as soon as the next one starts, and they are converted
+    from the comparison `chunk_rows` at a time. On the Mismatches sheet the
+    source and target value of every compared column sit side by side.
+    Differing cells are marked by one conditional format per column pair
+    covering the whole range, not by per-cell formats.
+
+    The counts and mismatch flags are taken from an `HtmlReport` of the
+    same comparison, so both reports agree and the flags are computed only
+    once; side-only rows come from the same `report_data` helpers.
+    """
+    def __init__(self, report: HtmlReport, chunk_rows: int = 50000):
+        """
+        Initializes the ExcelReport.
+
+        Args:
+            report (HtmlReport): The report of the comparison to write.
+            chunk_rows (int): Number of rows converted to Python values at a time.
+        """
+        if xlsxwriter is None:
+            raise ImportError("The Excel report requires the 'xlsxwriter' package.")
+        self.report = report
+        self.chunk_rows = chunk_rows
+        self.rows_per_sheet = MAX_SHEET_ROWS
+        self._workbook = None
+        self._formats = {}
+
+    def _chunks(self, positions):
+        # An empty category still yields one empty chunk, which carries the column names
+        for start in range(0, max(len(positions), 1), self.chunk_rows):
+            check_memory("writing the Excel report")
+            yield positions[start:start + self.chunk_rows]
+
+    def _side_only_chunks(self, indicator, side, positions):
+        dtypes = self.report.side_dtypes(side)
+        for chunk in self._chunks(positions):
+            yield side_only_rows(self.report.df, self.report.key, indicator, side, dtypes, chunk)
+
+    def _mismatch_chunks(self, positions, columns):
+        df = self.report.df
+        for chunk in self._chunks(positions):
+            rows = df.iloc[chunk]
+            combined = {self.report.key: rows[self.report.key].to_numpy()}
+            for col in columns:
+                combined[f'{col}_source'] = rows[f'{col}{SOURCE_SUFFIX}'].to_numpy()
+                combined[f'{col}_target'] = rows[f'{col}{TARGET_SUFFIX}'].to_numpy()
+            yield pd.DataFrame(combined)
+
+    def _write_summary(self):
+        counts = self.report.get_summary_counts()
+        sheet = self._workbook.add_worksheet('Summary')
+        sheet.set_column(0, 0, 28)
+        sheet.set_column(1, 1, 60)
+        rows = [
+            ('Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ('Source file', str(self.report.source_file)),
+            ('Target file', str(self.report.target_file)),
+            ('Key column', self.report.key),
+            ('Total rows in source', counts["source_rows"]),
+            ('Total rows in target', counts["target_rows"]),
+            ('Matching rows', counts["matching_rows"]),
+            ('Rows only in source', counts["source_only_rows"]),
+            ('Rows only in target', counts["target_only_rows"]),
+            ('Rows with differences', counts["mismatched_rows"]),
+        ]
+        sheet.write_row(0, 0, ['Comparison summary'], self._formats['title'])
+        for row, (label, value) in enumerate(rows, start=2):
+            sheet.write(row, 0, label, self._formats['header'])
+            sheet.write(row, 1, value)
+
+    def _write_category(self, title, chunks, total_rows, mark_pairs=False):
+        """
+        Streams a category onto one or more sheets.
+
+        Args:
+            title (str): The sheet name; continuation sheets get a ' (2)', ' (3)', ... suffix.
+            chunks (Iterator[pd.DataFrame]): The rows of the category, chunk by chunk.
+            total_rows (int): The number of rows `chunks` yields.
+            mark_pairs (bool): Whether columns 1-2, 3-4, ... are source/target pairs
+                               whose differing cells are highlighted.
+        """
+        sheet_count = max(1, -(-total_rows // self.rows_per_sheet))
+        expect_rows(total_rows)
+        sheet, sheet_index, row, columns = None, 0, 0, []
+        for chunk in chunks:
+            columns = [str(col) for col in chunk.columns]
+            for values in zip(*python_columns(chunk)):
+                if sheet is None or row > self.rows_per_sheet:
+                    sheet_index += 1
+                    rows_on_sheet = min(self.rows_per_sheet, total_rows - (sheet_index - 1) * self.rows_per_sheet)
+                    sheet = self._add_category_sheet(title, sheet_index, columns, rows_on_sheet, mark_pairs)
+                    row = 1
+                sheet.write_row(row, 0, values)
+                row += 1
+            report_progress(len(chunk))
+        if sheet is None:
+            # An empty category still gets its sheet, so the workbook layout is always the same
+            self._add_category_sheet(title, 1, columns, 0, mark_pairs)
+        logger.info(f"Wrote {total_rows} rows to {sheet_count} '{title}' sheet(s).")
+
+    def _add_category_sheet(self, title, index, columns, rows, mark_pairs):
+        sheet = self._workbook.add_worksheet(title if index == 1 else f"{title} ({index})")
+        sheet.freeze_panes(1, 0)
+        sheet.set_column(0, max(len(columns) - 1, 0), 16)
+        sheet.write_row(0, 0, columns, self._formats['header'])
+        if columns and rows:
+            sheet.autofilter(0, 0, rows, len(columns) - 1)
+        if mark_pairs and rows:
+            for first in range(1, len(columns) - 1, 2):
+                source_col, target_col = xl_col_to_name(first), xl_col_to_name(first + 1)
+                # EXACT is case-sensitive and treats two blanks as equal, like the diff itself
+                sheet.conditional_format(1, first, rows, first + 1, {
+                    'type': 'formula',
+                    'criteria': f'=NOT(EXACT(${source_col}2,${target_col}2))',
+                    'format': self._formats['diff'],
+                })
+        return sheet
+
+    def generate_and_save_report(self, filename):
+        """
+        Writes the workbook.
+
+        Args:
+            filename (str): Destination xlsx path.
+        """
+        logger.info(f"Generating Excel report {filename}")
+        dir_name = os.path.dirname(filename)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self._workbook = xlsxwriter.Workbook(filename, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            'remove_timezone': True,
+            'nan_inf_to_errors': True,
+        })
+        try:
+            self._formats = {
+                'title': self._workbook.add_format({'bold': True, 'font_size': 14}),
+                'header': self._workbook.add_format({'bold': True, 'bg_color': '#DDEBF7', 'border': 1}),
+                'diff': self._workbook.add_format({'bg_color': '#FFC7CE', 'font_color': '#9C0006'}),
+            }
+            self._write_summary()
+
+            source_only = side_only_positions(self.report.df, 'left_only')
+            self._write_category('Source Only', self._side_only_chunks('left_only', 'source', source_only),
+                                 len(source_only))
+            target_only = side_only_positions(self.report.df, 'right_only')
+            self._write_category('Target Only', self._side_only_chunks('right_only', 'target', target_only),
+                                 len(target_only))
+            mismatched = np.flatnonzero(self.report.get_mismatch_flags())
+            columns = [col for col in compared_columns(self.report.df) if col != self.report.key]
+            self._write_category('Mismatches', self._mismatch_chunks(mismatched, columns), len(mismatched),
+                                 mark_pairs=True)
+        finally:
+            self._workbook.close()
+        logger.info(f"Excel report saved to {filename}")
@@ -0,0 +1,308 @@
+import fnmatch
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+import pandas as pd
+
+from src.utils.checkpoint_store import CheckpointStore, path_fingerprint
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.data_sources import DataFrameSource, DataSource, create_data_source
+from src.utils.diff_output import DiffOutputWriter
+from src.utils.excel_report import ExcelReport
+from src.utils.html_report import HtmlReport
+from src.utils.html_index_report import HtmlIndexReport
+from src.utils.logger_setup import LoggerSetup
+from src.utils.telemetry import expect_rows, report_progress
+
+logger = logging.getLogger(__name__)
+
+
+class ComparisonPair:
+    """A named source/target pair compared by `FanOutComparer`."""
+    def __init__(self, name: str, source: DataSource = None, target: DataSource = None, error: str = None,
+                 fingerprint=None):
+        """
+        Initializes the pair.
+
+        Args:
+            name (str): Name of the pair, used for its report file and in the index.
+            source (DataSource): The source side, or None when it is missing.
+            target (DataSource): The target side, or None when it is missing.
+            error (str, optional): Why the pair cannot be compared, e.g. a missing side.
+            fingerprint (optional): Identifies the current contents of both sides for
+                                    checkpointing; pairs without one are never resumed.
+        """
+        self.name = name
+        self.source = source
+        self.target = target
+        self.error = error
+        self.fingerprint = fingerprint
+
+    def __repr__(self):
+        return f"<ComparisonPair name={self.name} source={self.source} target={self.target}>"
+
+
+def _safe_file_name(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'pair'
+
+
+def compare_pair(pair: ComparisonPair, column_mapping: dict, report_path: str, backend: str = 'pandas',
+                 report_formats=('html',), diff_formats=(), profile_columns: bool = False) -> Dict:
+    """
+    Compares one pair and writes its reports.
+
+    This is a module-level function so it can run in a worker process; the
+    pair's data sources are read in the worker.
+
+    Args:
+        pair (ComparisonPair): The pair to compare.
+        column_mapping (dict): The column mapping applied to the pair.
+        report_path (str): Path of the pair's HTML report; other reports and the
+                           diff output are written next to it.
+        backend (str): The comparison backend, see `ConfigurableExcelComparer`.
+        report_formats (tuple): Reports to write, any of 'html' and 'xlsx'.
+        diff_formats (tuple): Diff output formats, see `DiffOutputWriter`. No diff
+                              output is written when empty.
+        profile_columns (bool): Profile the columns of the pair, see `ConfigurableExcelComparer`.
+
+    Returns:
+        Dict: The pair name, status ('identical', 'different' or 'error'),
+              summary counts, report paths (the first one as 'report'), diff
+              output directory and error message.
+    """
+    result = {"name": pair.name, "source": str(pair.source), "target": str(pair.target),
+              "status": "error", "counts": {}, "report": None, "reports": [], "diff_dir": None,
+              "error": pair.error}
+    if pair.error:
+        logger.warning(f"Skipping pair '{pair.name}': {pair.error}")
+        return result
+
+    try:
+        comparer = ConfigurableExcelComparer(
+            source_path=pair.source.path,
+            target_path=pair.target.path,
+            column_mapping=column_mapping,
+            source_reader=pair.source,
+            target_reader=pair.target,
+            backend=backend,
+            profile_columns=profile_columns
+        )
+        comparison_df = comparer.compare()
+        report = HtmlReport(
+            comparison_df,
+            comparer.source_df,
+            comparer.target_df,
+            source_file=str(pair.source),
+            target_file=str(pair.target),
+            key_column=comparer.key_column,
+            column_profiles=comparer.column_profiles
+        )
+        report_stem = os.path.splitext(report_path)[0]
+        if diff_formats:
+            result["diff_dir"] = report_stem + '_diff'
+            DiffOutputWriter(result["diff_dir"], formats=diff_formats).write(
+                comparison_df, comparer.key_column, source_file=str(pair.source), target_file=str(pair.target),
+                column_profiles=comparer.column_profiles)
+        for report_format in report_formats or ('html',):
+            path = f"{report_stem}.{report_format}"
+            if report_format == 'html':
+                report.generate_and_save_report(path)
+            else:
+                ExcelReport(report).generate_and_save_report(path)
+            result["reports"].append(path)
+        counts = report.get_summary_counts()
+        differences = counts["source_only_rows"] + counts["target_only_rows"] + counts["mismatched_rows"]
+        result.update(status="different" if differences else "identical", counts=counts,
+                      report=result["reports"][0])
+    except Exception as e:
+        logger.error(f"An error occurred during comparison of pair '{pair.name}': {e}")
+        result["error"] = str(e)
+    return result
+
+
+class FanOutComparer:
+    """
+    Compares many source/target pairs with one column mapping.
+
+    Pairs are either the sheets of two workbooks or the files of two
+    directories. Every pair is compared in a worker process, gets its own
+    HTML report, and an index report links all of them.
+
+    With a `CheckpointStore`, every finished pair is checkpointed, and a
+    resumed run only compares the pairs that did not finish or changed.
+    """
+    def __init__(self, column_mapping: dict, output_dir: str, max_workers: int = None,
+                 checkpoints: CheckpointStore = None, backend: str = 'pandas', report_formats=('html',),
+                 diff_formats=(), profile_columns: bool = False):
+        """
+        Initializes the FanOutComparer.
+
+        Args:
+            column_mapping (dict): The column mapping applied to every pair.
+            output_dir (str): Directory for the per-pair reports and the index.
+            max_workers (int, optional): Maximum worker processes. Defaults to the CPU count.
+            checkpoints (CheckpointStore, optional): Store for finished pairs.
+            backend (str): The comparison backend used for every pair.
+            report_formats (tuple): Reports written for every pair, any of 'html' and 'xlsx'.
+            diff_formats (tuple): Diff output formats written for every pair, see `DiffOutputWriter`.
+            profile_columns (bool): Profile the columns of every pair, see `ConfigurableExcelComparer`.
+        """
+        self.column_mapping = column_mapping
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.checkpoints = checkpoints
+        self.backend = backend
+        self.report_formats = tuple(report_formats)
+        self.diff_formats = tuple(diff_formats)
+        self.profile_columns = profile_columns
+        self.index_path = None
+        logger.info("FanOutComparer initialized.")
+
+    def pair_sheets(self, source_path: str, target_path: str, sheets: List[str] = None) -> List[ComparisonPair]:
+        """
+        Pairs the sheets of two workbooks by sheet name.
+
+        Each workbook is opened and parsed once, here, for all of its paired
+        sheets; the workers get the parsed sheets as `DataFrameSource`s.
+        Parsing a sheet in a worker would re-open and re-parse the whole
+        workbook for every sheet.
+
+        Args:
+            source_path (str): Path to the source workbook.
+            target_path (str): Path to the target workbook.
+            sheets (List[str], optional): Sheets to compare. Defaults to every sheet
+                                          of the source workbook.
+
+        Returns:
+            List[ComparisonPair]: One pair per sheet, in source workbook order.
+        """
+        with pd.ExcelFile(source_path) as source_book, pd.ExcelFile(target_path) as target_book:
+            source_sheets = source_book.sheet_names
+            target_sheets = target_book.sheet_names
+            sheets = list(sheets) if sheets else source_sheets
+            common = [sheet for sheet in sheets if sheet in source_sheets and sheet in target_sheets]
+            source_frames = source_book.parse(sheet_name=common) if common else {}
+            target_frames = target_book.parse(sheet_name=common) if common else {}
+
+        fingerprints = [path_fingerprint(source_path), path_fingerprint(target_path)]
+        pairs = []
+        for sheet in sheets:
+            if sheet in common:
+                pairs.append(ComparisonPair(
+                    sheet,
+                    DataFrameSource(source_frames.pop(sheet), label=f"{source_path} [{sheet}]"),
+                    DataFrameSource(target_frames.pop(sheet), label=f"{target_path} [{sheet}]"),
+                    fingerprint=fingerprints + [sheet]
+                ))
+            else:
+                missing = 'source' if sheet not in source_sheets else 'target'
+                pairs.append(ComparisonPair(sheet, error=f"Sheet '{sheet}' not found in the {missing} workbook."))
+        logger.info(f"Paired {len(common)} of {len(sheets)} sheets between {source_path} and {target_path}.")
+        return pairs
+
+    @staticmethod
+    def _match_key(file_name: str, match_regex: str):
+        if not match_regex:
+            return file_name
+        match = re.search(match_regex, file_name)
+        if not match:
+            return None
+        return match.group(1) if match.groups() else match.group(0)
+
+    def pair_directories(self, source_dir: str, target_dir: str, pattern: str = '*.xlsx',
+                         match_regex: str = None, sheet_name: str = 'Sheet1') -> List[ComparisonPair]:
+        """
+        Pairs the files of two directories.
+
+        Files are selected with the glob `pattern` and paired by file name, or by
+        the first group of `match_regex` when given (e.g. r'(\\d{6})' pairs
+        'src_202401.xlsx' with 'tgt_202401.xlsx').
+
+        Args:
+            source_dir (str): Directory with the source files.
+            target_dir (str): Directory with the target files.
+            pattern (str): Glob pattern selecting the files to compare.
+            match_regex (str, optional): Regular expression extracting the pairing key.
+            sheet_name (str): The sheet read from Excel files.
+
+        Returns:
+            List[ComparisonPair]: One pair per key, sorted by key.
+        """
+        def index_files(directory):
+            files = {}
+            for file_name in sorted(os.listdir(directory)):
+                key = self._match_key(file_name, match_regex) if fnmatch.fnmatch(file_name, pattern) else None
+                if key is not None:
+                    files[key] = os.path.join(directory, file_name)
+            return files
+
+        source_files = index_files(source_dir)
+        target_files = index_files(target_dir)
+
+        pairs = []
+        for key in sorted(set(source_files) | set(target_files)):
+            if key in source_files and key in target_files:
+                pairs.append(ComparisonPair(
+                    key,
+                    create_data_source(source_files[key], sheet_name=sheet_name),
+                    create_data_source(target_files[key], sheet_name=sheet_name),
+                    fingerprint=[path_fingerprint(source_files[key]), path_fingerprint(target_files[key]), sheet_name]
+                ))
+            else:
+                missing = 'source' if key not in source_files else 'target'
+                pairs.append(ComparisonPair(key, error=f"No matching file in the {missing} directory."))
+        logger.info(f"Paired {len(pairs)} files between {source_dir} and {target_dir}.")
+        return pairs
+
+    def _checkpoint_key(self, pair: ComparisonPair):
+        if self.checkpoints is None or pair.fingerprint is None:
+            return None
+        return 'pair', pair.name, pair.fingerprint, self.column_mapping, self.backend, self.report_formats, \
+            self.diff_formats, self.profile_columns
+
+    def run(self, pairs: List[ComparisonPair], index_name: str = 'index.html') -> List[Dict]:
+        """
+        Compares all pairs in worker processes and writes the index report.
+
+        Args:
+            pairs (List[ComparisonPair]): The pairs to compare.
+            index_name (str): File name of the index report inside `output_dir`.
+
+        Returns:
+            List[Dict]: One result per pair, in the order of `pairs`.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        report_paths = [os.path.join(self.output_dir, f"{index:03d}_{_safe_file_name(pair.name)}.html")
+                        for index, pair in enumerate(pairs)]
+
+        results = [None] * len(pairs)
+        checkpoint_keys = [self._checkpoint_key(pair) for pair in pairs]
+        for index, checkpoint_key in enumerate(checkpoint_keys):
+            finished = self.checkpoints.get(checkpoint_key) if checkpoint_key is not None else None
+            if finished is not None and finished["report"] and os.path.exists(finished["report"]):
+                results[index] = finished
+        pending = [index for index, result in enumerate(results) if result is None]
+
+        logger.info(f"Comparing {len(pending)} of {len(pairs)} pairs with up to "
+                    f"{self.max_workers or os.cpu_count()} workers.")
+        expect_rows(len(pending))
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.max_workers, **LoggerSetup.worker_pool_kwargs()) as executor:
+                futures = {executor.submit(compare_pair, pairs[index], self.column_mapping, report_paths[index],
+                                           self.backend, self.report_formats, self.diff_formats,
+                                           self.profile_columns): index
+                           for index in pending}
+                # Pairs are collected as they finish, so progress and checkpoints follow the work
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index] = future.result()
+                    report_progress(1)
+                    if checkpoint_keys[index] is not None and results[index]["status"] != "error":
+                        self.checkpoints.put(checkpoint_keys[index], results[index])
+
+        self.index_path = os.path.join(self.output_dir, index_name)
+        HtmlIndexReport(results).generate_and_save_report(self.index_path)
+        return results
@@ -0,0 +1,112 @@
+from datetime import datetime
+import html
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HtmlIndexReport:
+    """
+    Generates an HTML index page for a fan-out comparison.
+
+    The index lists every compared pair with its row counts and links to the
+    pair's own HTML report.
+    """
+    def __init__(self, results, title='Fan-out Comparison Report'):
+        """
+        Initializes the HtmlIndexReport.
+
+        Args:
+            results (list): One dictionary per compared pair, as returned by
+                            `FanOutComparer.run`.
+            title (str): The title of the index page.
+        """
+        self.results = results
+        self.title = title
+        logger.info("HtmlIndexReport instance created.")
+
+    def generate_summary(self):
+        """
+        Generates the summary section of the index page.
+        """
+        statuses = [result["status"] for result in self.results]
+        return f'''
+        <div>
+            <h3>Summary</h3>
+            <p><strong>Pairs compared:</strong> {len(self.results)}</p>
+            <p><strong>Identical pairs:</strong> {statuses.count('identical')}</p>
+            <p><strong>Pairs with differences:</strong> {statuses.count('different')}</p>
+            <p><strong>Failed pairs:</strong> {statuses.count('error')}</p>
+        </div>
+        '''
+
+    def generate_table(self, index_dir):
+        """
+        Generates the table of pairs, with report links relative to `index_dir`.
+        """
+        rows = []
+        for result in self.results:
+            counts = result.get("counts", {})
+            if result.get("report"):
+                link = os.path.relpath(result["report"], index_dir).replace(os.sep, '/')
+                name = f'<a href="{html.escape(link)}">{html.escape(result["name"])}</a>'
+            else:
+                name = html.escape(result["name"])
+            detail = html.escape(result.get("error") or '')
+            rows.append(f'''
+                <tr class="{'highlight' if result['status'] != 'identical' else ''}">
+                    <td>{name}</td>
+                    <td>{html.escape(result['status'])}</td>
+                    <td>{counts.get('source_rows', '')}</td>
+                    <td>{counts.get('target_rows', '')}</td>
+                    <td>{counts.get('source_only_rows', '')}</td>
+                    <td>{counts.get('target_only_rows', '')}</td>
+                    <td>{counts.get('mismatched_rows', '')}</td>
+                    <td>{detail}</td>
+                </tr>''')
+        return f'''
+        <table>
+            <tr>
+                <th>Pair</th><th>Status</th><th>Source rows</th><th>Target rows</th>
+                <th>Source only</th><th>Target only</th><th>Mismatched</th><th>Details</th>
+            </tr>
+            {''.join(rows)}
+        </table>
+        '''
+
+    def generate_and_save_report(self, filename):
+        """
+        Generates the index page and saves it to a file.
+        """
+        logger.info("Generating and saving index report to file.")
+        index_dir = os.path.dirname(os.path.abspath(filename))
+
+        html_content = f'''
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>{html.escape(self.title)}</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                h2, h3 {{ color: #333; }}
+                p {{ line-height: 1.6; }}
+                table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
+                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                th {{ background-color: #f2f2f2; }}
+                .highlight {{ background-color: #f8d7da; }}
+            </style>
+        </head>
+        <body>
+            <h2>{html.escape(self.title)}</h2>
+            {self.generate_summary()}
+            {self.generate_table(index_dir)}
+            <p>Report generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        </body>
+        </html>
+        '''
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+
+        logger.info(f"Index report saved to {filename}")
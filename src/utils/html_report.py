@@ -1,8 +1,14 @@
 from datetime import datetime
+from html import escape
 import os
 import pandas as pd
 import logging
 
+from src.utils.diff_output import MATCHED_ROWS_ATTR, MERGE_COLUMN, matched_rows
+from src.utils.column_profile import PROFILE_FIELDS, profile_differences
+from src.utils.report_data import mismatch_flags, side_only_rows
+from src.utils.telemetry import expect_rows, report_progress
+
 logger = logging.getLogger(__name__)
 
 class HtmlReport:
@@ -12,7 +18,8 @@ class HtmlReport:
     The report includes a summary of differences and a detailed breakdown
     of row-level and column-level discrepancies.
     """
-    def __init__(self, comparison_df, source_df, target_df, source_file, target_file, key_column):
+    def __init__(self, comparison_df, source_df, target_df, source_file, target_file, key_column, column_masks=None,
+                 column_profiles=None):
         """
         Initializes the HtmlReport with comparison dataframes and file paths.
 
@@ -24,90 +31,139 @@ class HtmlReport:
             source_file (str): The path to the source file.
             target_file (str): The path to the target file.
             key_column (str): The key column name used for the comparison.
+            column_masks (dict, optional): Precomputed mismatch masks per column, as returned
+                                           by `ParallelDiff.column_masks`.
+            column_profiles (dict, optional): Per side and column aggregates, as collected in
+                                              `ConfigurableExcelComparer.column_profiles`.
+
+        Only the row counts, column names and dtypes of `source_df` and
+        `target_df` are kept; all rows are taken from `comparison_df`, so the
+        caller may release the input frames once the report is created.
         """
         self.df = comparison_df
-        self.source_df = source_df
-        self.target_df = target_df
+        self.source_rows = len(source_df)
+        self.target_rows = len(target_df)
+        self.source_dtypes = source_df.dtypes.to_dict()
+        self.target_dtypes = target_df.dtypes.to_dict()
+        self.column_masks = column_masks
+        self.column_profiles = column_profiles
+        self._mismatch_flags = None
         self.source_file = source_file
         self.target_file = target_file
         # CRITICAL FIX: The key is now a variable passed from the comparer
         self.key = key_column
         logger.info("HtmlReport instance created.")
 
-    def generate_summary(self):
+    def get_summary_counts(self):
         """
-        Generates the summary section of the HTML report.
+        Computes the row counts shown in the summary section.
+
+        Returns:
+            dict: Source, target, matching, source-only, target-only and mismatched row counts.
         """
-        src_only = self.df[self.df['_merge'] == 'left_only']
-        tgt_only = self.df[self.df['_merge'] == 'right_only']
-        both_rows = self.df[self.df['_merge'] == 'both']
+        merge_counts = self.df[MERGE_COLUMN].value_counts()
+        both_count = matched_rows(self.df)
 
         # Determine rows with data differences
-        mismatched_rows = self._get_mismatched_rows(both_rows)
-        
-        total_rows_src = len(self.source_df)
-        total_rows_tgt = len(self.target_df)
-        total_rows_both = len(both_rows)
-        total_diff_rows = len(mismatched_rows)
-        num_src_only = len(src_only)
-        num_tgt_only = len(tgt_only)
-        total_matched = total_rows_both - total_diff_rows
+        mismatched_count = int(self.get_mismatch_flags().sum())
+
+        return {
+            "source_rows": self.source_rows,
+            "target_rows": self.target_rows,
+            "matching_rows": both_count - mismatched_count,
+            "source_only_rows": int(merge_counts.get('left_only', 0)),
+            "target_only_rows": int(merge_counts.get('right_only', 0)),
+            "mismatched_rows": mismatched_count,
+        }
+
+    def generate_summary(self):
+        """
+        Generates the summary section of the HTML report.
+        """
+        counts = self.get_summary_counts()
+        keyless_note = ('<p>No key column is mapped: rows are matched by their values, ignoring order, '
+                        'and each occurrence of a duplicate row is counted.</p>'
+                        if MATCHED_ROWS_ATTR in self.df.attrs else '')
 
         summary_html = f'''
         <div>
             <h3>Summary</h3>
+            {keyless_note}
             <p><strong>Source File:</strong> {self.source_file}</p>
             <p><strong>Target File:</strong> {self.target_file}</p>
-            <p><strong>Total rows in source:</strong> {total_rows_src}</p>
-            <p><strong>Total rows in target:</strong> {total_rows_tgt}</p>
-            <p><strong>Matching rows:</strong> {total_matched}</p>
-            <p><strong>Rows only in source:</strong> {num_src_only}</p>
-            <p><strong>Rows only in target:</strong> {num_tgt_only}</p>
-            <p><strong>Rows with differences:</strong> {total_diff_rows}</p>
+            <p><strong>Total rows in source:</strong> {counts["source_rows"]}</p>
+            <p><strong>Total rows in target:</strong> {counts["target_rows"]}</p>
+            <p><strong>Matching rows:</strong> {counts["matching_rows"]}</p>
+            <p><strong>Rows only in source:</strong> {counts["source_only_rows"]}</p>
+            <p><strong>Rows only in target:</strong> {counts["target_only_rows"]}</p>
+            <p><strong>Rows with differences:</strong> {counts["mismatched_rows"]}</p>
+            {self.generate_profiles()}
         </div>
         '''
         self.summary_html = summary_html
         return summary_html
 
-    def _get_mismatched_rows(self, both_rows):
+    def generate_profiles(self):
         """
-        Helper method to identify rows with data differences.
+        Generates the column profile table of the summary: per column the
+        aggregates of both sides, with differing aggregates highlighted.
         """
-        if both_rows.empty:
-            return both_rows
+        if not self.column_profiles:
+            return ''
+        source_profiles = self.column_profiles.get("source", {})
+        target_profiles = self.column_profiles.get("target", {})
+        differences = profile_differences(self.column_profiles)
+        fields = PROFILE_FIELDS[1:]
+
+        def cell(value):
+            return '' if value is None else escape(str(value))
+
+        rows_html = ''
+        for col in list(source_profiles) + [col for col in target_profiles if col not in source_profiles]:
+            source_profile, target_profile = source_profiles.get(col), target_profiles.get(col)
+            rows_html += f'<tr><td>{escape(str(col))}</td>'
+            for field in fields:
+                values = [cell(profile[field]) if profile else '-' for profile in (source_profile, target_profile)]
+                if field in differences.get(col, ()):
+                    rows_html += f'<td class="highlight">{values[0]} / {values[1]}</td>'
+                else:
+                    rows_html += f'<td>{values[0] if source_profile else values[1]}</td>'
+            rows_html += '</tr>'
+        header = ''.join(f'<th>{field.capitalize()}</th>' for field in fields)
+        return f'''
+            <p><strong>Columns with differing aggregates:</strong> {len(differences)}</p>
+            <details><summary><strong>Column profiles</strong> (source / target where they differ)</summary>
+            <table><tr><th>Column</th>{header}</tr>{rows_html}</table>
+            </details>
+        '''
+
+    def get_mismatch_flags(self):
+        """
+        Identifies the rows with data differences, see `report_data.mismatch_flags`.
+
+        Returns a boolean array over all rows of the comparison, True for common
+        rows with at least one differing value. It is computed once and reused.
+        """
+        if self._mismatch_flags is None:
+            self._mismatch_flags = mismatch_flags(self.df, self.column_masks)
+        return self._mismatch_flags
+
+    def side_dtypes(self, side):
+        """Returns the column dtypes of the 'source' or 'target' input."""
+        return self.source_dtypes if side == 'source' else self.target_dtypes
+
+    def _get_side_only_rows(self, indicator, side):
+        """
+        Returns the rows that exist on one side only, with that side's original column names.
+        """
+        return side_only_rows(self.df, self.key, indicator, side, self.side_dtypes(side))
 
-        # CRITICAL FIX: Use the normalized key column for exclusion
-        common_cols = [col for col in both_rows.columns if not col.endswith('_src') and not col.endswith('_tgt') and col != self.key and col != '_merge']
-        
-        # Check for differences in common columns
-        mismatched_indices = []
-        for index, row in both_rows.iterrows():
-            is_mismatched = False
-            for col in common_cols:
-                # Use .get() for safety
-                src_val = row.get(f'{col}_src')
-                tgt_val = row.get(f'{col}_tgt')
-                
-                # Check for NaNs and value differences
-                if pd.notna(src_val) or pd.notna(tgt_val):
-                    if not (pd.isna(src_val) and pd.isna(tgt_val)) and (src_val != tgt_val):
-                        is_mismatched = True
-                        break
-            if is_mismatched:
-                mismatched_indices.append(index)
-        
-        return both_rows.loc[mismatched_indices]
-    
     def _is_identical(self):
         """
         Checks if the source and target dataframes are identical.
         """
-        src_only_count = len(self.df[self.df['_merge'] == 'left_only'])
-        tgt_only_count = len(self.df[self.df['_merge'] == 'right_only'])
-        both_rows = self.df[self.df['_merge'] == 'both']
-        mismatched_rows = self._get_mismatched_rows(both_rows)
-        
-        return src_only_count == 0 and tgt_only_count == 0 and len(mismatched_rows) == 0
+        counts = self.get_summary_counts()
+        return counts["source_only_rows"] == 0 and counts["target_only_rows"] == 0 and counts["mismatched_rows"] == 0
 
     def generate_details(self):
         """
@@ -119,25 +175,30 @@ class HtmlReport:
             details_html += '<p>Both files are identical.</p>'
             return details_html
 
+        counts = self.get_summary_counts()
+        expect_rows(counts["source_only_rows"] + counts["target_only_rows"] + counts["mismatched_rows"])
+
         # CRITICAL FIX: Use the normalized key column for all lookups
         # Category 1: Rows only in source
-        src_only = self.source_df[~self.source_df[self.key].isin(self.target_df[self.key])]
+        src_only = self._get_side_only_rows('left_only', 'source')
+        report_progress(len(src_only))
         if not src_only.empty:
             details_html += '<details open><summary><strong>Rows in source only</strong> ({})</summary>'.format(len(src_only))
             details_html += src_only.to_html(index=False)
             details_html += '</details>'
 
         # Category 2: Rows only in target
-        tgt_only = self.target_df[~self.target_df[self.key].isin(self.source_df[self.key])]
+        tgt_only = self._get_side_only_rows('right_only', 'target')
+        report_progress(len(tgt_only))
         if not tgt_only.empty:
             details_html += '<details open><summary><strong>Rows in target only</strong> ({})</summary>'.format(len(tgt_only))
             details_html += tgt_only.to_html(index=False)
             details_html += '</details>'
 
         # Category 3: Data mismatches
-        both_rows = self.df[self.df['_merge'] == 'both']
-        mismatched_rows = self._get_mismatched_rows(both_rows)
-        if not mismatched_rows.empty:
+        flags = self.get_mismatch_flags()
+        if flags.any():
+            mismatched_rows = self.df.loc[flags]
             details_html += '<details open><summary><strong>Data mismatches in common rows</strong> ({})</summary>'.format(len(mismatched_rows))
             
             # Highlight differences in the table (This inner function is not needed if you format the HTML string)
@@ -149,20 +210,21 @@ class HtmlReport:
                 combined_diff_df[self.key] = mismatched_rows[self.key]
             
             # CRITICAL FIX: This part was wrong. It should iterate over the normalized columns
-            for col in self.source_df.columns:
+            for col in self.source_dtypes:
                 if col != self.key:
                     combined_diff_df[f'{col}_source'] = mismatched_rows.get(f'{col}_src')
                     combined_diff_df[f'{col}_target'] = mismatched_rows.get(f'{col}_tgt')
 
             # Use a more detailed approach for table generation if needed
             html_table = combined_diff_df.to_html(index=False)
+            report_progress(len(mismatched_rows))
             
             details_html += html_table
             details_html += '</details>'
 
         # Category 4: Column differences
-        extra_cols_src = sorted(list(set(self.source_df.columns) - set(self.target_df.columns)))
-        extra_cols_tgt = sorted(list(set(self.target_df.columns) - set(self.source_df.columns)))
+        extra_cols_src = sorted(list(set(self.source_dtypes) - set(self.target_dtypes)))
+        extra_cols_tgt = sorted(list(set(self.target_dtypes) - set(self.source_dtypes)))
 
         if extra_cols_src or extra_cols_tgt:
             details_html += '<details open><summary><strong>Column differences</strong></summary><ul>'
@@ -180,7 +242,7 @@ class HtmlReport:
         """
         logger.info("Generating and saving report to file.")
         
-        html_content = f'''
+        html_head = f'''
         <!DOCTYPE html>
         <html>
         <head>
@@ -199,14 +261,17 @@ class HtmlReport:
         </head>
         <body>
             <h2>Excel Sheets Comparison Report</h2>
-            {self.generate_summary()}
-            {self.generate_details()}
+            '''
+
+        # Write the sections one at a time instead of assembling the whole document in memory
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(html_head)
+            f.write(self.generate_summary())
+            f.write(self.generate_details())
+            f.write(f'''
             <p>Report generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
         </body>
         </html>
-        '''
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        ''')
         
         logger.info(f"Report saved to {filename}")
\ No newline at end of file
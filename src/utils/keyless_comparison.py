@@ -0,0 +1,91 @@
+import logging
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.comparison_backends import MERGE_CATEGORIES, ComparisonBackend
+from src.utils.diff_output import MATCHED_ROWS_ATTR, MERGE_COLUMN
+
+logger = logging.getLogger(__name__)
+
+ROW_HASH_COLUMN = '_row_hash'
+
+
+def _hashable_pair(src: pd.Series, tgt: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Brings two columns to dtypes whose value hashes agree whenever
+    `mismatch_mask` considers the values equal (e.g. int 1 and float 1.0).
+    """
+    if src.dtype != tgt.dtype:
+        numpy_dtypes = isinstance(src.dtype, np.dtype) and isinstance(tgt.dtype, np.dtype)
+        if numpy_dtypes and ({src.dtype.kind, tgt.dtype.kind} <= set('biuf') or src.dtype.kind == tgt.dtype.kind == 'M'):
+            # e.g. int64 and float64, or datetimes in different units
+            dtype = np.result_type(src.dtype, tgt.dtype)
+            src, tgt = src.astype(dtype), tgt.astype(dtype)
+        else:
+            src, tgt = src.astype(object), tgt.astype(object)
+    if src.dtype.kind == 'f':
+        # NaNs with different sign or payload bits must hash alike
+        src, tgt = src.where(src.notna(), np.nan), tgt.where(tgt.notna(), np.nan)
+    return src, tgt
+
+
+def row_hashes(source: pd.DataFrame, target: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hashes every row of both sides over the given columns.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: uint64 hashes of the source and target rows.
+    """
+    source_columns, target_columns = {}, {}
+    for col in columns:
+        source_columns[col], target_columns[col] = _hashable_pair(source[col], target[col])
+    source_hashes = pd.util.hash_pandas_object(pd.DataFrame(source_columns), index=False).to_numpy()
+    target_hashes = pd.util.hash_pandas_object(pd.DataFrame(target_columns), index=False).to_numpy()
+    return source_hashes, target_hashes
+
+
+def compare_keyless(source: pd.DataFrame, target: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compares two standardized frames as multisets of rows, ignoring row order.
+
+    Every row is hashed over the columns of both sides, and the hashes are
+    counted in one linear pass. A row value that occurs m times in the
+    source and n times in the target contributes min(m, n) matched rows
+    and |m - n| extra rows on the side with more occurrences. Only the
+    extra rows are taken from the inputs.
+
+    Args:
+        source (pd.DataFrame): The standardized source.
+        target (pd.DataFrame): The standardized target.
+
+    Returns:
+        pd.DataFrame: The extra rows in the shape of a keyed comparison, keyed by
+                      ROW_HASH_COLUMN, with 'left_only' and 'right_only' rows and
+                      the matched row count in `attrs[MATCHED_ROWS_ATTR]`.
+    """
+    common = [col for col in source.columns if col in target.columns]
+    source_hashes, target_hashes = row_hashes(source, target, common)
+
+    codes, uniques = pd.factorize(np.concatenate([source_hashes, target_hashes]))
+    source_codes, target_codes = codes[:len(source)], codes[len(source):]
+    source_counts = np.bincount(source_codes, minlength=len(uniques))
+    target_counts = np.bincount(target_codes, minlength=len(uniques))
+    # The n-th occurrence of a row value is extra when the other side has at most n occurrences
+    source_extra = pd.Series(source_codes).groupby(source_codes).cumcount().to_numpy() >= target_counts[source_codes]
+    target_extra = pd.Series(target_codes).groupby(target_codes).cumcount().to_numpy() >= source_counts[target_codes]
+    matched = int(np.minimum(source_counts, target_counts).sum())
+    logger.info(f"Keyless comparison over {len(common)} columns: {matched} matched rows, "
+                f"{int(source_extra.sum())} source-only and {int(target_extra.sum())} target-only rows.")
+
+    source_names, target_names = ComparisonBackend._suffixed_names(source.columns, target.columns, None)
+    source_rows = source.iloc[np.flatnonzero(source_extra)].set_axis(source_names, axis=1)
+    target_rows = target.iloc[np.flatnonzero(target_extra)].set_axis(target_names, axis=1)
+    source_rows.insert(0, ROW_HASH_COLUMN, source_hashes[source_extra])
+    target_rows.insert(0, ROW_HASH_COLUMN, target_hashes[target_extra])
+    comparison_df = pd.concat([source_rows, target_rows], ignore_index=True)
+    codes = np.repeat(np.array([0, 1], dtype=np.int8), [len(source_rows), len(target_rows)])
+    comparison_df[MERGE_COLUMN] = pd.Categorical.from_codes(codes, categories=MERGE_CATEGORIES)
+    comparison_df.attrs[MATCHED_ROWS_ATTR] = matched
+    return comparison_df
@@ -1,17 +1,213 @@
+import atexit
+import contextlib
+import contextvars
 import logging
+import logging.handlers
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+
+# The scenario a log record belongs to; stamped on every record by the producer.
+_current_scenario = contextvars.ContextVar('current_scenario', default=None)
+
+
+class ScenarioFilter(logging.Filter):
+    """Stamps each record with the scenario that is running in the producing thread."""
+    def __init__(self, default_scenario=None):
+        super().__init__()
+        self.default_scenario = default_scenario
+
+    def filter(self, record):
+        if not hasattr(record, 'scenario'):
+            record.scenario = _current_scenario.get() or self.default_scenario
+        return True
+
+
+class _TemplateQueueHandler(logging.handlers.QueueHandler):
+    """
+    A QueueHandler that keeps the unformatted message of each record as
+    `record.template`, since `prepare` merges the arguments into `msg`
+    before the record is queued.
+    """
+    def prepare(self, record):
+        if not hasattr(record, 'template'):
+            record.template = str(record.msg)
+        return super().prepare(record)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of the same message beyond `max_repeats` per `interval` seconds.
+
+    Only records at or above `level` are limited. Messages are the same when
+    their logger and unformatted message (`record.template` for queued
+    records, else `record.msg`) are, so a warning repeated with different
+    arguments counts as a repeat. When a suppressed
+    message is logged again after its interval has passed, the record is
+    annotated with the number of similar messages that were dropped in
+    between; `pending_summaries` reports the ones still outstanding, e.g. at
+    shutdown.
+    """
+    def __init__(self, max_repeats=5, interval=60.0, level=logging.WARNING):
+        super().__init__()
+        self.max_repeats = max_repeats
+        self.interval = interval
+        self.level = level
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < self.level:
+            return True
+        key = (record.name, record.levelno, getattr(record, 'template', None) or str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window_start, count, suppressed = self._seen.get(key, (now, 0, 0))
+            if now - window_start > self.interval:
+                window_start, count = now, 0
+                if suppressed:
+                    record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+                    record.args = None
+                    suppressed = 0
+            count += 1
+            allowed = count <= self.max_repeats
+            if not allowed:
+                suppressed += 1
+            elif count == self.max_repeats:
+                record.msg = f"{record.getMessage()} (further repeats suppressed for {self.interval:g}s)"
+                record.args = None
+            self._seen[key] = (window_start, count, suppressed)
+        return allowed
+
+    def pending_summaries(self):
+        """
+        Returns one record per message with suppressed repeats that were not
+        reported yet, and resets their counts.
+        """
+        records = []
+        with self._lock:
+            for (name, levelno, msg), (window_start, count, suppressed) in self._seen.items():
+                if suppressed:
+                    records.append(logging.makeLogRecord({
+                        'name': name, 'levelno': levelno, 'levelname': logging.getLevelName(levelno),
+                        'msg': f"{msg} ({suppressed} similar messages suppressed)"}))
+                    self._seen[(name, levelno, msg)] = (window_start, count, 0)
+        return records
+
+
+class _ScenarioRouter(logging.Handler):
+    """Listener-side handler that writes records to the log file of their scenario."""
+    def __init__(self, formatter):
+        super().__init__()
+        self.setFormatter(formatter)
+        self._handlers = {}
+        self._handlers_lock = threading.Lock()
+
+    def add(self, scenario, log_file, level):
+        handler = logging.FileHandler(log_file)
+        handler.setLevel(level)
+        handler.setFormatter(self.formatter)
+        with self._handlers_lock:
+            self._handlers.setdefault(scenario, []).append(handler)
+        return handler
+
+    def remove(self, scenario, handler):
+        with self._handlers_lock:
+            handlers = self._handlers.get(scenario, [])
+            if handler in handlers:
+                handlers.remove(handler)
+        handler.close()
+
+    def emit(self, record):
+        with self._handlers_lock:
+            handlers = list(self._handlers.get(getattr(record, 'scenario', None), []))
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def close(self):
+        with self._handlers_lock:
+            for handlers in self._handlers.values():
+                for handler in handlers:
+                    handler.close()
+            self._handlers.clear()
+        super().close()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    A QueueListener that can be asked to catch up with the queue.
+
+    With a `rate_limit` filter, the records of this process and of every
+    worker process are rate limited together before they reach the handlers.
+    """
+    def __init__(self, queue, *handlers, respect_handler_level=False, rate_limit=None):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.rate_limit = rate_limit
+        self._flush_events = {}
+
+    def handle(self, record):
+        token = getattr(record, 'flush_token', None)
+        if token is not None:
+            event = self._flush_events.pop(token, None)
+            if event is not None:
+                event.set()
+            return
+        if self.rate_limit is not None and not self.rate_limit.filter(record):
+            return
+        super().handle(record)
+
+    def dispatch(self, record):
+        """Passes a record to the handlers directly, bypassing the queue and the rate limit."""
+        super().handle(record)
+
+    def flush(self, timeout):
+        token = uuid.uuid4().hex
+        event = threading.Event()
+        self._flush_events[token] = event
+        self.queue.put(logging.makeLogRecord({'flush_token': token}))
+        event.wait(timeout)
+
 
 class LoggerSetup:
+    """
+    Configures non-blocking logging for the application.
+
+    The root logger only gets a `QueueHandler`; formatting and console/file
+    I/O happen on a background `QueueListener` thread. The queue is a
+    multiprocessing queue, so worker processes can log through the same
+    listener (see `worker_pool_kwargs`), which also applies the rate limit
+    to all of them. Pending records are flushed when the interpreter exits.
+    """
+    _queue = None
+    _queue_handler = None
+    _listener = None
+    _router = None
+    _log_dir = '.'
+    _log_level = logging.INFO
+    _formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
     @staticmethod
-    def initialize_logger(log_file='db_compare_app.log', log_level=logging.DEBUG):
+    def initialize_logger(log_file='db_compare_app.log', log_level=logging.DEBUG,
+                          rate_limit_repeats=5, rate_limit_interval=60.0):
         """
-        Sets up logging with both console and file handlers.
+        Sets up queue-based logging with console and file handlers.
         :param log_file: Path to the log file.
         :param log_level: Logging level (e.g., logging.INFO, logging.DEBUG).
+        :param rate_limit_repeats: Identical warnings allowed per interval before they are suppressed.
+        :param rate_limit_interval: Length of the rate limit interval in seconds.
         """
         logger = logging.getLogger()
         logger.setLevel(log_level)
-        # Avoid adding handlers multiple times
-        if not logger.handlers:
+        # Avoid starting the listener multiple times
+        if LoggerSetup._listener is None:
+            LoggerSetup._log_level = log_level
+            log_dir = os.path.dirname(log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            LoggerSetup._log_dir = log_dir or '.'
             # Console handler
             ch = logging.StreamHandler()
             ch.setLevel(log_level)
@@ -19,10 +215,99 @@ class LoggerSetup:
             fh = logging.FileHandler(log_file)
             fh.setLevel(log_level)
             # Formatter
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            ch.setFormatter(formatter)
-            fh.setFormatter(formatter)
-            # Add handlers
-            logger.addHandler(ch)
-            logger.addHandler(fh)
+            ch.setFormatter(LoggerSetup._formatter)
+            fh.setFormatter(LoggerSetup._formatter)
+            LoggerSetup._router = _ScenarioRouter(LoggerSetup._formatter)
+
+            # Producers only enqueue; the listener thread does the I/O
+            LoggerSetup._queue = multiprocessing.Queue(-1)
+            LoggerSetup._queue_handler = _TemplateQueueHandler(LoggerSetup._queue)
+            LoggerSetup._queue_handler.addFilter(ScenarioFilter())
+            logger.addHandler(LoggerSetup._queue_handler)
+
+            LoggerSetup._listener = _FlushingQueueListener(
+                LoggerSetup._queue, ch, fh, LoggerSetup._router, respect_handler_level=True,
+                rate_limit=RateLimitFilter(rate_limit_repeats, rate_limit_interval))
+            LoggerSetup._listener.start()
+            atexit.register(LoggerSetup.shutdown)
         return logger
+
+    @staticmethod
+    @contextlib.contextmanager
+    def scenario_log(scenario_name, log_dir=None):
+        """
+        Additionally writes all records logged while the context is active to
+        `<log_dir>/<scenario_name>.log`; `log_dir` defaults to the directory
+        of the main log file.
+        """
+        token = _current_scenario.set(scenario_name)
+        handler = None
+        if LoggerSetup._router is not None:
+            log_dir = log_dir or LoggerSetup._log_dir
+            os.makedirs(log_dir, exist_ok=True)
+            handler = LoggerSetup._router.add(scenario_name, os.path.join(log_dir, f"{scenario_name}.log"),
+                                              LoggerSetup._log_level)
+        try:
+            yield
+        finally:
+            if handler is not None:
+                # Let the listener write the scenario's pending records before closing its file
+                LoggerSetup.flush()
+                LoggerSetup._router.remove(scenario_name, handler)
+            _current_scenario.reset(token)
+
+    @staticmethod
+    def flush(timeout=5.0):
+        """Waits until the listener has handled every record this process queued so far."""
+        if LoggerSetup._listener is not None:
+            LoggerSetup._listener.flush(timeout)
+
+    @staticmethod
+    def shutdown():
+        """
+        Reports the repeats the rate limit still holds back, flushes pending
+        records, stops the listener and detaches the queue handler.
+        """
+        if LoggerSetup._listener is None:
+            return
+        LoggerSetup._listener.stop()
+        # The queue is drained now, so the counts are final
+        for record in LoggerSetup._listener.rate_limit.pending_summaries():
+            LoggerSetup._listener.dispatch(record)
+        for handler in LoggerSetup._listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(LoggerSetup._queue_handler)
+        LoggerSetup._queue.close()
+        LoggerSetup._queue.join_thread()
+        LoggerSetup._listener = None
+        LoggerSetup._queue = None
+        LoggerSetup._queue_handler = None
+        LoggerSetup._router = None
+        LoggerSetup._log_dir = '.'
+
+    @staticmethod
+    def initialize_worker_logger(log_queue, log_level=logging.INFO, scenario_name=None):
+        """
+        Routes the logging of a worker process to the parent's listener.
+        Used as a process pool initializer, see `worker_pool_kwargs`.
+        """
+        logger = logging.getLogger()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.setLevel(log_level)
+        queue_handler = _TemplateQueueHandler(log_queue)
+        queue_handler.addFilter(ScenarioFilter(scenario_name))
+        logger.addHandler(queue_handler)
+
+    @staticmethod
+    def worker_pool_kwargs():
+        """
+        Returns the `initializer`/`initargs` arguments that make a process pool
+        log through this listener, or an empty dict when logging is not initialized.
+        """
+        if LoggerSetup._queue is None:
+            return {}
+        return {
+            "initializer": LoggerSetup.initialize_worker_logger,
+            "initargs": (LoggerSetup._queue, LoggerSetup._log_level, _current_scenario.get()),
+        }
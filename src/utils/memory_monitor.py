@@ -0,0 +1,190 @@
+import contextlib
+import logging
+import os
+import threading
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+class MemoryLimitExceeded(MemoryError):
+    """Raised when the process uses more memory than the configured ceiling."""
+    def __init__(self, rss_mb, limit_mb, where):
+        self.rss_mb = rss_mb
+        self.limit_mb = limit_mb
+        self.where = where
+        super().__init__(f"Memory limit exceeded during '{where}': {rss_mb:.0f} MB in use, "
+                         f"limit is {limit_mb:.0f} MB. Reduce the input size, select fewer columns "
+                         f"or raise MEMORY_LIMIT_MB.")
+
+
+def current_rss():
+    """
+    Returns the resident set size of this process in bytes, or None when it
+    cannot be determined (no /proc and no psutil).
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return None
+
+
+def _read_peak_rss():
+    """Returns the kernel's high-water mark of the resident set size (Linux only), or None."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Resets the kernel's high-water mark so it covers the next stage only. Returns True on success."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def check_memory(where='processing'):
+    """
+    Checks the memory ceiling of the active `MemoryMonitor`, if any.
+
+    Chunked loops call this between chunks, and the standardize and diff
+    stages between columns, so that a run stops with `MemoryLimitExceeded`
+    instead of being killed by the operating system.
+    """
+    monitor = MemoryMonitor._active
+    if monitor is not None:
+        monitor.check(where)
+
+
+class MemoryMonitor:
+    """
+    Records the peak memory of each stage and enforces an optional ceiling.
+
+    A background thread samples the resident set size every `interval`
+    seconds. On Linux the kernel's high-water mark is reset at the start of
+    each stage, so short spikes between samples are captured as well.
+
+    The sampler also enforces the ceiling: the first sample above it logs a
+    warning and sets a flag, and the next safe point raises. Safe points are
+    stage boundaries and every `check_memory` call, i.e. between chunks and
+    between columns. A single large operation, such as a non-chunked read or
+    the join, cannot be interrupted; it can overshoot the ceiling until it
+    returns.
+    """
+    _active = None
+
+    def __init__(self, limit_mb: float = None, interval: float = 0.05):
+        """
+        Initializes the MemoryMonitor.
+
+        Args:
+            limit_mb (float, optional): Memory ceiling in MB; None or 0 disables it.
+            interval (float): Sampling interval in seconds.
+        """
+        self.limit_mb = limit_mb or None
+        self.interval = interval
+        self.stage_peaks = {}
+        self.available = current_rss() is not None
+        if not self.available:
+            logger.warning("Memory monitoring is unavailable on this platform; install 'psutil' to enable it.")
+        self._stage_peak = 0
+        self._over_limit = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._previous = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Starts sampling and makes this monitor the one used by `check_memory`."""
+        self._previous, MemoryMonitor._active = MemoryMonitor._active, self
+        if self.available and self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._sample, name='memory-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops sampling."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if MemoryMonitor._active is self:
+            MemoryMonitor._active = self._previous
+
+    def _record(self, rss):
+        """Records a sample; returns True when it is the first one above the ceiling since the last check."""
+        with self._lock:
+            self._stage_peak = max(self._stage_peak, rss)
+            if self.limit_mb and rss > self.limit_mb * MB and self._over_limit is None:
+                self._over_limit = rss
+                return True
+        return False
+
+    def _sample(self):
+        while not self._stop_event.wait(self.interval):
+            rss = current_rss()
+            if rss is not None and self._record(rss):
+                logger.warning(f"Memory use of {rss / MB:.0f} MB exceeds the limit of {self.limit_mb:.0f} MB; "
+                               "stopping at the next safe point.")
+
+    def check(self, where='processing'):
+        """
+        Raises `MemoryLimitExceeded` when the current or a sampled memory use exceeds the ceiling.
+
+        Args:
+            where (str): Name of the stage or loop, used in the error message.
+        """
+        if not self.available or not self.limit_mb:
+            return
+        self._record(current_rss())
+        with self._lock:
+            over_limit, self._over_limit = self._over_limit, None
+        if over_limit is not None:
+            raise MemoryLimitExceeded(over_limit / MB, self.limit_mb, where)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Records the peak memory (in MB) of the code run inside the context as `stage_peaks[name]`."""
+        self.check(name)
+        if not self.available:
+            yield
+            return
+        kernel_peak = _reset_peak_rss()
+        with self._lock:
+            self._stage_peak = current_rss()
+        try:
+            yield
+        finally:
+            rss = current_rss()
+            self._record(max(rss, (_read_peak_rss() or 0) if kernel_peak else 0))
+            peak = self._stage_peak
+            self.stage_peaks[name] = round(peak / MB, 1)
+            logger.info(f"Stage '{name}' peak memory: {self.stage_peaks[name]:.1f} MB "
+                        f"(now {rss / MB:.1f} MB)")
+        self.check(name)
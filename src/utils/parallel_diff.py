@@ -0,0 +1,277 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+
+from src.utils.diff_output import MERGE_COLUMN, SOURCE_SUFFIX, TARGET_SUFFIX, compared_columns, mismatch_mask
+from src.utils.logger_setup import LoggerSetup
+from src.utils.memory_monitor import check_memory
+from src.utils.telemetry import expect_rows, report_progress
+
+logger = logging.getLogger(__name__)
+
+_ALIGNMENT = 64
+
+
+def _arrow_strings(values: pd.Series):
+    """The Arrow array behind a pyarrow-backed string column, or None."""
+    if pa is None or not isinstance(values.dtype, pd.StringDtype) or values.dtype.storage != 'pyarrow':
+        return None
+    array = pa.array(values.array)
+    return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+
+
+def _comparable_arrays(src: pd.Series, tgt: pd.Series) -> Tuple:
+    """
+    Returns two arrays over all rows of the columns whose element-wise
+    comparison in `diff_worker` gives the same result as `mismatch_mask`
+    on the original columns.
+
+    Numeric and bool columns are used as they are, timestamps as their int64
+    nanosecond/microsecond values (NaT compares equal to NaT), both without
+    a copy. pyarrow-backed strings are returned as their Arrow arrays, which
+    the workers compare themselves. Everything else (objects, mixed types)
+    is factorized jointly, so equal values get equal int codes and missing
+    values get -1 on both sides.
+    """
+    src_dtype, tgt_dtype = src.dtype, tgt.dtype
+    if isinstance(src_dtype, np.dtype) and isinstance(tgt_dtype, np.dtype):
+        if src_dtype.kind in 'biuf' and tgt_dtype.kind in 'biuf':
+            return src.to_numpy(), tgt.to_numpy()
+        if src_dtype.kind == 'M' and src_dtype == tgt_dtype:
+            return src.to_numpy().view(np.int64), tgt.to_numpy().view(np.int64)
+    src_strings, tgt_strings = _arrow_strings(src), _arrow_strings(tgt)
+    if src_strings is not None and tgt_strings is not None and src_strings.type == tgt_strings.type:
+        return src_strings, tgt_strings
+    codes, _ = pd.factorize(pd.concat([src, tgt], ignore_index=True), use_na_sentinel=True)
+    return codes[:len(src)], codes[len(src):]
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _compare_range(src: np.ndarray, tgt: np.ndarray) -> np.ndarray:
+    differs = src != tgt
+    if src.dtype.kind == 'f' and tgt.dtype.kind == 'f':
+        differs &= ~(np.isnan(src) & np.isnan(tgt))
+    return differs
+
+
+def _compare_arrow(src, tgt) -> np.ndarray:
+    differs = pc.fill_null(pc.not_equal(src, tgt), True)
+    both_missing = pc.and_(pc.is_null(src), pc.is_null(tgt))
+    return pc.and_not(differs, both_missing).to_numpy(zero_copy_only=False)
+
+
+def _attach(buffer, side: Tuple, start: int, stop: int):
+    """
+    Returns rows `start:stop` of the common rows of one side of a column in the shared block.
+
+    Numpy sides hold the common rows themselves; Arrow sides hold the whole
+    column, and its common rows are gathered here with the shared positions.
+    """
+    if side[0] == 'numpy':
+        _, offset, dtype, rows = side
+        return np.ndarray((rows,), dtype=dtype, buffer=buffer, offset=offset)[start:stop]
+    _, value_type, length, array_offset, buffers, (positions_offset, rows) = side
+    array = pa.Array.from_buffers(value_type, length, [
+        None if spec is None else pa.py_buffer(buffer[spec[0]:spec[0] + spec[1]]) for spec in buffers
+    ], offset=array_offset)
+    positions = np.ndarray((rows,), dtype=np.int64, buffer=buffer, offset=positions_offset)[start:stop]
+    # take() copies the rows, so nothing returned refers to the block
+    return array.take(pa.array(positions))
+
+
+def diff_worker(shm_name: str, layout: List[Tuple], tasks: List[Tuple[int, int, int]]) -> List[Tuple[int, int, bytes]]:
+    """
+    Compares column ranges of the aligned arrays in a shared memory block.
+
+    This is a module-level function so it can run in a worker process.
+
+    Args:
+        shm_name (str): Name of the shared memory block.
+        layout (List[Tuple]): Per column the (src, tgt) sides, see `ParallelDiff._share`.
+        tasks (List[Tuple[int, int, int]]): (column index, first row, stop row) ranges to compare.
+
+    Returns:
+        List[Tuple[int, int, bytes]]: Per task the column index, first row and the
+                                      `np.packbits` bitmap of differing rows.
+    """
+    # Pool workers share the parent's resource tracker, so attaching does not take ownership of the block.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        results = []
+        for column, start, stop in tasks:
+            src_side, tgt_side = layout[column]
+            src = _attach(shm.buf, src_side, start, stop)
+            tgt = _attach(shm.buf, tgt_side, start, stop)
+            differs = _compare_range(src, tgt) if src_side[0] == 'numpy' else _compare_arrow(src, tgt)
+            results.append((column, start, np.packbits(differs).tobytes()))
+            del src, tgt
+        return results
+    finally:
+        shm.close()
+
+
+class ParallelDiff:
+    """
+    Computes the per-column mismatch masks of a comparison on several cores.
+
+    The source and target values of the common rows are gathered straight
+    into a shared memory block. pyarrow-backed string columns are copied
+    with their Arrow buffers as they are, and the workers gather and compare
+    their common rows; only object columns are factorized into int codes
+    first. Worker processes map the block without copying, compare disjoint
+    column ranges and return compact bitmaps, which are merged into one
+    boolean mask per column. Small comparisons, or `max_workers=1`, are
+    compared in process with the same result.
+    """
+    def __init__(self, max_workers: int = None, min_cells: int = 2000000, tasks_per_worker: int = 4):
+        """
+        Initializes the ParallelDiff.
+
+        Args:
+            max_workers (int, optional): Maximum worker processes. Defaults to the CPU count.
+            min_cells (int): Common rows times compared columns below which the diff runs in process.
+            tasks_per_worker (int): Number of column ranges handed to each worker, for load balancing.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_cells = min_cells
+        self.tasks_per_worker = tasks_per_worker
+
+    def column_masks(self, comparison_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Compares every column present on both sides.
+
+        Args:
+            comparison_df (pd.DataFrame): The merged comparison with an indicator column.
+
+        Returns:
+            Dict[str, np.ndarray]: Per column a boolean array over all rows of
+                                   `comparison_df`, True for common rows whose values differ.
+        """
+        columns = compared_columns(comparison_df)
+        both = comparison_df[MERGE_COLUMN].to_numpy() == 'both'
+        common_rows = int(both.sum())
+        # Progress is counted in common rows; each column is a fraction of a row
+        expect_rows(common_rows if columns else 0)
+        if self.max_workers <= 1 or common_rows * len(columns) < self.min_cells:
+            masks = {}
+            for col in columns:
+                masks[col] = mismatch_mask(comparison_df[f'{col}{SOURCE_SUFFIX}'],
+                                           comparison_df[f'{col}{TARGET_SUFFIX}']) & both
+                report_progress(common_rows / len(columns))
+                check_memory(f"comparing '{col}'")
+            return masks
+
+        logger.info(f"Comparing {len(columns)} columns of {common_rows} common rows with {self.max_workers} workers.")
+        positions = np.flatnonzero(both)
+        arrays = [_comparable_arrays(comparison_df[f'{col}{SOURCE_SUFFIX}'], comparison_df[f'{col}{TARGET_SUFFIX}'])
+                  for col in columns]
+        shm, layout = self._share(arrays, positions)
+        del arrays
+        try:
+            common_masks = self._run_workers(shm.name, layout, common_rows)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        masks = {}
+        for col, common_mask in zip(columns, common_masks):
+            mask = np.zeros(len(comparison_df), dtype=bool)
+            mask[positions] = common_mask
+            masks[col] = mask
+        return masks
+
+    @staticmethod
+    def _share(arrays: List[Tuple], positions: np.ndarray):
+        """
+        Lays the compared arrays out in a new shared memory block.
+
+        Numpy arrays are gathered at `positions` directly into the block.
+        Arrow arrays are copied buffer by buffer, together with one shared
+        copy of `positions` that the workers gather them with.
+
+        Returns:
+            Tuple: The shared memory block and per column the (src, tgt) sides:
+                   ('numpy', offset, dtype, rows) or
+                   ('arrow', type, length, offset, [(buffer offset, size) or None], (positions offset, rows)).
+        """
+        rows = len(positions)
+        size = 0
+        positions_offset = None
+        if any(not isinstance(array, np.ndarray) for pair in arrays for array in pair):
+            positions_offset, size = 0, _aligned(positions.nbytes)
+        layout = []
+        for pair in arrays:
+            sides = []
+            for array in pair:
+                if isinstance(array, np.ndarray):
+                    sides.append(('numpy', size, array.dtype.str, rows))
+                    size += _aligned(rows * array.dtype.itemsize)
+                else:
+                    buffers = []
+                    for buffer in array.buffers():
+                        buffers.append(None if buffer is None else (size, buffer.size))
+                        size += _aligned(buffer.size) if buffer is not None else 0
+                    sides.append(('arrow', array.type, len(array), array.offset, buffers,
+                                  (positions_offset, rows)))
+            layout.append(tuple(sides))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            if positions_offset is not None:
+                np.ndarray((rows,), dtype=np.int64, buffer=shm.buf, offset=positions_offset)[:] = positions
+            for pair, sides in zip(arrays, layout):
+                for array, side in zip(pair, sides):
+                    if side[0] == 'numpy':
+                        out = np.ndarray((rows,), dtype=array.dtype, buffer=shm.buf, offset=side[1])
+                        np.take(array, positions, out=out)
+                        del out
+                        continue
+                    for buffer, spec in zip(array.buffers(), side[4]):
+                        if spec is not None:
+                            out = np.ndarray((spec[1],), dtype=np.uint8, buffer=shm.buf, offset=spec[0])
+                            out[:] = np.frombuffer(buffer, dtype=np.uint8)
+                            del out
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return shm, layout
+
+    def _tasks(self, num_columns: int, rows: int) -> List[List[Tuple[int, int, int]]]:
+        """Splits the columns, and the rows of each column if needed, into one task list per worker call."""
+        target_tasks = self.max_workers * self.tasks_per_worker
+        splits = max(1, -(-target_tasks // max(num_columns, 1)))
+        # Row ranges start at multiples of 8 so the packed bitmaps can be unpacked independently
+        step = max(8, -(-rows // splits // 8) * 8)
+        ranges = [(column, start, min(start + step, rows))
+                  for column in range(num_columns) for start in range(0, rows, step)]
+        groups = min(target_tasks, len(ranges))
+        return [ranges[i::groups] for i in range(groups)]
+
+    def _run_workers(self, shm_name: str, layout: List[Tuple], rows: int) -> List[np.ndarray]:
+        masks = [np.zeros(rows, dtype=bool) for _ in layout]
+        with ProcessPoolExecutor(max_workers=self.max_workers, **LoggerSetup.worker_pool_kwargs()) as executor:
+            futures = [executor.submit(diff_worker, shm_name, layout, tasks)
+                       for tasks in self._tasks(len(layout), rows)]
+            for future in futures:
+                for column, start, packed in future.result():
+                    stop = min(start + len(packed) * 8, rows)
+                    masks[column][start:stop] = np.unpackbits(
+                        np.frombuffer(packed, dtype=np.uint8), count=stop - start).astype(bool)
+                    report_progress((stop - start) / len(layout))
+        return masks
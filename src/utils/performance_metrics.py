@@ -17,12 +17,12 @@ class PerformanceMetrics:
 
     @staticmethod
     def stop(name):
-        """Stop timing for a given process name and log elapsed time."""
+        """Stop timing for a given process name, log and return the elapsed seconds."""
         now = time.perf_counter()
         start_time = PerformanceMetrics._start_times.get(name)
         if start_time is None:
             logging.warning(f"Performance stop called without matching start: {name}")
-            return
+            return None
         elapsed = now - start_time
         PerformanceMetrics._total_times[name] += elapsed
         # Remove from start_times
@@ -40,6 +40,7 @@ class PerformanceMetrics:
         message = (f"{name} executed in "
                    f"{int(days)}d:{int(hours)}h:{int(minutes)}m:{int(seconds)}s:{int(milliseconds)}ms")
         logging.info(message)
+        return elapsed
 
     @staticmethod
     def report():
@@ -0,0 +1,111 @@
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+class _StackSampler(threading.Thread):
+    """Samples the call stack of one thread at a fixed interval."""
+    def __init__(self, thread_id, interval):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class StageProfiler:
+    """
+    Profiles the stages of a run and writes one profile file per stage.
+
+    Modes:
+        'cprofile': deterministic profiling with cProfile. Writes `<stage>.prof`
+                    (for snakeviz/pstats) and `<stage>.txt`, the top functions by
+                    cumulative time.
+        'sample':   a low-overhead sampling profiler that records the stack of
+                    the running thread every `interval` seconds. Writes
+                    `<stage>.folded`, collapsed stacks for flame graph tools.
+        None:       profiling disabled; `stage` is a no-op.
+    """
+    MODES = ('cprofile', 'sample')
+
+    def __init__(self, mode: str = None, output_dir: str = None, interval: float = 0.005):
+        """
+        Initializes the StageProfiler.
+
+        Args:
+            mode (str, optional): 'cprofile', 'sample' or None.
+            output_dir (str, optional): Directory for the profile files; required when profiling.
+            interval (float): Sampling interval in seconds for the 'sample' mode.
+        """
+        if mode is not None and mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Use one of {self.MODES}.")
+        if mode is not None and not output_dir:
+            raise ValueError("An output directory is required when profiling.")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        self.profile_files = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Profiles the code run inside the context as the stage `name`."""
+        if self.mode is None:
+            yield
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        base_path = os.path.join(self.output_dir, name)
+        if self.mode == 'cprofile':
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                self._write_cprofile(profile, base_path)
+        else:
+            sampler = _StackSampler(threading.get_ident(), self.interval)
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                self._write_samples(sampler, base_path)
+
+    def _write_cprofile(self, profile, base_path):
+        profile.dump_stats(base_path + '.prof')
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(40)
+        with open(base_path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        self.profile_files.extend([base_path + '.prof', base_path + '.txt'])
+        logger.info(f"cProfile results written to {base_path}.prof")
+
+    def _write_samples(self, sampler, base_path):
+        with open(base_path + '.folded', 'w', encoding='utf-8') as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.profile_files.append(base_path + '.folded')
+        logger.info(f"{sum(sampler.stacks.values())} stack samples written to {base_path}.folded")
@@ -0,0 +1,68 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.utils.diff_output import MERGE_COLUMN, SOURCE_SUFFIX, TARGET_SUFFIX, compared_columns, mismatch_mask, \
+    side_columns
+
+
+def mismatch_flags(comparison_df: pd.DataFrame, column_masks: Dict[str, np.ndarray] = None) -> np.ndarray:
+    """
+    Flags the common rows of a comparison with at least one differing value.
+
+    Args:
+        comparison_df (pd.DataFrame): The merged comparison with an indicator column.
+        column_masks (Dict[str, np.ndarray], optional): Precomputed mismatch masks per column,
+                                                        as returned by `ParallelDiff.column_masks`.
+
+    Returns:
+        np.ndarray: Boolean array over all rows of `comparison_df`.
+    """
+    both = comparison_df[MERGE_COLUMN].to_numpy() == 'both'
+    # Columns present on both sides carry the '_src' and '_tgt' merge suffixes;
+    # compare them one vectorized column at a time without copying the common rows
+    is_mismatched = np.zeros(len(comparison_df), dtype=bool)
+    for col in compared_columns(comparison_df):
+        if column_masks is not None:
+            is_mismatched |= column_masks[col]
+        else:
+            is_mismatched |= mismatch_mask(comparison_df[f'{col}{SOURCE_SUFFIX}'], comparison_df[f'{col}{TARGET_SUFFIX}'])
+    return is_mismatched & both
+
+
+def side_only_positions(comparison_df: pd.DataFrame, indicator: str) -> np.ndarray:
+    """Returns the positions in the comparison of the rows with the given merge indicator."""
+    return np.flatnonzero((comparison_df[MERGE_COLUMN] == indicator).to_numpy())
+
+
+def side_only_rows(comparison_df: pd.DataFrame, key_column: str, indicator: str, side: str, dtypes: Dict,
+                   positions: np.ndarray = None) -> pd.DataFrame:
+    """
+    Returns the rows that exist on one side only, with that side's original column names.
+
+    Args:
+        comparison_df (pd.DataFrame): The merged comparison with an indicator column.
+        key_column (str): The key column.
+        indicator (str): 'left_only' or 'right_only'.
+        side (str): 'source' or 'target'.
+        dtypes (Dict): Column name to dtype of that side's input; gives the column
+                       order, and the dtypes the merge changed are restored.
+        positions (np.ndarray, optional): Restricts the result to some of those rows, e.g.
+                                          one chunk of `side_only_positions`. By default all
+                                          of them are returned.
+    """
+    if positions is None:
+        positions = side_only_positions(comparison_df, indicator)
+    columns = side_columns(comparison_df, key_column, side)
+    # Keep the column order of the input frame
+    ordered = sorted(columns, key=lambda col: list(dtypes).index(columns[col]) if columns[col] in dtypes else len(dtypes))
+    rows = comparison_df.iloc[positions, [comparison_df.columns.get_loc(col) for col in ordered]].rename(columns=columns)
+    # The outer merge turns int columns into floats when the other side adds missing values
+    for col, dtype in dtypes.items():
+        if col in rows.columns and rows[col].dtype != dtype and rows[col].notna().all():
+            try:
+                rows[col] = rows[col].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+    return rows
@@ -0,0 +1,331 @@
+import contextlib
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List
+
+from src.utils.checkpoint_store import CheckpointStore, path_fingerprint
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.database_config import DatabaseConfig
+from src.utils.dataset_cache import DatasetCache
+from src.utils.diff_output import DiffOutputWriter
+from src.utils.excel_report import ExcelReport
+from src.utils.fan_out_comparer import FanOutComparer
+from src.utils.html_report import HtmlReport
+from src.utils.logger_setup import LoggerSetup
+from src.utils.memory_monitor import MemoryMonitor
+from src.utils.parallel_diff import ParallelDiff
+from src.utils.performance_metrics import PerformanceMetrics
+from src.utils.profiling import StageProfiler
+from src.utils.telemetry import Telemetry
+
+logger = logging.getLogger(__name__)
+
+
+def generate_timestamped_file_name(filename: str) -> str:
+    """
+    Appends a timestamp to a file name and makes sure its directory exists.
+
+    Args:
+        filename (str): The file name, e.g. 'src/outputs/report.html'.
+
+    Returns:
+        str: The timestamped file name, e.g. 'src/outputs/report_20250101_120000.html'.
+    """
+    dir_name = os.path.dirname(filename)
+    name, ext = os.path.splitext(os.path.basename(filename))
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    return os.path.join(dir_name, f"{name}_{timestamp}{ext}")
+
+
+def build_fan_out_pairs(fan_out: FanOutComparer, scenario_name: str, config_reader: DatabaseConfig,
+                        options: Dict = None):
+    """
+    Builds the comparison pairs described by a fan-out scenario section.
+
+    `FAN_OUT=sheets` pairs the sheets of SOURCE_FILE_PATH and TARGET_FILE_PATH
+    (optionally restricted to the comma separated SHEETS). `FAN_OUT=directories`
+    pairs the files of SOURCE_DIR and TARGET_DIR selected by FILE_PATTERN and
+    matched by MATCH_REGEX. Entries of `options` take precedence over the section.
+    """
+    def option(name, default=''):
+        if options and name in options:
+            return options[name]
+        return config_reader.get_scenario_option(scenario_name, name, default)
+
+    mode = option('FAN_OUT', 'sheets').lower()
+    if mode == 'sheets':
+        sheets = [sheet.strip() for sheet in option('SHEETS').split(',') if sheet.strip()]
+        return fan_out.pair_sheets(option('SOURCE_FILE_PATH'), option('TARGET_FILE_PATH'), sheets=sheets or None)
+    if mode == 'directories':
+        return fan_out.pair_directories(
+            option('SOURCE_DIR'),
+            option('TARGET_DIR'),
+            pattern=option('FILE_PATTERN', '*.xlsx'),
+            match_regex=option('MATCH_REGEX') or None
+        )
+    raise ValueError(f"Unknown FAN_OUT mode '{mode}' for scenario '{scenario_name}'. Use 'sheets' or 'directories'.")
+
+
+class ScenarioRunner:
+    """
+    Runs the scenarios of the config file through the comparison pipeline.
+
+    Each run is split into timed stages (load, standardize, compare, diff,
+    diff_output, report) whose peak memory is recorded as well. Results are
+    written to `<output_dir>/<scenario>/`, and with a profile mode every
+    stage is also profiled into a `_profile` directory next to the report.
+
+    The input frames are released as soon as the comparison exists, so the
+    diff output and report stages only hold `comparison_df`. With a memory
+    ceiling (MEMORY_LIMIT_MB in the scenario section, or `memory_limit_mb`)
+    a run that outgrows it stops with `MemoryLimitExceeded`.
+
+    The comparison backend is taken from BACKEND in the scenario section,
+    falling back to `backend`. The per-column diff runs once, across up to
+    `max_workers` processes (see `ParallelDiff`), and its masks are shared
+    by the diff output and the reports. REPORT_FORMATS in the scenario
+    section selects the reports: 'html' (default), 'xlsx' or both.
+    Column profiles are collected when PROFILE_COLUMNS in the scenario
+    section is true, falling back to `profile_columns` (off by default).
+
+    With a `DatasetCache`, loaded and standardized inputs are kept between
+    runs of the same runner, see `ConfigurableExcelComparer`. With a
+    `CheckpointStore`, the result of every finished scenario and fan-out
+    pair is written to disk, and a resumed run skips whatever already
+    finished with unchanged inputs. The loaded and standardized inputs of a
+    scenario are checkpointed as well, so resuming a scenario that failed
+    after loading does not parse its unchanged inputs again.
+
+    With a `Telemetry`, every stage reports its live progress (rows, rows
+    per second, ETA and memory) to the console and the metrics file.
+    """
+    def __init__(self, config_reader: DatabaseConfig, output_dir: str = os.path.join('src', 'outputs'),
+                 profile_mode: str = None, max_workers: int = None, memory_limit_mb: float = None,
+                 backend: str = 'pandas', cache: DatasetCache = None, checkpoints: CheckpointStore = None,
+                 telemetry: Telemetry = None, profile_columns: bool = False):
+        """
+        Initializes the ScenarioRunner.
+
+        Args:
+            config_reader (DatabaseConfig): The configuration reader instance.
+            output_dir (str): Base directory for reports and diff output.
+            profile_mode (str, optional): 'cprofile', 'sample' or None, see `StageProfiler`.
+            max_workers (int, optional): Maximum worker processes for fan-out scenarios
+                                         and the per-column diff.
+            memory_limit_mb (float, optional): Default memory ceiling in MB for scenarios
+                                               without a MEMORY_LIMIT_MB option.
+            backend (str): Default comparison backend for scenarios without a BACKEND option.
+            cache (DatasetCache, optional): Cache for loaded and standardized inputs, reused across runs.
+            checkpoints (CheckpointStore, optional): Store for finished work, see `CheckpointStore`.
+            telemetry (Telemetry, optional): Live progress reporting, started around every run.
+            profile_columns (bool): Default for scenarios without a PROFILE_COLUMNS option,
+                                    see `ConfigurableExcelComparer`.
+        """
+        self.config_reader = config_reader
+        self.output_dir = output_dir
+        self.profile_mode = profile_mode
+        self.max_workers = max_workers
+        self.memory_limit_mb = memory_limit_mb
+        self.backend = backend
+        self.cache = cache
+        self.checkpoints = checkpoints
+        self.telemetry = telemetry
+        self.profile_columns = profile_columns
+
+    @contextlib.contextmanager
+    def _stage(self, scenario_name, stage, profiler, monitor, timings, unit='rows'):
+        PerformanceMetrics.start(f"{scenario_name}_{stage}")
+        progress = self.telemetry.stage(stage, unit=unit, scenario=scenario_name) if self.telemetry is not None \
+            else contextlib.nullcontext()
+        try:
+            with monitor.stage(stage), profiler.stage(stage), progress:
+                yield
+        finally:
+            timings[stage] = PerformanceMetrics.stop(f"{scenario_name}_{stage}")
+
+    def _option(self, scenario_name, option, default='', options=None):
+        if options and option in options:
+            return options[option]
+        return self.config_reader.get_scenario_option(scenario_name, option, default)
+
+    def _formats(self, scenario_name, options=None):
+        """The diff output formats and report formats selected for a scenario."""
+        diff_formats = [fmt.strip() for fmt in self._option(
+            scenario_name, 'DIFF_OUTPUT_FORMATS', 'parquet,jsonl', options).split(',') if fmt.strip()]
+        report_formats = [fmt.strip().lower() for fmt in self._option(
+            scenario_name, 'REPORT_FORMATS', 'html', options).split(',') if fmt.strip()]
+        unknown = set(report_formats) - {'html', 'xlsx'}
+        if unknown:
+            raise ValueError(f"Unknown REPORT_FORMATS {sorted(unknown)} for scenario '{scenario_name}'. "
+                             "Use 'html' and/or 'xlsx'.")
+        return diff_formats, report_formats or ['html']
+
+    def _profile_columns(self, scenario_name, options=None):
+        """Whether the columns of a scenario are profiled, from PROFILE_COLUMNS or the runner default."""
+        value = self._option(scenario_name, 'PROFILE_COLUMNS', '', options)
+        if value in ('', None):
+            return self.profile_columns
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+    def _column_mapping(self, scenario_name, options=None):
+        mapping = self._option(scenario_name, 'COLUMN_MAPPING', '', options)
+        return mapping if isinstance(mapping, dict) else self.config_reader.get_column_mapping(mapping)
+
+    def _checkpoint_key(self, scenario_name, options=None):
+        """The checkpoint key of a scenario: its settings, mapping and input fingerprints."""
+        settings = dict(self.config_reader.config[scenario_name])
+        settings.update({option.lower(): value for option, value in (options or {}).items()})
+        inputs = {option: path_fingerprint(self._option(scenario_name, option, '', options))
+                  for option in ('SOURCE_FILE_PATH', 'TARGET_FILE_PATH', 'SOURCE_DIR', 'TARGET_DIR')}
+        return ('scenario', scenario_name, settings, self._column_mapping(scenario_name, options), inputs,
+                self.backend, self.output_dir, self.profile_columns)
+
+    def run(self, scenario_name: str, options: Dict = None) -> Dict:
+        """
+        Runs one scenario and writes its reports.
+
+        Args:
+            scenario_name (str): The name of the scenario section in the config file.
+            options (Dict, optional): Scenario options that take precedence over the config
+                                      file for this run, e.g. TARGET_FILE_PATH. COLUMN_MAPPING
+                                      may be a mapping section name or a mapping dict.
+
+        Returns:
+            Dict: The scenario name, status ('ok' or 'error'), report path,
+                  stage timings, peak memory per stage in MB and error message.
+        """
+        result = {"scenario": scenario_name, "status": "error", "report": None, "timings": {}, "memory": {},
+                  "error": None}
+        with LoggerSetup.scenario_log(scenario_name):
+            checkpoint_key = None
+            if self.checkpoints is not None:
+                checkpoint_key = self._checkpoint_key(scenario_name, options)
+                finished = self.checkpoints.get(checkpoint_key)
+                if finished is not None and finished["report"] and os.path.exists(finished["report"]):
+                    logger.info(f"Scenario {scenario_name} already finished with unchanged inputs; "
+                                f"report: {finished['report']}")
+                    return dict(finished, resumed=True)
+            logger.info(f"Running comparison for scenario: {scenario_name}")
+            PerformanceMetrics.start(f"{scenario_name}_Comparison")
+            try:
+                report_path = generate_timestamped_file_name(
+                    os.path.join(self.output_dir, scenario_name, f"{scenario_name}_report.html"))
+                profiler = StageProfiler(self.profile_mode, os.path.splitext(report_path)[0] + '_profile')
+                memory_limit_mb = float(self._option(
+                    scenario_name, 'MEMORY_LIMIT_MB', '', options) or self.memory_limit_mb or 0)
+                with MemoryMonitor(memory_limit_mb) as monitor, self.telemetry or contextlib.nullcontext():
+                    result["memory"] = monitor.stage_peaks
+                    if self._option(scenario_name, 'FAN_OUT', '', options):
+                        self._run_fan_out(scenario_name, report_path, profiler, monitor, result, options)
+                    else:
+                        self._run_comparison(scenario_name, report_path, profiler, monitor, result, options)
+                result["status"] = "ok"
+                result["profiles"] = profiler.profile_files
+                if checkpoint_key is not None:
+                    self.checkpoints.put(checkpoint_key, result)
+            except Exception as e:
+                logger.error(f"An error occurred during {scenario_name} comparison: {e}")
+                result["error"] = str(e)
+            finally:
+                PerformanceMetrics.stop(f"{scenario_name}_Comparison")
+                logger.info(f"Comparison process for {scenario_name} completed.")
+        return result
+
+    def _run_comparison(self, scenario_name, report_path, profiler, monitor, result, options=None):
+        source_path = self._option(scenario_name, 'SOURCE_FILE_PATH', '', options)
+        target_path = self._option(scenario_name, 'TARGET_FILE_PATH', '', options)
+        column_mapping = self._column_mapping(scenario_name, options)
+        if not source_path or not target_path or not column_mapping:
+            raise ValueError(f"Configuration for scenario '{scenario_name}' is incomplete.")
+
+        diff_formats, report_formats = self._formats(scenario_name, options)
+        timings = result["timings"]
+        comparer = ConfigurableExcelComparer(
+            source_path=source_path,
+            target_path=target_path,
+            column_mapping=column_mapping,
+            backend=self._option(scenario_name, 'BACKEND', self.backend, options),
+            cache=self.cache,
+            profile_columns=self._profile_columns(scenario_name, options),
+            checkpoints=self.checkpoints
+        )
+        with self._stage(scenario_name, 'load', profiler, monitor, timings):
+            comparer._load_dataframes()
+        with self._stage(scenario_name, 'standardize', profiler, monitor, timings):
+            comparer._standardize_dataframes()
+        if self.telemetry is not None and comparer.column_profiles is not None:
+            self.telemetry.record('column_profiles', scenario=scenario_name, profiles=comparer.column_profiles)
+        with self._stage(scenario_name, 'compare', profiler, monitor, timings):
+            comparison_df = comparer.compare()
+        with self._stage(scenario_name, 'diff', profiler, monitor, timings):
+            column_masks = ParallelDiff(max_workers=self.max_workers).column_masks(comparison_df)
+            # The report keeps only counts and column names of the inputs; after
+            # this, comparison_df is the only copy of the data.
+            report = HtmlReport(
+                comparison_df,
+                comparer.source_df,
+                comparer.target_df,
+                source_file=source_path,
+                target_file=target_path,
+                key_column=comparer.key_column,
+                column_masks=column_masks,
+                column_profiles=comparer.column_profiles
+            )
+            comparer.release_inputs()
+
+        # Stream the machine-readable diff output before any HTML is rendered
+        if diff_formats:
+            result["diff_dir"] = os.path.splitext(report_path)[0] + '_diff'
+            with self._stage(scenario_name, 'diff_output', profiler, monitor, timings):
+                DiffOutputWriter(result["diff_dir"], formats=diff_formats).write(
+                    comparison_df, comparer.key_column, source_file=source_path, target_file=target_path,
+                    column_masks=column_masks, column_profiles=comparer.column_profiles)
+
+        result["reports"] = []
+        with self._stage(scenario_name, 'report', profiler, monitor, timings):
+            for report_format in report_formats:
+                path = f"{os.path.splitext(report_path)[0]}.{report_format}"
+                if report_format == 'html':
+                    report.generate_and_save_report(path)
+                else:
+                    ExcelReport(report).generate_and_save_report(path)
+                result["reports"].append(path)
+        result["report"] = result["reports"][0]
+
+    def _run_fan_out(self, scenario_name, report_path, profiler, monitor, result, options=None):
+        column_mapping = self._column_mapping(scenario_name, options)
+        if not column_mapping:
+            raise ValueError(f"Configuration for scenario '{scenario_name}' is incomplete.")
+
+        # Every pair is compared like a single scenario: same backend, diff output and reports
+        diff_formats, report_formats = self._formats(scenario_name, options)
+        fan_out = FanOutComparer(column_mapping, os.path.splitext(report_path)[0], max_workers=self.max_workers,
+                                 checkpoints=self.checkpoints,
+                                 backend=self._option(scenario_name, 'BACKEND', self.backend, options),
+                                 report_formats=report_formats, diff_formats=diff_formats,
+                                 profile_columns=self._profile_columns(scenario_name, options))
+        with self._stage(scenario_name, 'fan_out', profiler, monitor, result["timings"], unit='pairs'):
+            pair_results = fan_out.run(build_fan_out_pairs(fan_out, scenario_name, self.config_reader, options))
+        result["report"] = fan_out.index_path
+        failed = [pair["name"] for pair in pair_results if pair["status"] == "error"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(pair_results)} pairs failed: {', '.join(failed)}")
+
+    def run_all(self, scenarios: List[str] = None) -> List[Dict]:
+        """
+        Runs several scenarios one after another; a failing scenario does not stop the others.
+
+        Args:
+            scenarios (List[str], optional): Scenario names. Defaults to the scenarios
+                                             listed in DATA_SCENARIOS_TO_EXECUTE.
+
+        Returns:
+            List[Dict]: One result per scenario, see `run`.
+        """
+        scenarios = scenarios if scenarios is not None else self.config_reader.get_scenarios_list()
+        results = [self.run(scenario_name) for scenario_name in scenarios]
+        PerformanceMetrics.report()
+        return results
@@ -0,0 +1,347 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger_setup import LoggerSetup
+
+logger = logging.getLogger(__name__)
+
+NAMES = [
+    'Alice', 'Bob', 'Carol', 'Dave', 'Eve', 'Frank', 'Shan', 'Konduru',
+    'Bhushan', 'Ravi', 'Pavan', 'Kumar', 'Sarma', 'Krishna', 'Sailaja',
+    'Sri', 'Kirani', 'Nani', 'Vijay', 'Ajith', 'Suriya', 'Prabhas', 'Yash',
+]
+
+# Value column types are assigned round-robin so every dataset exercises
+# the int, string, float and datetime code paths of the comparer.
+COLUMN_TYPES = ('int', 'str', 'float', 'datetime')
+
+BASE_DATE = pd.Timestamp('2023-01-01')
+
+
+class SyntheticDatasetSpec:
+    """
+    Describes a reproducible pair of synthetic source/target datasets.
+
+    The spec is the single source of truth for generated data: the same spec
+    (including the seed) always yields the same rows, so benchmark baselines
+    and test fixtures can be regenerated at will.
+    """
+    KEY_TYPES = ('int', 'str')
+
+    def __init__(self, num_rows: int = 1000, num_columns: int = 4, key_type: str = 'int',
+                 diff_rate: float = 0.02, orphan_rate: float = 0.05, seed: int = 42):
+        """
+        Initializes the dataset spec.
+
+        Args:
+            num_rows (int): Number of rows in the base dataset before orphans are removed.
+            num_columns (int): Number of value (non-key) columns.
+            key_type (str): Type of the key column, either 'int' or 'str'.
+            diff_rate (float): Fraction of common rows with one differing cell in the target.
+            orphan_rate (float): Fraction of rows present only in the source, and
+                                 separately only in the target.
+            seed (int): The random seed for reproducibility.
+        """
+        if num_rows < 1:
+            raise ValueError("num_rows must be at least 1.")
+        if num_columns < 1:
+            raise ValueError("num_columns must be at least 1.")
+        if key_type not in self.KEY_TYPES:
+            raise ValueError(f"key_type must be one of {self.KEY_TYPES}, got '{key_type}'.")
+        if not 0 <= diff_rate <= 1:
+            raise ValueError("diff_rate must be between 0 and 1.")
+        if not 0 <= orphan_rate < 0.5:
+            raise ValueError("orphan_rate must be between 0 and 0.5.")
+
+        self.num_rows = num_rows
+        self.num_columns = num_columns
+        self.key_type = key_type
+        self.diff_rate = diff_rate
+        self.orphan_rate = orphan_rate
+        self.seed = seed
+
+    @property
+    def name(self) -> str:
+        """Returns a stable, file-system friendly name for this spec."""
+        return (f"rows{self.num_rows}_cols{self.num_columns}_{self.key_type}key"
+                f"_diff{self.diff_rate:g}_orph{self.orphan_rate:g}_seed{self.seed}")
+
+    def column_types(self) -> Dict[str, str]:
+        """Returns the source value column names mapped to their data type."""
+        return {f'COL_{i + 1}': COLUMN_TYPES[i % len(COLUMN_TYPES)] for i in range(self.num_columns)}
+
+    def column_mapping(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns a column mapping in the same shape as `DatabaseConfig.get_column_mapping`.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Source column names mapped to their attributes.
+        """
+        mapping = {'ID': {"target": "TGT_ID", "is_key": True}}
+        for col, col_type in self.column_types().items():
+            attributes = {"target": f"TGT_{col}"}
+            if col_type in ('int', 'datetime'):
+                attributes["type"] = col_type
+            mapping[col] = attributes
+        return mapping
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the spec as a JSON serializable dictionary."""
+        return {
+            "num_rows": self.num_rows,
+            "num_columns": self.num_columns,
+            "key_type": self.key_type,
+            "diff_rate": self.diff_rate,
+            "orphan_rate": self.orphan_rate,
+            "seed": self.seed,
+        }
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> 'SyntheticDatasetSpec':
+        """Creates a spec from a dictionary produced by `to_dict`."""
+        return cls(**values)
+
+
+class SyntheticDataGenerator:
+    """
+    Generates source and target DataFrames from a `SyntheticDatasetSpec`.
+
+    Target columns carry a `TGT_` prefix so that the generated column mapping
+    is exercised exactly as it would be for real scenario files. Data is
+    generated in fixed-size blocks so large datasets never have to be held
+    in memory at once.
+    """
+    BLOCK_ROWS = 100000
+
+    def __init__(self, spec: SyntheticDatasetSpec):
+        """
+        Initializes the generator.
+
+        Args:
+            spec (SyntheticDatasetSpec): The dataset description.
+        """
+        self.spec = spec
+
+    def _keys(self, ids: np.ndarray):
+        if self.spec.key_type == 'str':
+            return np.char.add('K', np.char.zfill(ids.astype(str), 10))
+        return ids
+
+    def _values(self, rng: np.random.Generator, col_type: str, size: int):
+        if col_type == 'int':
+            return rng.integers(0, 1000, size=size)
+        if col_type == 'str':
+            return rng.choice(NAMES, size=size)
+        if col_type == 'float':
+            return np.round(rng.random(size=size) * 1000, 2)
+        return BASE_DATE + pd.to_timedelta(rng.integers(0, 10 ** 8, size=size), unit='s')
+
+    @staticmethod
+    def _vary(values: pd.Series, col_type: str) -> pd.Series:
+        if col_type == 'int':
+            return values + 1
+        if col_type == 'str':
+            return values + '_changed'
+        if col_type == 'float':
+            return values + 1.5
+        return values + pd.Timedelta(days=1)
+
+    @property
+    def num_blocks(self) -> int:
+        """Returns the number of fixed-size blocks the dataset is generated in."""
+        return -(-self.spec.num_rows // self.BLOCK_ROWS)
+
+    def generate_block(self, block_index: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Generates the source and target rows of one block.
+
+        Every block is seeded from the spec seed and its index, so a block is
+        reproducible on its own and the dataset is identical however the
+        blocks are distributed across shards or processes.
+
+        Args:
+            block_index (int): Index of the block, from 0 to `num_blocks - 1`.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: The source and target DataFrames.
+        """
+        if not 0 <= block_index < self.num_blocks:
+            raise ValueError(f"Block index {block_index} out of range [0, {self.num_blocks}).")
+        start = block_index * self.BLOCK_ROWS
+        stop = min(start + self.BLOCK_ROWS, self.spec.num_rows)
+        size = stop - start
+
+        rng = np.random.default_rng([self.spec.seed, block_index])
+        keys = self._keys(np.arange(start + 1, stop + 1))
+
+        source_df = pd.DataFrame({'ID': keys})
+        for col, col_type in self.spec.column_types().items():
+            source_df[col] = self._values(rng, col_type, size)
+
+        target_df = source_df.copy()
+        target_df.columns = ['TGT_' + col for col in source_df.columns]
+
+        # Orphans: disjoint row positions dropped from one side only.
+        num_orphans = int(size * self.spec.orphan_rate)
+        positions = rng.permutation(size)
+        source_only = positions[:num_orphans]
+        target_only = positions[num_orphans:2 * num_orphans]
+        common = positions[2 * num_orphans:]
+
+        # Cell differences: one value column changed per selected common row.
+        num_diffs = int(len(common) * self.spec.diff_rate)
+        diff_rows = np.sort(common[:num_diffs])
+        column_types = list(self.spec.column_types().items())
+        diff_cols = rng.integers(0, len(column_types), size=num_diffs)
+        for col_index, (col, col_type) in enumerate(column_types):
+            rows = diff_rows[diff_cols == col_index]
+            if len(rows):
+                tgt_col = target_df.columns[col_index + 1]
+                target_df.loc[rows, tgt_col] = self._vary(target_df.loc[rows, tgt_col], col_type)
+
+        source_df = source_df.drop(index=target_only).reset_index(drop=True)
+        target_df = target_df.drop(index=source_only).reset_index(drop=True)
+        return source_df, target_df
+
+    def iter_blocks(self, first_block: int = 0, stop_block: int = None) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Yields the (source, target) DataFrames of the blocks [first_block, stop_block).
+
+        Args:
+            first_block (int): The first block to generate.
+            stop_block (int, optional): The block to stop at. Defaults to `num_blocks`.
+        """
+        stop_block = self.num_blocks if stop_block is None else min(stop_block, self.num_blocks)
+        for block_index in range(first_block, stop_block):
+            yield self.generate_block(block_index)
+
+    def generate(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Generates the whole dataset in memory.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: The source and target DataFrames.
+        """
+        blocks = list(self.iter_blocks())
+        source_df = pd.concat([source for source, _ in blocks], ignore_index=True)
+        target_df = pd.concat([target for _, target in blocks], ignore_index=True)
+        return source_df, target_df
+
+
+def _shard_blocks(num_blocks: int, num_shards: int, shard_index: int) -> Tuple[int, int]:
+    """Returns the contiguous block range [first, stop) assigned to a shard."""
+    per_shard, remainder = divmod(num_blocks, num_shards)
+    first = shard_index * per_shard + min(shard_index, remainder)
+    stop = first + per_shard + (1 if shard_index < remainder else 0)
+    return first, stop
+
+
+def _shard_file_names(shard_index: int, num_shards: int, extension: str) -> Tuple[str, str]:
+    suffix = f"-{shard_index:05d}" if num_shards > 1 else ""
+    return f"source{suffix}.{extension}", f"target{suffix}.{extension}"
+
+
+def write_shard(spec_values: Dict[str, Any], output_dir: str, formats: List[str],
+                shard_index: int = 0, num_shards: int = 1) -> List[str]:
+    """
+    Generates one shard of a dataset and streams it to every requested format.
+
+    The function takes the spec as a plain dictionary so it can run in a
+    worker process.
+
+    Args:
+        spec_values (Dict[str, Any]): The spec, as returned by `SyntheticDatasetSpec.to_dict`.
+        output_dir (str): Directory the shard files are written to.
+        formats (List[str]): Output formats (xlsx, csv, parquet, sqlite).
+        shard_index (int): Index of this shard.
+        num_shards (int): Total number of shards.
+
+    Returns:
+        List[str]: Paths of the written files.
+    """
+    # Imported here to keep the writers' optional dependencies out of module import.
+    from src.utils.dataset_writers import create_writer
+
+    generator = SyntheticDataGenerator(SyntheticDatasetSpec.from_dict(spec_values))
+    first_block, stop_block = _shard_blocks(generator.num_blocks, num_shards, shard_index)
+
+    writers = []
+    for extension in formats:
+        source_name, target_name = _shard_file_names(shard_index, num_shards, extension)
+        writers.append((create_writer(os.path.join(output_dir, source_name)),
+                        create_writer(os.path.join(output_dir, target_name))))
+    try:
+        for source_df, target_df in generator.iter_blocks(first_block, stop_block):
+            for source_writer, target_writer in writers:
+                source_writer.write(source_df)
+                target_writer.write(target_df)
+    finally:
+        for source_writer, target_writer in writers:
+            source_writer.close()
+            target_writer.close()
+
+    return [writer.path for pair in writers for writer in pair]
+
+
+def write_dataset(spec: SyntheticDatasetSpec, output_dir: str, formats: List[str] = ('xlsx',),
+                  num_shards: int = 1, max_workers: int = None) -> List[str]:
+    """
+    Generates a dataset and writes it to `output_dir` in every requested format.
+
+    With more than one shard, each shard is generated and written by its own
+    worker process into separately numbered files. The data is identical for
+    every shard count because generation is block-aligned.
+
+    Args:
+        spec (SyntheticDatasetSpec): The dataset description.
+        output_dir (str): Destination directory.
+        formats (List[str]): Output formats (xlsx, csv, parquet, sqlite).
+        num_shards (int): Number of shards, i.e. files per side and format.
+        max_workers (int, optional): Maximum worker processes. Defaults to the CPU count.
+
+    Returns:
+        List[str]: Paths of the written files.
+    """
+    num_shards = max(1, min(num_shards, SyntheticDataGenerator(spec).num_blocks))
+    os.makedirs(output_dir, exist_ok=True)
+    logger.info(f"Generating synthetic dataset '{spec.name}' as {list(formats)} in {num_shards} shard(s).")
+
+    if num_shards == 1:
+        paths = write_shard(spec.to_dict(), output_dir, list(formats))
+    else:
+        paths = []
+        with ProcessPoolExecutor(max_workers=max_workers, **LoggerSetup.worker_pool_kwargs()) as executor:
+            futures = [executor.submit(write_shard, spec.to_dict(), output_dir, list(formats), index, num_shards)
+                       for index in range(num_shards)]
+            for future in futures:
+                paths.extend(future.result())
+
+    logger.info(f"Synthetic dataset '{spec.name}' written to {output_dir}.")
+    return paths
+
+
+def write_dataset_to_excel(spec: SyntheticDatasetSpec, source_path: str, target_path: str,
+                           sheet_name: str = 'Sheet1'):
+    """
+    Generates a dataset pair and streams it to two Excel files in constant memory.
+
+    Args:
+        spec (SyntheticDatasetSpec): The dataset description.
+        source_path (str): Destination path of the source workbook.
+        target_path (str): Destination path of the target workbook.
+        sheet_name (str): The sheet name used in both workbooks.
+    """
+    from src.utils.dataset_writers import XlsxStreamWriter
+
+    logger.info(f"Generating synthetic dataset '{spec.name}'.")
+    with XlsxStreamWriter(source_path, sheet_name=sheet_name) as source_writer, \
+            XlsxStreamWriter(target_path, sheet_name=sheet_name) as target_writer:
+        for source_df, target_df in SyntheticDataGenerator(spec).iter_blocks():
+            source_writer.write(source_df)
+            target_writer.write(target_df)
+    logger.info(f"Synthetic dataset written to {source_path} and {target_path}.")
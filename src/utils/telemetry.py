@@ -0,0 +1,248 @@
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from src.utils.memory_monitor import MB, current_rss
+
+logger = logging.getLogger(__name__)
+
+# Fields of every stage record; any other field was passed to `Telemetry.stage`
+_RECORD_FIELDS = ('event', 'time', 'rss_mb', 'stage', 'unit', 'rows', 'expected_rows', 'elapsed_s', 'rows_per_s',
+                  'eta_s')
+
+
+def expect_rows(rows):
+    """
+    Adds `rows` to the number of rows the current stage of the active
+    `Telemetry`, if any, is expected to process; used for the ETA.
+    """
+    telemetry = Telemetry._active
+    if telemetry is not None:
+        telemetry.expect(rows)
+
+
+def report_progress(rows):
+    """
+    Reports `rows` more rows processed in the current stage of the active `Telemetry`, if any.
+
+    Readers, the comparer and the writers call this after every chunk, next
+    to `check_memory`; without an active `Telemetry` it does nothing.
+    """
+    telemetry = Telemetry._active
+    if telemetry is not None:
+        telemetry.advance(rows)
+
+
+def _format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class Telemetry:
+    """
+    Reports the live progress of the pipeline stages.
+
+    Code inside a `stage` reports the rows it processed with
+    `report_progress` (and, when it knows them in advance, the rows still to
+    come with `expect_rows`); stages that count something else, e.g.
+    fan-out pairs, name it as their `unit`. Every `interval` seconds a background thread
+    takes a snapshot of the current stage: rows processed, rows per second,
+    the estimated time remaining and the resident set size. Snapshots are
+    shown on a console progress line and appended as JSON lines to
+    `metrics_path`, which is flushed after every record so a dashboard can
+    tail it. Stage starts and ends are recorded as well, so stages without
+    row counts still show up with their elapsed time and memory.
+
+    `start`/`stop` nest, so a runner can start the telemetry around each
+    run while a caller keeps it running across several runs.
+    """
+    _active = None
+
+    def __init__(self, metrics_path: str = None, console: bool = True, interval: float = 1.0, stream=None):
+        """
+        Initializes the Telemetry.
+
+        Args:
+            metrics_path (str, optional): JSON Lines file the records are appended to.
+            console (bool): Whether to show a progress line on `stream`.
+            interval (float): Seconds between two snapshots.
+            stream (optional): Stream for the progress line. Defaults to stderr; on a
+                               terminal the line is redrawn in place.
+        """
+        self.metrics_path = metrics_path
+        self.console = console
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stderr
+        self._in_place = bool(getattr(self.stream, 'isatty', lambda: False)())
+        self._stage = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._metrics_file = None
+        self._previous = None
+        self._depth = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Starts the snapshots and makes this telemetry the one used by `report_progress`."""
+        self._depth += 1
+        if self._depth > 1:
+            return
+        self._previous, Telemetry._active = Telemetry._active, self
+        if self.metrics_path and self._metrics_file is None:
+            metrics_dir = os.path.dirname(self.metrics_path)
+            if metrics_dir:
+                os.makedirs(metrics_dir, exist_ok=True)
+            self._metrics_file = open(self.metrics_path, 'a', encoding='utf-8')
+            logger.info(f"Writing progress metrics to {self.metrics_path}")
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._tick, name='telemetry', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the snapshots and closes the metrics file once every `start` is matched by a `stop`."""
+        self._depth = max(self._depth - 1, 0)
+        if self._depth:
+            return
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if Telemetry._active is self:
+            Telemetry._active = self._previous
+        with self._lock:
+            if self._metrics_file is not None:
+                self._metrics_file.close()
+                self._metrics_file = None
+
+    def expect(self, rows):
+        """Adds `rows` to the expected rows of the current stage."""
+        with self._lock:
+            if self._stage is not None:
+                self._stage["expected"] += rows
+
+    def advance(self, rows):
+        """Adds `rows` to the processed rows of the current stage."""
+        with self._lock:
+            if self._stage is not None:
+                self._stage["rows"] += rows
+
+    def record(self, event: str, **fields):
+        """
+        Appends a record with other results of the run, e.g. column profiles, to the metrics file.
+
+        Args:
+            event (str): The record's event name.
+            **fields: The record's content; it must be JSON serializable.
+        """
+        record = {"event": event, "time": datetime.now().isoformat(timespec='milliseconds')}
+        record.update(fields)
+        self._write(record)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, unit: str = 'rows', **fields):
+        """
+        Tracks the code run inside the context as the stage `name`.
+
+        Args:
+            name (str): The stage name.
+            unit (str): What the stage counts with `report_progress`.
+            **fields: Extra fields for every record of the stage, e.g. the scenario.
+        """
+        with self._lock:
+            previous = self._stage
+            self._stage = {"stage": name, "unit": unit, "fields": fields, "rows": 0, "expected": 0,
+                           "start": time.perf_counter()}
+        self._emit(self.snapshot('stage_start'))
+        try:
+            yield
+        finally:
+            record = self.snapshot('stage_end')
+            with self._lock:
+                self._stage = previous
+            self._emit(record)
+
+    def snapshot(self, event: str = 'progress') -> dict:
+        """
+        Returns the state of the current stage.
+
+        Returns:
+            dict: The event, time, stage, unit and extra fields, rows processed and expected,
+                  elapsed seconds, rows per second, estimated seconds remaining (None when
+                  unknown) and the resident set size in MB.
+        """
+        with self._lock:
+            stage = dict(self._stage) if self._stage is not None else None
+        rss = current_rss()
+        record = {"event": event, "time": datetime.now().isoformat(timespec='milliseconds'),
+                  "rss_mb": round(rss / MB, 1) if rss is not None else None}
+        if stage is None:
+            return record
+        elapsed = time.perf_counter() - stage["start"]
+        rows = int(stage["rows"])
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        remaining = stage["expected"] - stage["rows"]
+        eta = remaining / rate if rate > 0 and stage["expected"] else None
+        record.update(stage["fields"])
+        record.update(stage=stage["stage"], unit=stage["unit"], rows=rows, expected_rows=int(stage["expected"]) or None,
+                      elapsed_s=round(elapsed, 3), rows_per_s=round(rate, 1),
+                      eta_s=round(max(eta, 0.0), 1) if eta is not None else None)
+        return record
+
+    def _tick(self):
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                active = self._stage is not None
+            if active:
+                self._emit(self.snapshot())
+
+    def _write(self, record):
+        with self._lock:
+            if self._metrics_file is not None:
+                self._metrics_file.write(json.dumps(record, default=str) + '\n')
+                self._metrics_file.flush()
+
+    def _emit(self, record):
+        self._write(record)
+        if self.console and "stage" in record:
+            self._show(record)
+
+    def _show(self, record):
+        label = ' '.join(str(record[field]) for field in record if field not in _RECORD_FIELDS)
+        parts = [f"[{label + ' ' if label else ''}{record['stage']}]"]
+        unit = record["unit"]
+        if record["expected_rows"]:
+            parts.append(f"{record['rows']:,}/{record['expected_rows']:,} {unit}")
+        else:
+            parts.append(f"{record['rows']:,} {unit}")
+        parts.append(f"{record['rows_per_s']:,.{0 if unit == 'rows' else 2}f} {unit}/s")
+        if record["eta_s"] is not None and record["event"] == 'progress':
+            parts.append(f"ETA {_format_seconds(record['eta_s'])}")
+        parts.append(f"elapsed {_format_seconds(record['elapsed_s'])}")
+        if record["rss_mb"] is not None:
+            parts.append(f"RSS {record['rss_mb']:,.0f} MB")
+        line = '  '.join(parts)
+        if record["event"] == 'stage_end':
+            line += '  done'
+        try:
+            if self._in_place:
+                self.stream.write('\r\033[K' + line + ('\n' if record["event"] == 'stage_end' else ''))
+            else:
+                self.stream.write(line + '\n')
+            self.stream.flush()
+        except (OSError, ValueError):
+            # A closed console must not stop the comparison
+            self.console = False
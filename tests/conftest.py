@@ -0,0 +1,6 @@
+import sys
+import os
+
+# Add the repository root to sys.path
+# This allows the tests to import modules from the 'src' directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from src.utils.synthetic_data import SyntheticDatasetSpec, SyntheticDataGenerator
+from src.utils.benchmark_suite import BenchmarkSuite
+
+
+def test_generator_is_reproducible_and_honours_rates():
+    spec = SyntheticDatasetSpec(num_rows=1000, num_columns=4, diff_rate=0.1, orphan_rate=0.05, seed=7)
+    source_df, target_df = SyntheticDataGenerator(spec).generate()
+    source_again, target_again = SyntheticDataGenerator(spec).generate()
+
+    assert source_df.equals(source_again)
+    assert target_df.equals(target_again)
+    assert len(source_df) == len(target_df) == 950
+    assert len(set(source_df['ID']) - set(target_df['TGT_ID'])) == 50
+
+
+def test_generator_string_keys():
+    spec = SyntheticDatasetSpec(num_rows=10, key_type='str')
+    source_df, _ = SyntheticDataGenerator(spec).generate()
+    assert source_df['ID'].iloc[0].startswith('K')
+
+
+def test_spec_rejects_unknown_key_type():
+    with pytest.raises(ValueError):
+        SyntheticDatasetSpec(key_type='uuid')
+
+
+def test_benchmark_suite_times_every_stage(tmp_path):
+    suite = BenchmarkSuite(str(tmp_path / 'work'), str(tmp_path / 'baseline.json'), diff_workers=2)
+    results = suite.run([SyntheticDatasetSpec(num_rows=50, num_columns=2)])
+
+    case = next(iter(results['cases'].values()))
+    assert set(case['stages']) == set(BenchmarkSuite.STAGES)
+    assert case['diff_speedup'] > 0
+    assert 'diff x' in BenchmarkSuite.format_results(results)
+
+    suite.save_baseline(results)
+    assert json.loads((tmp_path / 'baseline.json').read_text())['cases'].keys() == results['cases'].keys()
+
+
+def test_profiled_cases_are_stored_separately(tmp_path):
+    spec = SyntheticDatasetSpec(num_rows=50, num_columns=2)
+
+    assert BenchmarkSuite(str(tmp_path), str(tmp_path / 'b.json'), backend='arrow',
+                          profile_columns=True).case_name(spec) == f"{spec.name}_arrow_profiled"
+
+
+def test_find_regressions_uses_threshold_and_noise_floor(tmp_path):
+    suite = BenchmarkSuite(str(tmp_path), str(tmp_path / 'baseline.json'), threshold=0.2, min_seconds=0.05)
+    baseline = {"cases": {"case": {"stages": {"load": 1.0, "compare": 0.01}}}}
+    results = {"cases": {"case": {"stages": {"load": 1.5, "compare": 0.03}}}}
+
+    regressions = suite.find_regressions(results, baseline)
+
+    assert [(r['case'], r['stage']) for r in regressions] == [('case', 'load')]
@@ -0,0 +1,125 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils.checkpoint_store import CheckpointStore
+from src.utils.data_sources import CsvDataSource
+from src.utils.database_config import DatabaseConfig
+from src.utils.fan_out_comparer import FanOutComparer
+from src.utils.parallel_diff import ParallelDiff
+from src.utils.scenario_runner import ScenarioRunner
+from src.utils.synthetic_data import SyntheticDatasetSpec, SyntheticDataGenerator
+
+
+def test_checkpoints_are_only_read_when_resuming(tmp_path):
+    CheckpointStore(str(tmp_path)).put(('loaded', 'a', 1), {'value': 1})
+
+    assert CheckpointStore(str(tmp_path)).get(('loaded', 'a', 1)) is None
+    store = CheckpointStore(str(tmp_path), resume=True)
+    assert store.get(('loaded', 'a', 1)) == {'value': 1}
+    assert store.get(('loaded', 'a', 2)) is None
+    assert os.listdir(tmp_path / 'loaded')[0].endswith('.pkl')
+
+    (tmp_path / 'loaded' / os.listdir(tmp_path / 'loaded')[0]).write_bytes(b'truncated')
+    assert store.get(('loaded', 'a', 1)) is None
+
+
+@pytest.fixture
+def config_reader(tmp_path):
+    pd.DataFrame({'ID': [1, 2, 3], 'NAME': ['a', 'b', 'c']}).to_csv(tmp_path / 'src.csv', index=False)
+    pd.DataFrame({'ID': [1, 2, 4], 'NAME': ['a', 'x', 'd']}).to_csv(tmp_path / 'tgt.csv', index=False)
+    path = tmp_path / 'config.ini'
+    path.write_text(
+        "[DATA_SCENARIOS_TO_EXECUTE]\n"
+        "SCENARIO_1=CSV_TO_CSV\n\n"
+        "[CSV_TO_CSV]\n"
+        f"SOURCE_FILE_PATH={tmp_path / 'src.csv'}\n"
+        f"TARGET_FILE_PATH={tmp_path / 'tgt.csv'}\n"
+        "COLUMN_MAPPING=CSV_MAPPING\n"
+        "DIFF_OUTPUT_FORMATS=jsonl\n\n"
+        "[CSV_MAPPING]\n"
+        'ID = { "target": "ID", "is_key": true }\n'
+        'NAME = { "target": "NAME" }\n'
+    )
+    return DatabaseConfig(str(path))
+
+
+def test_resumed_run_skips_finished_scenarios(config_reader, tmp_path):
+    def run(resume):
+        checkpoints = CheckpointStore(str(tmp_path / 'work'), resume=resume)
+        runner = ScenarioRunner(config_reader, output_dir=str(tmp_path / 'out'), checkpoints=checkpoints)
+        return runner.run('CSV_TO_CSV'), checkpoints
+
+    first, _ = run(resume=False)
+    resumed, checkpoints = run(resume=True)
+    assert first["status"] == "ok" and not first.get("resumed")
+    assert resumed["resumed"] and resumed["report"] == first["report"]
+    assert checkpoints.hits == 1
+
+    # A changed target reruns the scenario, reusing only the loaded source
+    pd.DataFrame({'ID': [1], 'NAME': ['z']}).to_csv(tmp_path / 'tgt.csv', index=False)
+    rerun, checkpoints = run(resume=True)
+    assert rerun["status"] == "ok" and not rerun.get("resumed")
+    assert checkpoints.hits == 1
+    assert sorted(os.listdir(tmp_path / 'work')) == ['loaded', 'scenario', 'standardized']
+    assert sorted(name.split('.', 1)[1] for name in os.listdir(tmp_path / 'work' / 'standardized')) == \
+        ['pkl', 'pkl', 'source.arrow', 'source.arrow', 'target.arrow', 'target.arrow']
+
+
+@pytest.mark.parametrize("backend", ['pandas', 'arrow'])
+def test_resumed_scenario_does_not_parse_unchanged_inputs_again(config_reader, tmp_path, monkeypatch, backend):
+    def run():
+        checkpoints = CheckpointStore(str(tmp_path / 'work'), resume=True)
+        runner = ScenarioRunner(config_reader, output_dir=str(tmp_path / 'out'), backend=backend,
+                                checkpoints=checkpoints)
+        return runner.run('CSV_TO_CSV')
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("diff failed")
+
+    # The first run fails after standardizing, so the scenario itself is not finished
+    with monkeypatch.context() as patched:
+        patched.setattr(ParallelDiff, 'column_masks', fail)
+        assert run()["error"] == "diff failed"
+
+    parsed = []
+    monkeypatch.setattr(CsvDataSource, 'read', lambda self, columns=None: parsed.append(self.path) or fail())
+    monkeypatch.setattr(CsvDataSource, 'read_arrow', lambda self, columns=None: parsed.append(self.path) or fail())
+    resumed = run()
+    assert resumed["status"] == "ok" and parsed == []
+    with open(os.path.join(resumed["diff_dir"], 'summary.json')) as f:
+        summary = json.load(f)
+    assert (summary["common_rows"], summary["source_only_rows"], summary["target_only_rows"],
+            summary["mismatched_rows"]) == (2, 1, 1, 1)
+
+    # Only the changed side is parsed again
+    pd.DataFrame({'ID': [1], 'NAME': ['z']}).to_csv(tmp_path / 'tgt.csv', index=False)
+    assert run()["error"] == "diff failed" and parsed == [str(tmp_path / 'tgt.csv')]
+
+
+def test_resumed_fan_out_compares_only_changed_pairs(tmp_path):
+    mapping = {'ID': {"target": "TGT_ID", "is_key": True}, 'COL_1': {"target": "TGT_COL_1"}}
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'tgt').mkdir()
+    for month in ('202401', '202402'):
+        spec = SyntheticDatasetSpec(num_rows=20, num_columns=1, seed=int(month))
+        source_df, target_df = SyntheticDataGenerator(spec).generate()
+        source_df.to_csv(tmp_path / 'src' / f'{month}.csv', index=False)
+        target_df.to_csv(tmp_path / 'tgt' / f'{month}.csv', index=False)
+
+    def run(output_dir):
+        checkpoints = CheckpointStore(str(tmp_path / 'work'), resume=True)
+        fan_out = FanOutComparer(mapping, str(tmp_path / output_dir), max_workers=1, checkpoints=checkpoints)
+        return fan_out.run(fan_out.pair_directories(str(tmp_path / 'src'), str(tmp_path / 'tgt'), pattern='*.csv')), \
+            checkpoints
+
+    first, _ = run('first')
+    target_df.head(5).to_csv(tmp_path / 'tgt' / '202402.csv', index=False)
+    second, checkpoints = run('second')
+
+    assert checkpoints.hits == 1
+    assert second[0] == first[0]
+    assert second[1]["counts"]["target_rows"] == 5
+    assert os.path.dirname(second[1]["report"]) == str(tmp_path / 'second')
@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.utils.column_profile import profile_differences, profile_series
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.data_sources import DataFrameSource
+from src.utils.database_config import DatabaseConfig
+from src.utils.scenario_runner import ScenarioRunner
+
+MAPPING = {
+    'ID': {'target': 'TGT_ID', 'is_key': True},
+    'QTY': {'target': 'TGT_QTY', 'type': 'int'},
+    'JOINED': {'target': 'TGT_JOINED', 'type': 'datetime', 'format': '%Y/%m/%d'},
+    'NOTE': {'target': None},
+}
+
+
+def _profiles(**kwargs):
+    source = pd.DataFrame({
+        'ID': [3, 1, 2, 5],
+        'QTY': ['1', 'x', None, '2.7'],
+        'JOINED': ['2020/01/02', 'bad', None, '2022/01/01'],
+        'NOTE': ['a', 'a', None, 'd'],
+    })
+    target = pd.DataFrame({
+        'TGT_ID': [1, 2, 3, 5],
+        'TGT_QTY': [1, 2, 3, 4],
+        'TGT_JOINED': pd.to_datetime(['2020-01-02', '2020-01-01', None, '2022-01-01']),
+    })
+    comparer = ConfigurableExcelComparer('src', 'tgt', MAPPING, source_reader=DataFrameSource(source),
+                                         target_reader=DataFrameSource(target), **kwargs)
+    comparer.compare()
+    return comparer.column_profiles
+
+
+def test_profiling_is_off_by_default():
+    assert _profiles() is None
+
+
+def test_standardize_profiles_both_sides():
+    profiles = _profiles(profile_columns=True)
+
+    assert profiles['source']['qty'] == {'rows': 4, 'nulls': 1, 'coerced': 1, 'distinct': 2,
+                                         'min': 1, 'max': 2, 'sum': 3}
+    assert profiles['target']['qty'] == {'rows': 4, 'nulls': 0, 'coerced': 0, 'distinct': 4,
+                                         'min': 1, 'max': 4, 'sum': 10}
+    assert profiles['source']['joined'] == {'rows': 4, 'nulls': 1, 'coerced': 1, 'distinct': 2,
+                                            'min': '2020-01-02T00:00:00', 'max': '2022-01-01T00:00:00',
+                                            'sum': None}
+    assert profiles['source']['note'] == {'rows': 4, 'nulls': 1, 'coerced': 0, 'distinct': 2,
+                                          'min': None, 'max': None, 'sum': None}
+    assert 'note' not in profiles['target']
+
+    assert profile_differences(profiles) == {
+        'qty': ['nulls', 'coerced', 'distinct', 'max', 'sum'],
+        'joined': ['coerced', 'distinct', 'min'],
+    }
+
+
+def test_float_sums_compare_with_tolerance():
+    values = pd.Series([0.1, 0.2, 0.3, np.nan])
+    source = profile_series(values, nulls=1)
+    target = profile_series(values[::-1].reset_index(drop=True), nulls=1)
+    target['sum'] += 1e-17
+
+    assert source['distinct'] == 3 and source['min'] == 0.1
+    assert profile_differences({'source': {'x': source}, 'target': {'x': target}}) == {}
+
+
+def test_profiles_reach_the_report_and_summary(tmp_path):
+    pd.DataFrame({'ID': [1, 2, 3], 'QTY': ['1', 'x', '3']}).to_csv(tmp_path / 'src.csv', index=False)
+    pd.DataFrame({'ID': [1, 2, 3], 'QTY': [1, 2, 3]}).to_csv(tmp_path / 'tgt.csv', index=False)
+    config = tmp_path / 'config.ini'
+    config.write_text(
+        "[DATA_SCENARIOS_TO_EXECUTE]\nSCENARIO_1=CSV_TO_CSV\n\n"
+        "[CSV_TO_CSV]\n"
+        f"SOURCE_FILE_PATH={tmp_path / 'src.csv'}\n"
+        f"TARGET_FILE_PATH={tmp_path / 'tgt.csv'}\n"
+        "COLUMN_MAPPING=CSV_MAPPING\n"
+        "DIFF_OUTPUT_FORMATS=jsonl\n"
+        "PROFILE_COLUMNS=true\n\n"
+        "[CSV_MAPPING]\n"
+        'ID = { "target": "ID", "is_key": true }\n'
+        'QTY = { "target": "QTY", "type": "int" }\n'
+    )
+
+    result = ScenarioRunner(DatabaseConfig(str(config)), output_dir=str(tmp_path / 'out')).run('CSV_TO_CSV')
+
+    assert result["status"] == "ok", result["error"]
+    with open(f"{result['diff_dir']}/summary.json", encoding='utf-8') as f:
+        summary = json.load(f)
+    assert summary["column_profiles"]["source"]["qty"]["coerced"] == 1
+    assert summary["profile_differences"] == {'qty': ['coerced', 'distinct', 'sum']}
+    with open(result["report"], encoding='utf-8') as f:
+        html = f.read()
+    assert 'Columns with differing aggregates:</strong> 1' in html
+    assert '<td class="highlight">1 / 0</td>' in html
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.column_profile import profile_differences
+from src.utils.comparison_backends import available_backends, get_backend
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.data_sources import DataFrameSource
+from src.utils.synthetic_data import SyntheticDatasetSpec, write_dataset
+
+COLUMNAR_BACKENDS = [name for name in ('arrow', 'polars') if name in available_backends()]
+
+MAPPING = {
+    'ID': {'target': 'TGT_ID', 'is_key': True},
+    'QTY': {'target': 'TGT_QTY', 'type': 'int'},
+    'PRICE': {'target': 'TGT_PRICE', 'type': 'int'},
+    'JOINED': {'target': 'TGT_JOINED', 'type': 'datetime', 'format': '%Y/%m/%d'},
+    'ACTIVE': {'target': 'TGT_ACTIVE'},
+    'NOTE': {'target': None},
+}
+
+
+def _compare(backend, **kwargs):
+    comparer = ConfigurableExcelComparer(backend=backend, profile_columns=True, **kwargs)
+    comparison_df = comparer.compare()
+    return comparison_df, comparer.source_df, comparer.target_df, comparer.key_column, comparer.column_profiles
+
+
+def _assert_same_as_pandas(backend, **kwargs):
+    expected = _compare('pandas', **kwargs)
+    actual = _compare(backend, **kwargs)
+    for expected_part, actual_part in zip(expected[:3], actual[:3]):
+        pd.testing.assert_frame_equal(actual_part, expected_part)
+    assert actual[3] == expected[3]
+    for side in ('source', 'target'):
+        # Float sums may round differently between engines; profile_differences allows for that
+        assert list(actual[4][side]) == list(expected[4][side])
+        assert profile_differences({'source': expected[4][side], 'target': actual[4][side]}) == {}
+
+
+@pytest.mark.parametrize("backend", COLUMNAR_BACKENDS)
+@pytest.mark.parametrize("key_type", SyntheticDatasetSpec.KEY_TYPES)
+@pytest.mark.parametrize("file_format", ['csv', 'parquet'])
+def test_backend_matches_pandas_on_files(tmp_path, backend, key_type, file_format):
+    spec = SyntheticDatasetSpec(num_rows=2000, num_columns=5, key_type=key_type)
+    write_dataset(spec, str(tmp_path), formats=(file_format,))
+
+    _assert_same_as_pandas(
+        backend,
+        source_path=str(tmp_path / f'source.{file_format}'),
+        target_path=str(tmp_path / f'target.{file_format}'),
+        column_mapping=spec.column_mapping()
+    )
+
+
+@pytest.mark.parametrize("backend", COLUMNAR_BACKENDS)
+def test_backend_matches_pandas_on_conversions_and_duplicates(backend):
+    source = pd.DataFrame({
+        'ID': [3, 1, 2, 2, 5],
+        'QTY': ['1', 'x', None, '4', '2.7'],
+        'PRICE': [1.5, np.nan, -2.7, 3.0, 4.0],
+        'JOINED': ['2020/01/02', 'bad', None, '2021/03/04', '2022/01/01'],
+        'ACTIVE': [True, False, True, True, False],
+        'NOTE': ['a', 'b', None, 'd', 'e'],
+    })
+    target = pd.DataFrame({
+        'TGT_ID': [1, 2, 4, 2],
+        'TGT_QTY': [1, 2, 3, 4],
+        'TGT_PRICE': [1, None, 3, 3],
+        'TGT_JOINED': pd.to_datetime(['2020-01-02', '2020-01-01', None, '2021-03-04']),
+        'TGT_ACTIVE': [True, None, False, True],
+    })
+
+    _assert_same_as_pandas(
+        backend,
+        source_path='src', target_path='tgt', column_mapping=MAPPING,
+        source_reader=DataFrameSource(source.copy()), target_reader=DataFrameSource(target.copy())
+    )
+
+
+@pytest.mark.parametrize("backend", COLUMNAR_BACKENDS)
+def test_backend_matches_pandas_on_null_keys(backend):
+    source = pd.DataFrame({'ID': ['b', None, 'a', None], 'NOTE': ['1', '2', '3', '4']})
+    target = pd.DataFrame({'TGT_ID': [None, 'a', 'c'], 'TGT_NOTE': ['2', '3', '5']})
+    mapping = {'ID': {'target': 'TGT_ID', 'is_key': True}, 'NOTE': {'target': 'TGT_NOTE'}}
+
+    _assert_same_as_pandas(
+        backend,
+        source_path='src', target_path='tgt', column_mapping=mapping,
+        source_reader=DataFrameSource(source), target_reader=DataFrameSource(target)
+    )
+    comparison_df = _compare(backend, source_path='src', target_path='tgt', column_mapping=mapping,
+                             source_reader=DataFrameSource(source), target_reader=DataFrameSource(target))[0]
+    assert comparison_df['_merge'].tolist() == ['both', 'left_only', 'right_only', 'both', 'both']
+
+
+def test_pandas_frames_round_trip_through_arrow():
+    backend = get_backend('pandas')
+    frame = pd.DataFrame({
+        'id': [1, 2, 3],
+        'flag': pd.Series([True, np.nan, False], dtype=object),
+        'count': pd.Series([1, 2, np.nan], dtype=object),
+        'name': ['a', None, 'c'],
+        'joined': pd.to_datetime(['2020-01-02', None, '2021-03-04']),
+    })
+
+    restored = backend.from_arrow(backend.to_arrow(frame))
+    pd.testing.assert_frame_equal(restored, frame)
+    assert [type(value) for value in restored['count'][:2]] == [int, int]
+
+
+def test_get_backend():
+    assert get_backend().name == 'pandas'
+    assert get_backend('Arrow').name == 'arrow'
+    backend = get_backend('pandas')
+    assert get_backend(backend) is backend
+    with pytest.raises(ValueError, match="Unknown comparison backend"):
+        get_backend('spark')
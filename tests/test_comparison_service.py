@@ -0,0 +1,156 @@
+import json
+import http.client
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from src.utils.comparison_service import ComparisonService, JobError, TOKEN_HEADER
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.database_config import DatabaseConfig
+from src.utils.dataset_cache import DatasetCache
+
+MAPPING = {
+    'ID': {'target': 'ID', 'is_key': True},
+    'NAME': {'target': 'FULL_NAME'},
+    'AGE': {'target': 'AGE', 'type': 'int'},
+}
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    pd.DataFrame({'ID': [1, 2, 3], 'NAME': ['a', 'b', 'c'], 'AGE': [30, 40, 50]}).to_csv(
+        tmp_path / 'src.csv', index=False)
+    pd.DataFrame({'ID': [1, 2, 4], 'FULL_NAME': ['a', 'x', 'd'], 'AGE': [30, 40, 60]}).to_csv(
+        tmp_path / 'tgt.csv', index=False)
+    pd.DataFrame({'ID': [1, 2, 3], 'FULL_NAME': ['a', 'b', 'c'], 'AGE': [30, 41, 50]}).to_csv(
+        tmp_path / 'tgt2.csv', index=False)
+    return tmp_path
+
+
+def test_cache_evicts_least_recently_used():
+    cache = DatasetCache(max_mb=3 / 1024 / 1024)
+    cache.put('a', 1, 1)
+    cache.put('b', 2, 1)
+    assert cache.get('a') == 1
+    cache.put('c', 3, 2)
+    cache.put('huge', 4, 10)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.get('huge') is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_mb"] == round(3 / 1024 / 1024, 1)
+
+
+def test_comparer_reuses_cached_sides(inputs):
+    cache = DatasetCache()
+
+    def compare(target='tgt.csv', mapping=MAPPING):
+        return ConfigurableExcelComparer(str(inputs / 'src.csv'), str(inputs / target), mapping,
+                                         cache=cache).compare()
+
+    first = compare()
+    hits = cache.hits
+    pd.testing.assert_frame_equal(compare(), first)
+    assert cache.hits == hits + 1
+
+    # A different target reuses the loaded source side only
+    compare('tgt2.csv')
+    assert cache.stats()["entries"] == 5
+
+    # Rewriting a file changes its fingerprint
+    pd.DataFrame({'ID': [1], 'FULL_NAME': ['z'], 'AGE': [1]}).to_csv(inputs / 'tgt.csv', index=False)
+    os.utime(inputs / 'tgt.csv', ns=(0, 0))
+    assert len(compare()) == 3
+
+
+@pytest.fixture
+def service(inputs):
+    config = inputs / 'config.ini'
+    config.write_text(
+        "[DATA_SCENARIOS_TO_EXECUTE]\n"
+        "SCENARIO_1=CSV_TO_CSV\n\n"
+        "[CSV_TO_CSV]\n"
+        f"SOURCE_FILE_PATH={inputs / 'src.csv'}\n"
+        f"TARGET_FILE_PATH={inputs / 'tgt.csv'}\n"
+        "COLUMN_MAPPING=CSV_MAPPING\n"
+        "DIFF_OUTPUT_FORMATS=jsonl\n\n"
+        "[CSV_MAPPING]\n"
+        'ID = { "target": "ID", "is_key": true }\n'
+        'NAME = { "target": "FULL_NAME" }\n'
+        'AGE = { "target": "AGE", "type": "int" }\n'
+    )
+    return ComparisonService(DatabaseConfig(str(config)), output_dir=str(inputs / 'out'), token='secret',
+                             allowed_roots=[str(inputs)])
+
+
+def test_submit_applies_job_overrides(service, inputs):
+    first = service.submit({"scenario": "CSV_TO_CSV"})
+    second = service.submit({"scenario": "CSV_TO_CSV", "target": str(inputs / 'tgt2.csv'),
+                             "mapping": dict(MAPPING, AGE={'target': 'AGE'})})
+
+    assert first["status"] == second["status"] == "ok"
+    with open(os.path.join(second["diff_dir"], 'summary.json')) as f:
+        summary = json.load(f)
+    assert summary["cell_diffs_by_column"] == {'name': 0, 'age': 1}
+    assert second["cache"]["hits"] == 1
+    with pytest.raises(JobError):
+        service.submit({"scenario": "MISSING"})
+    with pytest.raises(JobError):
+        service.submit({"scenario": "CSV_TO_CSV", "sheet": "x"})
+    with pytest.raises(JobError, match='outside the allowed roots'):
+        service.submit({"scenario": "CSV_TO_CSV", "source": str(inputs / '..' / 'src.csv')})
+
+
+def test_http_endpoints(service):
+    server = service.make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def request(path, payload=None, token='secret', content_type='application/json'):
+        headers = {TOKEN_HEADER: token, 'Content-Type': content_type}
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        with urllib.request.urlopen(urllib.request.Request(base + path, data=data, headers=headers)) as response:
+            return json.load(response)
+
+    def error_code(*args, **kwargs):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            request(*args, **kwargs)
+        return error.value.code
+
+    try:
+        assert request('/compare', {"scenario": "CSV_TO_CSV"})["status"] == "ok"
+        result = request('/compare', {"scenario": "CSV_TO_CSV"})
+        assert result["cache"]["hits"] >= 1
+        assert request('/status')["jobs_run"] == 2
+        assert error_code('/compare', {"scenario": "MISSING"}) == 400
+        assert error_code('/compare', {"scenario": "CSV_TO_CSV"}, token='wrong') == 401
+        assert error_code('/status', token='') == 401
+        assert error_code('/compare', {"scenario": "CSV_TO_CSV"}, content_type='text/plain') == 415
+        assert request('/cache/clear', {})["cache"]["entries"] == 0
+        for length in ('-1', 'abc'):
+            connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+            connection.putrequest('POST', '/compare')
+            connection.putheader(TOKEN_HEADER, 'secret')
+            connection.putheader('Content-Type', 'application/json')
+            connection.putheader('Content-Length', length)
+            connection.endheaders()
+            assert connection.getresponse().status == 400
+            connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_refuses_remote_interfaces_unless_allowed(service):
+    with pytest.raises(ValueError, match='other machines'):
+        service.make_server('0.0.0.0', port=0)
+
+    server = service.make_server('0.0.0.0', port=0, allow_remote=True)
+    server.server_close()
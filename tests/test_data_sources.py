@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from src.utils.data_sources import create_data_source, CsvDataSource, DataFrameSource, ExcelDataSource, \
+    ParquetDataSource
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.synthetic_data import SyntheticDatasetSpec, write_dataset
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    spec = SyntheticDatasetSpec(num_rows=300, num_columns=4, seed=11)
+    write_dataset(spec, str(tmp_path), formats=['xlsx', 'csv', 'parquet'])
+    return tmp_path, spec
+
+
+def test_create_data_source_dispatches_on_extension():
+    assert isinstance(create_data_source('a.xlsx'), ExcelDataSource)
+    assert isinstance(create_data_source('a.CSV'), CsvDataSource)
+    assert isinstance(create_data_source('a.parquet'), ParquetDataSource)
+    with pytest.raises(ValueError):
+        create_data_source('a.json')
+
+
+@pytest.mark.parametrize('extension', ['xlsx', 'csv', 'parquet'])
+def test_read_projects_columns_case_insensitively(dataset_dir, extension):
+    tmp_path, _ = dataset_dir
+    source = create_data_source(str(tmp_path / f'source.{extension}'))
+
+    df = source.read(columns=['id', 'col_2'])
+
+    assert list(df.columns) == ['ID', 'COL_2']
+    assert len(df) == 285
+    assert source.column_names() == ['ID', 'COL_1', 'COL_2', 'COL_3', 'COL_4']
+
+
+@pytest.mark.parametrize('extension', ['csv', 'parquet'])
+def test_iter_batches_streams_all_rows(dataset_dir, extension):
+    tmp_path, _ = dataset_dir
+    batches = list(create_data_source(str(tmp_path / f'target.{extension}')).iter_batches(batch_rows=100))
+
+    assert sum(len(batch) for batch in batches) == 285
+
+
+def test_comparer_results_match_across_formats(dataset_dir):
+    tmp_path, spec = dataset_dir
+    results = {}
+    for extension in ('xlsx', 'csv', 'parquet'):
+        comparer = ConfigurableExcelComparer(
+            source_path=str(tmp_path / f'source.{extension}'),
+            target_path=str(tmp_path / f'target.{extension}'),
+            column_mapping=spec.column_mapping()
+        )
+        comparison_df = comparer.compare()
+        results[extension] = comparison_df['_merge'].value_counts().to_dict()
+
+    assert results['xlsx'] == results['csv'] == results['parquet']
+    assert results['csv']['left_only'] == 15
+
+
+def test_comparer_parses_each_workbook_once(dataset_dir, monkeypatch):
+    tmp_path, spec = dataset_dir
+    from src.utils import data_sources
+    calls = []
+    read_excel = data_sources.pd.read_excel
+    monkeypatch.setattr(data_sources.pd, 'read_excel', lambda *args, **kwargs: calls.append(args[0]) or read_excel(*args, **kwargs))
+    column_mapping = spec.column_mapping()
+    del column_mapping['COL_3']
+    comparer = ConfigurableExcelComparer(
+        source_path=str(tmp_path / 'source.xlsx'),
+        target_path=str(tmp_path / 'target.xlsx'),
+        column_mapping=column_mapping
+    )
+
+    comparer.compare()
+
+    assert sorted(calls) == [str(tmp_path / 'source.xlsx'), str(tmp_path / 'target.xlsx')]
+    assert comparer.source_unmapped_cols == ['col_3']
+
+
+def test_read_arrow_converts_mixed_columns_to_strings():
+    pytest.importorskip('pyarrow')
+    df = pd.DataFrame({'ID': [1, 2, 3], 'CODE': pd.Series([7, 'x', None], dtype=object)})
+
+    table = DataFrameSource(df).read_arrow()
+
+    assert table.column('ID').to_pylist() == [1, 2, 3]
+    assert table.column('CODE').to_pylist() == ['7', 'x', None]
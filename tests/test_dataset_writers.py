@@ -0,0 +1,49 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.utils.synthetic_data import SyntheticDatasetSpec, SyntheticDataGenerator, write_dataset, write_shard
+from src.utils.dataset_writers import create_writer, write_excel_streaming
+
+
+def test_write_dataset_emits_identical_rows_in_every_format(tmp_path):
+    spec = SyntheticDatasetSpec(num_rows=200, num_columns=4, seed=3)
+    write_dataset(spec, str(tmp_path), formats=['xlsx', 'csv', 'parquet', 'sqlite'])
+    expected, _ = SyntheticDataGenerator(spec).generate()
+
+    from_xlsx = pd.read_excel(tmp_path / 'source.xlsx')
+    from_csv = pd.read_csv(tmp_path / 'source.csv')
+    from_parquet = pd.read_parquet(tmp_path / 'source.parquet')
+    with sqlite3.connect(tmp_path / 'source.sqlite') as connection:
+        from_sqlite = pd.read_sql('SELECT * FROM data', connection)
+
+    for loaded in (from_xlsx, from_csv, from_parquet, from_sqlite):
+        assert list(loaded.columns) == list(expected.columns)
+        assert loaded['ID'].tolist() == expected['ID'].tolist()
+        assert loaded['COL_2'].tolist() == expected['COL_2'].tolist()
+
+
+def test_shards_partition_the_same_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(SyntheticDataGenerator, 'BLOCK_ROWS', 50)
+    spec = SyntheticDatasetSpec(num_rows=200, num_columns=2)
+    for shard_index in range(3):
+        write_shard(spec.to_dict(), str(tmp_path), ['csv'], shard_index, 3)
+
+    shards = pd.concat([pd.read_csv(tmp_path / f'target-{i:05d}.csv') for i in range(3)], ignore_index=True)
+    _, expected = SyntheticDataGenerator(spec).generate()
+    assert shards['TGT_ID'].tolist() == expected['TGT_ID'].tolist()
+
+
+def test_write_excel_streaming_handles_missing_values(tmp_path):
+    df = pd.DataFrame({'A': [None, 1.0], 'B': [None, 'x'], 'C': [pd.NaT, pd.Timestamp('2024-01-01')]})
+    write_excel_streaming(df, str(tmp_path / 'out.xlsx'))
+
+    loaded = pd.read_excel(tmp_path / 'out.xlsx')
+    assert loaded['A'].tolist()[1] == 1.0
+    assert loaded.isna().sum().tolist() == [1, 1, 1]
+
+
+def test_create_writer_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        create_writer(str(tmp_path / 'out.json'))
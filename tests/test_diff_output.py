@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.diff_output import DiffOutputWriter, mismatch_mask
+from src.utils.html_report import HtmlReport
+from src.utils.synthetic_data import SyntheticDatasetSpec, write_dataset
+
+
+def test_mismatch_mask_treats_missing_pairs_as_equal():
+    src = pd.Series([1.0, np.nan, np.nan, 4.0])
+    tgt = pd.Series([1.0, np.nan, 3.0, 5.0])
+    assert mismatch_mask(src, tgt).tolist() == [False, False, True, True]
+
+
+def test_diff_output_streams_categories_and_summary(tmp_path):
+    spec = SyntheticDatasetSpec(num_rows=500, num_columns=4, diff_rate=0.1, orphan_rate=0.02, seed=5)
+    write_dataset(spec, str(tmp_path), formats=['csv'])
+    comparer = ConfigurableExcelComparer(str(tmp_path / 'source.csv'), str(tmp_path / 'target.csv'),
+                                         spec.column_mapping())
+    comparison_df = comparer.compare()
+
+    writer = DiffOutputWriter(str(tmp_path / 'diff'), chunk_rows=7)
+    summary = writer.write(comparison_df, comparer.key_column)
+
+    # Side-only rows are built one chunk at a time
+    chunks = writer._side_only_rows(comparison_df, comparer.key_column, 'left_only', 'source')
+    assert [len(chunk) for chunk in chunks] == [7, 3]
+
+    assert summary['source_only_rows'] == summary['target_only_rows'] == 10
+    assert summary['mismatched_rows'] == summary['cell_diffs'] == 48
+    assert json.loads((tmp_path / 'diff' / 'summary.json').read_text())['cell_diffs'] == 48
+
+    cell_diffs = pd.read_parquet(tmp_path / 'diff' / 'cell_diffs.parquet')
+    assert list(cell_diffs.columns) == ['id', 'column', 'source_value', 'target_value']
+    assert len(cell_diffs) == 48
+    source_only = pd.read_json(tmp_path / 'diff' / 'source_only.jsonl', lines=True)
+    assert list(source_only.columns) == ['id', 'col_1', 'col_2', 'col_3', 'col_4']
+    assert len(source_only) == 10
+
+    # The HTML report counts the same mismatches as the machine-readable output.
+    report = HtmlReport(comparison_df, comparer.source_df, comparer.target_df,
+                        'source.csv', 'target.csv', comparer.key_column)
+    assert report.get_summary_counts()['mismatched_rows'] == 48
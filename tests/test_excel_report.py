@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.data_sources import DataFrameSource
+from src.utils.database_config import DatabaseConfig
+from src.utils.excel_report import ExcelReport
+from src.utils.html_report import HtmlReport
+from src.utils.report_data import mismatch_flags, side_only_positions, side_only_rows
+from src.utils.scenario_runner import ScenarioRunner
+
+MAPPING = {
+    'ID': {'target': 'TGT_ID', 'is_key': True},
+    'NAME': {'target': 'TGT_NAME'},
+    'QTY': {'target': 'TGT_QTY', 'type': 'int'},
+    'JOINED': {'target': 'TGT_JOINED', 'type': 'datetime'},
+}
+
+
+@pytest.fixture
+def report():
+    source = pd.DataFrame({'ID': [1, 2, 3, 4, 5], 'NAME': ['a', 'b', 'C', 'd', 'e'], 'QTY': [1, 2, 3, 4, 5],
+                           'JOINED': ['2020-01-01', None, '2020-01-03', '2020-01-04', '2020-01-05']})
+    target = pd.DataFrame({'TGT_ID': [2, 3, 4, 5, 6], 'TGT_NAME': ['b', 'c', 'd', 'x', 'f'],
+                           'TGT_QTY': [2, 3, 40, 5, 6],
+                           'TGT_JOINED': [None, '2020-01-03', '2020-01-04', '2020-01-06', '2020-01-06']})
+    comparer = ConfigurableExcelComparer('src.xlsx', 'tgt.xlsx', MAPPING, source_reader=DataFrameSource(source),
+                                         target_reader=DataFrameSource(target))
+    comparison_df = comparer.compare()
+    return HtmlReport(comparison_df, comparer.source_df, comparer.target_df, 'src.xlsx', 'tgt.xlsx',
+                      comparer.key_column)
+
+
+def test_workbook_has_a_sheet_per_category(report, tmp_path):
+    path = tmp_path / 'report.xlsx'
+    excel_report = ExcelReport(report, chunk_rows=2)
+    excel_report.rows_per_sheet = 2
+
+    excel_report.generate_and_save_report(str(path))
+
+    workbook = load_workbook(path)
+    assert workbook.sheetnames == ['Summary', 'Source Only', 'Target Only', 'Mismatches', 'Mismatches (2)']
+    summary = {row[0]: row[1] for row in workbook['Summary'].iter_rows(values_only=True) if row[0]}
+    assert summary['Rows with differences'] == 3
+    assert summary['Matching rows'] == 1
+    assert list(workbook['Source Only'].values) == [('id', 'name', 'qty', 'joined'),
+                                                    (1, 'a', 1, pd.Timestamp('2020-01-01'))]
+    assert list(workbook['Target Only'].values)[1][:3] == (6, 'f', 6)
+
+    mismatches = list(workbook['Mismatches'].values) + list(workbook['Mismatches (2)'].values)[1:]
+    assert mismatches[0] == ('id', 'name_source', 'name_target', 'qty_source', 'qty_target',
+                             'joined_source', 'joined_target')
+    assert [row[:3] for row in mismatches[1:]] == [(3, 'C', 'c'), (4, 'd', 'd'), (5, 'e', 'x')]
+    rules = {str(rule.sqref): rule.rules[0].formula[0] for rule in workbook['Mismatches'].conditional_formatting}
+    assert rules == {'B2:C3': 'NOT(EXACT($B2,$C2))', 'D2:E3': 'NOT(EXACT($D2,$E2))',
+                     'F2:G3': 'NOT(EXACT($F2,$G2))'}
+
+
+def test_empty_categories_keep_their_sheets(report, tmp_path):
+    report.df = report.df[report.df['_merge'] == 'both']
+    report._mismatch_flags = None
+    path = tmp_path / 'report.xlsx'
+
+    ExcelReport(report).generate_and_save_report(str(path))
+
+    workbook = load_workbook(path)
+    assert workbook.sheetnames == ['Summary', 'Source Only', 'Target Only', 'Mismatches']
+    assert list(workbook['Source Only'].values) == [('id', 'name', 'qty', 'joined')]
+
+
+def test_report_data_chunks_match_the_html_report(report):
+    positions = side_only_positions(report.df, 'right_only')
+
+    chunk = side_only_rows(report.df, report.key, 'right_only', 'target', report.side_dtypes('target'), positions[:1])
+
+    assert chunk.to_dict('records') == report._get_side_only_rows('right_only', 'target').to_dict('records')
+    assert (mismatch_flags(report.df) == report.get_mismatch_flags()).all()
+
+
+def test_runner_writes_the_requested_report_formats(tmp_path):
+    pd.DataFrame({'ID': [1, 2], 'NAME': ['a', 'b']}).to_csv(tmp_path / 'src.csv', index=False)
+    pd.DataFrame({'ID': [1, 2], 'NAME': ['a', 'x']}).to_csv(tmp_path / 'tgt.csv', index=False)
+    config = tmp_path / 'config.ini'
+    config.write_text(
+        "[DATA_SCENARIOS_TO_EXECUTE]\nSCENARIO_1=CSV_TO_CSV\n\n"
+        "[CSV_TO_CSV]\n"
+        f"SOURCE_FILE_PATH={tmp_path / 'src.csv'}\n"
+        f"TARGET_FILE_PATH={tmp_path / 'tgt.csv'}\n"
+        "COLUMN_MAPPING=CSV_MAPPING\n"
+        "DIFF_OUTPUT_FORMATS=\n"
+        "REPORT_FORMATS=html,xlsx\n\n"
+        "[CSV_MAPPING]\n"
+        'ID = { "target": "ID", "is_key": true }\n'
+        'NAME = { "target": "NAME" }\n'
+    )
+
+    result = ScenarioRunner(DatabaseConfig(str(config)), output_dir=str(tmp_path / 'out')).run('CSV_TO_CSV')
+
+    assert result["status"] == "ok", result["error"]
+    assert [os.path.splitext(path)[1] for path in result["reports"]] == ['.html', '.xlsx']
+    assert result["report"] == result["reports"][0]
+    assert all(os.path.exists(path) for path in result["reports"])
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from src.utils import fan_out_comparer
+from src.utils.data_sources import DataFrameSource
+from src.utils.fan_out_comparer import FanOutComparer
+from src.utils.synthetic_data import SyntheticDatasetSpec, SyntheticDataGenerator
+
+MAPPING = {
+    'ID': {"target": "TGT_ID", "is_key": True},
+    'COL_1': {"target": "TGT_COL_1", "type": "int"},
+    'COL_2': {"target": "TGT_COL_2"},
+}
+
+
+def _frames(seed, orphan_rate=0.1):
+    spec = SyntheticDatasetSpec(num_rows=40, num_columns=2, orphan_rate=orphan_rate, seed=seed)
+    return SyntheticDataGenerator(spec).generate()
+
+
+def test_pair_sheets_compares_every_common_sheet(tmp_path, monkeypatch):
+    source_path, target_path = tmp_path / 'src.xlsx', tmp_path / 'tgt.xlsx'
+    with pd.ExcelWriter(source_path) as source_book, pd.ExcelWriter(target_path) as target_book:
+        for sheet, orphan_rate in (('Jan', 0.0), ('Feb', 0.1)):
+            source_df, target_df = _frames(seed=len(sheet), orphan_rate=orphan_rate)
+            source_df.to_excel(source_book, sheet_name=sheet, index=False)
+            target_df.to_excel(target_book, sheet_name=sheet, index=False)
+        source_df.to_excel(source_book, sheet_name='SourceOnly', index=False)
+
+    opened = []
+
+    class CountingExcelFile(pd.ExcelFile):
+        def __init__(self, path, *args, **kwargs):
+            opened.append(path)
+            super().__init__(path, *args, **kwargs)
+
+    monkeypatch.setattr(fan_out_comparer.pd, 'ExcelFile', CountingExcelFile)
+    fan_out = FanOutComparer(MAPPING, str(tmp_path / 'out'), max_workers=2)
+    pairs = fan_out.pair_sheets(str(source_path), str(target_path))
+    # Each workbook is parsed once; the workers get the parsed sheets
+    assert opened == [str(source_path), str(target_path)]
+    assert all(isinstance(pair.source, DataFrameSource) for pair in pairs[:2])
+    assert [pair.source.path for pair in pairs[:2]] == [f"{source_path} [Jan]", f"{source_path} [Feb]"]
+    results = fan_out.run(pairs)
+
+    assert [(result['name'], result['status']) for result in results] == [
+        ('Jan', 'identical'), ('Feb', 'different'), ('SourceOnly', 'error')]
+    assert results[1]['counts']['source_only_rows'] == 4
+    index_html = (tmp_path / 'out' / 'index.html').read_text()
+    assert '001_Feb.html' in index_html
+
+
+def test_pair_directories_matches_files_by_regex(tmp_path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'tgt').mkdir()
+    for month in ('202401', '202402'):
+        source_df, target_df = _frames(seed=int(month))
+        source_df.to_csv(tmp_path / 'src' / f'source_{month}.csv', index=False)
+        target_df.to_csv(tmp_path / 'tgt' / f'target_{month}.csv', index=False)
+    (tmp_path / 'tgt' / 'target_202403.csv').write_text('TGT_ID\n1\n')
+
+    fan_out = FanOutComparer(MAPPING, str(tmp_path / 'out'), max_workers=2)
+    pairs = fan_out.pair_directories(str(tmp_path / 'src'), str(tmp_path / 'tgt'),
+                                     pattern='*.csv', match_regex=r'_(\d{6})\.')
+    results = fan_out.run(pairs)
+
+    assert [(result['name'], result['status']) for result in results] == [
+        ('202401', 'different'), ('202402', 'different'), ('202403', 'error')]
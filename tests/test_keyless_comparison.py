@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.comparison_backends import available_backends
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.data_sources import DataFrameSource
+from src.utils.diff_output import matched_rows
+from src.utils.html_report import HtmlReport
+from src.utils.keyless_comparison import ROW_HASH_COLUMN, compare_keyless
+
+MAPPING = {
+    'A': {'target': 'TA', 'type': 'int'},
+    'B': {'target': 'TB'},
+    'N': {'target': 'TN'},
+    'NOTE': {'target': None},
+}
+
+
+def _compare(source, target, backend='pandas'):
+    comparer = ConfigurableExcelComparer('src', 'tgt', MAPPING, source_reader=DataFrameSource(source),
+                                         target_reader=DataFrameSource(target), backend=backend)
+    return comparer, comparer.compare()
+
+
+def test_duplicates_are_compared_by_multiplicity():
+    source = pd.DataFrame({'A': [1, 2, 2, 2, 3, 5], 'B': ['x', 'y', 'y', 'y', 'z', None],
+                           'N': [1.0, 2.0, 2.0, 2.0, np.nan, 1.0], 'NOTE': list('abcdef')})
+    target = pd.DataFrame({'TA': [2, 1, 2, 4, 3, 5, 5], 'TB': ['y', 'x', 'y', 'w', 'z', None, None],
+                           'TN': [2, 1, 2, 4, np.nan, 1, 1]})
+
+    comparer, comparison_df = _compare(source, target)
+
+    assert comparer.keyless and comparer.key_column == ROW_HASH_COLUMN
+    assert matched_rows(comparison_df) == 5
+    source_only = comparison_df[comparison_df['_merge'] == 'left_only']
+    target_only = comparison_df[comparison_df['_merge'] == 'right_only']
+    assert source_only[['a_src', 'b_src', 'NOTE'.lower()]].values.tolist() == [[2, 'y', 'd']]
+    assert sorted(target_only['a_tgt'].tolist()) == [4, 5]
+    counts = HtmlReport(comparison_df, comparer.source_df, comparer.target_df, 'src', 'tgt',
+                        comparer.key_column).get_summary_counts()
+    assert counts == {"source_rows": 6, "target_rows": 7, "matching_rows": 5, "source_only_rows": 1,
+                      "target_only_rows": 2, "mismatched_rows": 0}
+
+
+def test_row_order_is_ignored():
+    source = pd.DataFrame({'A': range(100), 'B': [f'v{i % 7}' for i in range(100)], 'N': np.arange(100) / 3})
+    target = source.sample(frac=1, random_state=1).rename(columns={'A': 'TA', 'B': 'TB', 'N': 'TN'})
+
+    _, comparison_df = _compare(source, target)
+
+    assert comparison_df.empty
+    assert matched_rows(comparison_df) == 100
+    assert list(comparison_df.columns) == [ROW_HASH_COLUMN, 'a_src', 'b_src', 'n_src', 'a_tgt', 'b_tgt',
+                                           'n_tgt', '_merge']
+
+
+def test_equal_values_hash_alike_across_dtypes():
+    source = pd.DataFrame({'x': [1, 2, 3], 'd': pd.to_datetime(['2020-01-01', None, '2020-01-03']),
+                           'f': [1.5, np.nan, 2.0], 'b': [True, False, True]})
+    target = pd.DataFrame({'x': [3.0, 1.0, 2.0], 'd': pd.to_datetime(['2020-01-03', '2020-01-01', None]).astype('datetime64[s]'),
+                           'f': [2.0, 1.5, -np.nan], 'b': pd.Series([True, True, False], dtype=object)})
+
+    comparison_df = compare_keyless(source, target)
+
+    assert comparison_df.empty
+    assert matched_rows(comparison_df) == 3
+
+
+@pytest.mark.skipif('arrow' not in available_backends(), reason="pyarrow is not installed")
+def test_arrow_backend_matches_pandas():
+    source = pd.DataFrame({'A': [1, 2, 2, 3], 'B': ['x', 'y', 'y', None], 'N': [1.0, 2.0, 2.0, np.nan]})
+    target = pd.DataFrame({'TA': [2, 1, 4], 'TB': ['y', 'x', None], 'TN': [2.0, 1.0, np.nan]})
+
+    expected = _compare(source, target)[1]
+    actual = _compare(source, target, backend='arrow')[1]
+
+    pd.testing.assert_frame_equal(actual, expected)
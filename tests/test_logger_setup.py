@@ -0,0 +1,87 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.utils.logger_setup import LoggerSetup, RateLimitFilter
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    LoggerSetup.initialize_logger(str(tmp_path / 'app.log'), logging.INFO)
+    yield tmp_path
+    LoggerSetup.shutdown()
+
+
+def _log_from_worker(message, *args):
+    logging.getLogger('worker').warning(message, *args)
+
+
+def test_records_reach_the_file_after_shutdown(log_dir):
+    logging.getLogger('test').info("queued message")
+    LoggerSetup.shutdown()
+
+    assert 'queued message' in (log_dir / 'app.log').read_text()
+
+
+def test_scenario_log_collects_only_its_scenario(log_dir):
+    with LoggerSetup.scenario_log('SCENARIO_A'):
+        logging.getLogger('test').info("inside scenario")
+    logging.getLogger('test').info("outside scenario")
+    LoggerSetup.flush()
+
+    scenario_log = (log_dir / 'SCENARIO_A.log').read_text()
+    assert 'inside scenario' in scenario_log
+    assert 'outside scenario' not in scenario_log
+
+
+def test_worker_processes_log_through_the_listener(log_dir):
+    with LoggerSetup.scenario_log('FAN_OUT', str(log_dir)):
+        with ProcessPoolExecutor(max_workers=1, **LoggerSetup.worker_pool_kwargs()) as executor:
+            executor.submit(_log_from_worker, "from worker").result()
+        LoggerSetup.flush()
+
+    assert 'from worker' in (log_dir / 'FAN_OUT.log').read_text()
+
+
+def test_worker_warnings_are_rate_limited_by_template(log_dir):
+    with ProcessPoolExecutor(max_workers=2, **LoggerSetup.worker_pool_kwargs()) as executor:
+        for column in range(8):
+            executor.submit(_log_from_worker, "column %s missing", column).result()
+    LoggerSetup.shutdown()
+
+    log_text = (log_dir / 'app.log').read_text()
+    assert log_text.count('missing') == 6
+    assert 'column %s missing (3 similar messages suppressed)' in log_text
+
+
+def test_rate_limit_filter_suppresses_repeated_warnings():
+    rate_limit = RateLimitFilter(max_repeats=2, interval=60)
+    records = [logging.LogRecord('test', logging.WARNING, __file__, 0, "column missing", None, None)
+               for _ in range(5)]
+    info = logging.LogRecord('test', logging.INFO, __file__, 0, "column missing", None, None)
+
+    assert [rate_limit.filter(record) for record in records] == [True, True, False, False, False]
+    assert 'further repeats suppressed' in records[1].getMessage()
+    assert rate_limit.filter(info)
+
+
+def test_rate_limit_filter_groups_messages_by_template():
+    rate_limit = RateLimitFilter(max_repeats=1, interval=60)
+    records = [logging.LogRecord('test', logging.WARNING, __file__, 0, "row %d is invalid", (row,), None)
+               for row in range(3)]
+
+    assert [rate_limit.filter(record) for record in records] == [True, False, False]
+    summaries = rate_limit.pending_summaries()
+    assert [summary.getMessage() for summary in summaries] == ["row %d is invalid (2 similar messages suppressed)"]
+    assert rate_limit.pending_summaries() == []
+
+
+def test_shutdown_reports_suppressed_repeats(log_dir):
+    for row in range(8):
+        logging.getLogger('test').warning("row %d is invalid", row)
+    LoggerSetup.shutdown()
+
+    log_text = (log_dir / 'app.log').read_text()
+    assert log_text.count('is invalid') == 6
+    assert 'row %d is invalid (3 similar messages suppressed)' in log_text
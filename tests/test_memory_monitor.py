@@ -0,0 +1,86 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.configurable_excel_comparer import ConfigurableExcelComparer
+from src.utils.data_sources import DataFrameSource
+from src.utils.html_report import HtmlReport
+from src.utils.memory_monitor import MemoryLimitExceeded, MemoryMonitor, check_memory, current_rss
+
+pytestmark = pytest.mark.skipif(current_rss() is None, reason="memory monitoring is unavailable")
+
+MAPPING = {
+    'ID': {'target': 'TGT_ID', 'is_key': True},
+    'AGE': {'target': 'TGT_AGE', 'type': 'int'},
+    'NOTE': {'target': None},
+}
+
+
+def test_stage_records_peak_memory():
+    with MemoryMonitor() as monitor:
+        with monitor.stage('allocate'):
+            block = np.ones(20 * 1024 * 1024 // 8)
+            del block
+        with monitor.stage('idle'):
+            pass
+
+    assert list(monitor.stage_peaks) == ['allocate', 'idle']
+    assert monitor.stage_peaks['allocate'] >= monitor.stage_peaks['idle'] + 15
+
+
+def test_check_raises_when_over_the_limit():
+    with MemoryMonitor(limit_mb=1) as monitor:
+        with pytest.raises(MemoryLimitExceeded, match="Memory limit exceeded during 'loading'"):
+            monitor.check('loading')
+        with pytest.raises(MemoryLimitExceeded):
+            check_memory('chunk loop')
+
+    # Without an active monitor the check is a no-op
+    check_memory('chunk loop')
+
+
+def test_stage_raises_after_a_spike_above_the_limit():
+    limit_mb = current_rss() / 1024 / 1024 + 30
+    with MemoryMonitor(limit_mb=limit_mb) as monitor:
+        with pytest.raises(MemoryLimitExceeded):
+            with monitor.stage('spike'):
+                block = np.ones(60 * 1024 * 1024 // 8)
+                del block
+
+
+def test_sampler_flags_the_limit_for_the_next_safe_point(caplog):
+    limit_mb = current_rss() / 1024 / 1024 + 30
+    with MemoryMonitor(limit_mb=limit_mb, interval=0.01):
+        # Nothing checks the ceiling while the block is held; only the sampler sees it
+        block = np.ones(60 * 1024 * 1024 // 8)
+        time.sleep(0.2)
+        del block
+        assert 'stopping at the next safe point' in caplog.text
+        with pytest.raises(MemoryLimitExceeded):
+            check_memory('next chunk')
+
+
+def test_report_is_unchanged_after_releasing_the_inputs():
+    source = pd.DataFrame({'ID': [1, 2, 3], 'AGE': [30, 40, 50], 'NOTE': ['a', 'b', 'c']})
+    target = pd.DataFrame({'TGT_ID': [1, 2, 4], 'TGT_AGE': [30, 41, 60]})
+    comparer = ConfigurableExcelComparer('src.csv', 'tgt.csv', MAPPING,
+                                         source_reader=DataFrameSource(source),
+                                         target_reader=DataFrameSource(target))
+    comparison_df = comparer.compare()
+    report = HtmlReport(comparison_df, comparer.source_df, comparer.target_df,
+                        source_file='src.csv', target_file='tgt.csv', key_column=comparer.key_column)
+    comparer.release_inputs()
+
+    assert comparer.source_df is None and comparer.target_df is None
+    assert report.get_summary_counts() == {
+        "source_rows": 3, "target_rows": 3, "matching_rows": 1,
+        "source_only_rows": 1, "target_only_rows": 1, "mismatched_rows": 1,
+    }
+    source_only = report._get_side_only_rows('left_only', 'source')
+    assert list(source_only.columns) == ['id', 'age', 'note']
+    assert source_only.to_dict('records') == [{'id': 3, 'age': 50, 'note': 'c'}]
+    assert source_only['age'].dtype == np.int64
+    target_only = report._get_side_only_rows('right_only', 'target')
+    assert target_only.to_dict('records') == [{'id': 4, 'age': 60}]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.diff_output import mismatch_mask
+from src.utils.parallel_diff import ParallelDiff, _comparable_arrays
+
+
+@pytest.fixture
+def comparison_df():
+    rows = 1003
+    rng = np.random.default_rng(7)
+    src_float = rng.normal(size=rows)
+    src_float[::11] = np.nan
+    tgt_float = src_float.copy()
+    tgt_float[::13] = 1.0
+    dates = pd.Series(pd.date_range('2024-01-01', periods=rows, freq='h'))
+    dates[::17] = pd.NaT
+    names = pd.Series([f'name_{i}' for i in range(rows)], dtype='str')
+    names[::19] = np.nan
+    mixed = pd.Series([i if i % 3 else str(i) for i in range(rows)], dtype=object)
+    return pd.DataFrame({
+        'ID': np.arange(rows),
+        'QTY_src': np.arange(rows), 'QTY_tgt': np.where(np.arange(rows) % 7 == 0, -1, np.arange(rows)),
+        'PRICE_src': src_float, 'PRICE_tgt': tgt_float,
+        'JOINED_src': dates, 'JOINED_tgt': dates.where(np.arange(rows) % 23 != 0, pd.Timestamp('2000-01-01')),
+        'NAME_src': names, 'NAME_tgt': names.where(np.arange(rows) % 29 != 0, 'changed'),
+        'MIXED_src': mixed, 'MIXED_tgt': mixed.where(np.arange(rows) % 31 != 0, 'changed'),
+        'ONLY_SRC_src': 1,
+        '_merge': pd.Categorical(np.where(np.arange(rows) % 5 == 0, 'left_only', 'both'),
+                                 categories=['left_only', 'right_only', 'both']),
+    })
+
+
+def test_parallel_masks_match_serial(comparison_df):
+    both = (comparison_df['_merge'] == 'both').to_numpy()
+
+    masks = ParallelDiff(max_workers=2, min_cells=0).column_masks(comparison_df)
+
+    assert list(masks) == ['QTY', 'PRICE', 'JOINED', 'NAME', 'MIXED']
+    for col, mask in masks.items():
+        expected = mismatch_mask(comparison_df[f'{col}_src'], comparison_df[f'{col}_tgt']) & both
+        np.testing.assert_array_equal(mask, expected, err_msg=col)
+        assert mask.any()
+
+
+def test_small_comparisons_run_in_process(comparison_df):
+    serial = ParallelDiff(max_workers=4).column_masks(comparison_df)
+    parallel = ParallelDiff(max_workers=2, min_cells=0, tasks_per_worker=50).column_masks(comparison_df)
+
+    for col in serial:
+        np.testing.assert_array_equal(serial[col], parallel[col], err_msg=col)
+
+
+def test_arrow_strings_are_shared_without_factorizing(comparison_df):
+    pa = pytest.importorskip('pyarrow')
+    src, tgt = _comparable_arrays(comparison_df['NAME_src'], comparison_df['NAME_tgt'])
+
+    assert isinstance(src, pa.Array) and isinstance(tgt, pa.Array)
+    assert src.null_count == comparison_df['NAME_src'].isna().sum()
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from src.utils.database_config import DatabaseConfig
+from src.utils.scenario_runner import ScenarioRunner
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    pd.DataFrame({'ID': [1, 2, 3], 'NAME': ['a', 'b', 'c'], 'AGE': [30, 40, 50]}).to_csv(
+        tmp_path / 'src.csv', index=False)
+    pd.DataFrame({'ID': [1, 2, 4], 'FULL_NAME': ['a', 'x', 'd'], 'AGE': [30, 40, 60]}).to_csv(
+        tmp_path / 'tgt.csv', index=False)
+    path = tmp_path / 'config.ini'
+    path.write_text(
+        "[DATA_SCENARIOS_TO_EXECUTE]\n"
+        "SCENARIO_1=CSV_TO_CSV\n\n"
+        "[CSV_TO_CSV]\n"
+        f"SOURCE_FILE_PATH={tmp_path / 'src.csv'}\n"
+        f"TARGET_FILE_PATH={tmp_path / 'tgt.csv'}\n"
+        "COLUMN_MAPPING=CSV_MAPPING\n"
+        "DIFF_OUTPUT_FORMATS=jsonl\n\n"
+        "[CSV_MAPPING]\n"
+        'ID = { "target": "ID", "is_key": true }\n'
+        'NAME = { "target": "FULL_NAME" }\n'
+        'AGE = { "target": "AGE", "type": "int" }\n'
+    )
+    return str(path)
+
+
+@pytest.mark.parametrize("profile_mode, extensions", [
+    (None, set()),
+    ('cprofile', {'.prof', '.txt'}),
+    ('sample', {'.folded'}),
+])
+def test_run_writes_report_and_profiles(config_file, tmp_path, profile_mode, extensions):
+    runner = ScenarioRunner(DatabaseConfig(config_file), output_dir=str(tmp_path / 'out'), profile_mode=profile_mode)
+
+    result = runner.run('CSV_TO_CSV')
+
+    assert result["status"] == "ok", result["error"]
+    assert os.path.exists(result["report"])
+    assert os.path.dirname(result["report"]) == str(tmp_path / 'out' / 'CSV_TO_CSV')
+    assert os.path.exists(os.path.join(result["diff_dir"], 'summary.json'))
+    assert list(result["timings"]) == ['load', 'standardize', 'compare', 'diff', 'diff_output', 'report']
+    assert list(result["memory"]) == list(result["timings"])
+    assert {os.path.splitext(path)[1] for path in result["profiles"]} == extensions
+    assert all(os.path.exists(path) for path in result["profiles"])
+
+
+def test_run_reports_errors_without_raising(config_file, tmp_path):
+    config_reader = DatabaseConfig(config_file)
+    config_reader.config['CSV_TO_CSV']['SOURCE_FILE_PATH'] = str(tmp_path / 'missing.csv')
+
+    result = ScenarioRunner(config_reader, output_dir=str(tmp_path / 'out')).run('CSV_TO_CSV')
+
+    assert result["status"] == "error"
+    assert result["error"]
+
+
+def test_run_stops_at_the_memory_limit(config_file, tmp_path):
+    result = ScenarioRunner(DatabaseConfig(config_file), output_dir=str(tmp_path / 'out'),
+                            memory_limit_mb=1).run('CSV_TO_CSV')
+
+    assert result["status"] == "error"
+    assert "Memory limit exceeded" in result["error"]
+
+
+def test_cli_list_does_not_import_pandas(config_file):
+    code = (
+        "import sys, main; "
+        f"code = main.main(['--config', {config_file!r}, 'list']); "
+        "assert 'pandas' not in sys.modules, 'pandas was imported'; "
+        "sys.exit(code)"
+    )
+    completed = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    assert 'CSV_TO_CSV' in completed.stdout
+
+
+def test_fan_out_scenario_forwards_backend_formats_and_options(config_file, tmp_path):
+    config_reader = DatabaseConfig(config_file)
+    (tmp_path / 'src_dir').mkdir()
+    (tmp_path / 'tgt_dir').mkdir()
+    for month in ('202401', '202402'):
+        (tmp_path / 'src_dir' / f'{month}.csv').write_text((tmp_path / 'src.csv').read_text())
+        (tmp_path / 'tgt_dir' / f'{month}.csv').write_text((tmp_path / 'tgt.csv').read_text())
+    config_reader.config['CSV_TO_CSV'].update({'FAN_OUT': 'directories', 'SOURCE_DIR': str(tmp_path / 'missing'),
+                                               'TARGET_DIR': str(tmp_path / 'tgt_dir'), 'FILE_PATTERN': '*.csv',
+                                               'REPORT_FORMATS': 'html,xlsx'})
+    runner = ScenarioRunner(config_reader, output_dir=str(tmp_path / 'out'), max_workers=1)
+
+    result = runner.run('CSV_TO_CSV', options={'SOURCE_DIR': str(tmp_path / 'src_dir'), 'BACKEND': 'arrow'})
+
+    assert result["status"] == "ok", result["error"]
+    pair_dir = os.path.dirname(result["report"])
+    written = sorted(os.listdir(pair_dir))
+    assert written == ['000_202401.csv.html', '000_202401.csv.xlsx', '000_202401.csv_diff',
+                       '001_202402.csv.html', '001_202402.csv.xlsx', '001_202402.csv_diff', 'index.html']
+    assert sorted(os.listdir(os.path.join(pair_dir, '000_202401.csv_diff'))) == [
+        'cell_diffs.jsonl', 'source_only.jsonl', 'summary.json', 'target_only.jsonl']
+
+    unknown_backend = runner.run('CSV_TO_CSV', options={'SOURCE_DIR': str(tmp_path / 'src_dir'), 'BACKEND': 'nope'})
+
+    assert unknown_backend["status"] == "error"
+    assert "2 of 2 pairs failed" in unknown_backend["error"]
@@ -0,0 +1,94 @@
+import io
+import json
+
+import pandas as pd
+
+from src.utils.database_config import DatabaseConfig
+from src.utils.scenario_runner import ScenarioRunner
+from src.utils.telemetry import Telemetry, expect_rows, report_progress
+
+
+def _records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_stage_reports_rows_rate_and_eta(tmp_path):
+    console = io.StringIO()
+    metrics_path = tmp_path / 'metrics.jsonl'
+
+    with Telemetry(str(metrics_path), stream=console, interval=60) as telemetry:
+        with telemetry.stage('load', scenario='S1'):
+            expect_rows(1000)
+            report_progress(250)
+            report_progress(150)
+            snapshot = telemetry.snapshot()
+
+    assert snapshot['stage'] == 'load' and snapshot['scenario'] == 'S1'
+    assert snapshot['rows'] == 400 and snapshot['expected_rows'] == 1000
+    assert snapshot['rows_per_s'] > 0 and snapshot['eta_s'] is not None
+    assert snapshot['rss_mb'] is None or snapshot['rss_mb'] > 0
+
+    records = _records(metrics_path)
+    assert [record['event'] for record in records] == ['stage_start', 'stage_end']
+    assert records[-1]['rows'] == 400
+    lines = console.getvalue().splitlines()
+    assert lines[-1].startswith('[S1 load]  400/1,000 rows') and lines[-1].endswith('done')
+
+
+def test_progress_without_active_telemetry_is_ignored():
+    expect_rows(10)
+    report_progress(10)
+
+    telemetry = Telemetry(console=False)
+    report_progress(10)
+    with telemetry.stage('compare'):
+        assert telemetry.snapshot()['rows'] == 0
+
+
+def test_nested_start_keeps_the_outer_run_going(tmp_path):
+    metrics_path = tmp_path / 'metrics.jsonl'
+    telemetry = Telemetry(str(metrics_path), console=False, interval=60)
+
+    with telemetry:
+        with telemetry:
+            pass
+        with telemetry.stage('report'):
+            report_progress(3)
+
+    assert _records(metrics_path)[-1]['rows'] == 3
+
+
+def test_runner_reports_every_stage(tmp_path):
+    pd.DataFrame({'ID': [1, 2, 3], 'NAME': ['a', 'b', 'c']}).to_csv(tmp_path / 'src.csv', index=False)
+    pd.DataFrame({'ID': [1, 2, 4], 'NAME': ['a', 'x', 'd']}).to_csv(tmp_path / 'tgt.csv', index=False)
+    config = tmp_path / 'config.ini'
+    config.write_text(
+        "[DATA_SCENARIOS_TO_EXECUTE]\nSCENARIO_1=CSV_TO_CSV\n\n"
+        "[CSV_TO_CSV]\n"
+        f"SOURCE_FILE_PATH={tmp_path / 'src.csv'}\n"
+        f"TARGET_FILE_PATH={tmp_path / 'tgt.csv'}\n"
+        "COLUMN_MAPPING=CSV_MAPPING\n"
+        "DIFF_OUTPUT_FORMATS=jsonl\n\n"
+        "[CSV_MAPPING]\n"
+        'ID = { "target": "ID", "is_key": true }\n'
+        'NAME = { "target": "NAME" }\n'
+    )
+    metrics_path = tmp_path / 'metrics.jsonl'
+    telemetry = Telemetry(str(metrics_path), console=False)
+
+    result = ScenarioRunner(DatabaseConfig(str(config)), output_dir=str(tmp_path / 'out'),
+                            telemetry=telemetry).run('CSV_TO_CSV')
+
+    assert result["status"] == "ok", result["error"]
+    ends = {record['stage']: record for record in _records(metrics_path) if record['event'] == 'stage_end'}
+    assert list(ends) == ['load', 'standardize', 'compare', 'diff', 'diff_output', 'report']
+    assert all(record['scenario'] == 'CSV_TO_CSV' for record in ends.values())
+    assert ends['load']['rows'] == 6
+    assert ends['standardize']['rows'] == ends['standardize']['expected_rows'] == 6
+    assert ends['compare']['rows'] == 6
+    assert ends['diff']['rows'] == 2
+    # one source-only row, one target-only row and one differing cell
+    assert ends['diff_output']['rows'] == 3
+    assert ends['report']['rows'] == 3
+    assert telemetry._metrics_file is None